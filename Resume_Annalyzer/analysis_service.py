@@ -0,0 +1,532 @@
+"""
+HTTP API around the analysis pipeline, so services such as the Node backend
+can call it without Streamlit.
+
+Endpoints (request and response bodies are JSON unless noted):
+
+    GET  /health               liveness plus pool and queue state
+    GET  /metrics              Prometheus text (stage timings, request counters)
+    POST /extract              raw file body, ?filename=cv.pdf -> {"text", "degradations"}
+    POST /analyze              raw file body, ?filename=cv.pdf[&ai=1][&text=1]
+                               -> {"basic_analysis", "ats_score", "degradations", ...}
+    POST /analyze/text         {"text"} -> {"basic_analysis", "ats_score", "degradations"}
+    POST /jd/parse             {"text"} -> parse_job_description result
+    POST /match                {"resume_analysis", "jd"} -> calculate_jd_match result
+    POST /batch/analyze        {"files": [{"filename", "content_base64"}], "ai": false}
+    POST /batch/jd/parse       {"texts": [...]}
+    POST /batch/match          {"resume_analysis", "jds": [...]}
+
+Extraction, analysis and JD parsing run in a bounded process pool. At most
+``max_pending`` items (a batch counts once per file or text) may be queued or
+running; beyond that requests get 429 with Retry-After instead of piling up.
+A timed-out request cancels its queued items, and items already running keep
+counting until they finish.
+Batch results keep input order and report failures per item, like
+batch_analyze.py. With ``ai`` the Gemini call runs on the event loop after the
+local analysis; point ``GEMINI_BASE_URL`` at gemini_stub.py to test it offline.
+Inputs are bounded by the analysis limits (limits.py): work cut short by a
+page, character or time limit is listed under "degradations" instead of
+failing the request.
+
+Usage:
+    python analysis_service.py --port 8080 --workers 4 --max-pending 64
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import instrumentation
+from instrumentation import count, stage
+from job_description_manager import calculate_jd_match, match_features
+from text_core import jd_match_features, resume_match_features
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+MAX_HEADER_BYTES = 64 * 1024
+REQUEST_TIMEOUT = 120.0
+KEEP_ALIVE_TIMEOUT = 15.0
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    408: "Request Timeout", 411: "Length Required", 413: "Payload Too Large",
+    422: "Unprocessable Entity", 429: "Too Many Requests", 500: "Internal Server Error",
+    503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+
+class HTTPError(Exception):
+    """An error response with a status code"""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class Request:
+    __slots__ = ("method", "path", "query", "headers", "body")
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        parts = urlsplit(target)
+        self.method = method
+        self.path = parts.path.rstrip("/") or "/"
+        self.query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def flag(self, name: str) -> bool:
+        return self.query.get(name, "").lower() in ("1", "true", "yes")
+
+    def json(self) -> Dict[str, Any]:
+        try:
+            payload = json.loads(self.body or b"{}")
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON body: {str(e)}")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "JSON body must be an object")
+        return payload
+
+
+# -- work run in the process pool ---------------------------------------------
+# Each job returns its result plus the spans it recorded, so the parent's
+# /metrics covers extraction and analysis stages as well.
+
+def _traced(fn: Callable[..., Any], *args: Any) -> Tuple[Any, List[Dict[str, Any]]]:
+    with instrumentation.trace() as spans:
+        return fn(*args), spans
+
+
+def _extract_job(data: bytes, file_name: str) -> Dict[str, Any]:
+    from limits import extract_text_within_limits
+
+    # Pages are extracted serially; the pool already runs requests in parallel
+    text, degradations = extract_text_within_limits(data, file_name)
+    return {"text": text, "degradations": [d._asdict() for d in degradations]}
+
+
+def _analyze_text_job(text: str) -> Dict[str, Any]:
+    from analyzer import analyze_resume, generate_ats_score
+    from limits import limit_text
+
+    text, degradations = limit_text(text)
+    with stage("analysis"):
+        basic_analysis = analyze_resume(text)
+    with stage("scoring"):
+        ats_score = generate_ats_score(basic_analysis)
+    return {
+        "basic_analysis": basic_analysis,
+        "ats_score": ats_score,
+        "degradations": [d._asdict() for d in degradations],
+    }
+
+
+def _analyze_file_job(data: bytes, file_name: str) -> Dict[str, Any]:
+    extraction = _extract_job(data, file_name)
+    result = _analyze_text_job(extraction["text"])
+    result["resume_text"] = extraction["text"]
+    result["degradations"] = extraction["degradations"]
+    return result
+
+
+def _parse_jd_job(text: str) -> Dict[str, Any]:
+    from job_description_manager import parse_job_description
+
+    return parse_job_description(text)
+
+
+def _item_error(e: BaseException) -> Dict[str, Any]:
+    return {"success": False, "error_message": str(e) or type(e).__name__}
+
+
+class AnalysisService:
+    """
+    Routes requests to the pipeline, with a process pool for CPU-bound work
+    and a cap on queued items.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 request_timeout: float = REQUEST_TIMEOUT):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 16 * self.workers
+        self.request_timeout = request_timeout
+        self.pending = 0
+        self.rejected = 0
+        self.started_at = time.time()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._routes: Dict[Tuple[str, str], Callable[[Request], Awaitable[Any]]] = {
+            ("GET", "/health"): self.health,
+            ("GET", "/metrics"): self.metrics,
+            ("POST", "/extract"): self.extract,
+            ("POST", "/analyze"): self.analyze,
+            ("POST", "/analyze/text"): self.analyze_text,
+            ("POST", "/jd/parse"): self.parse_jd,
+            ("POST", "/match"): self.match,
+            ("POST", "/batch/analyze"): self.batch_analyze,
+            ("POST", "/batch/jd/parse"): self.batch_parse_jd,
+            ("POST", "/batch/match"): self.batch_match,
+        }
+
+    def start(self) -> None:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # -- admission and pool -----------------------------------------------------
+
+    def _admit(self, items: int) -> None:
+        if items > self.max_pending:
+            raise HTTPError(413, f"Batch of {items} items is over the limit of {self.max_pending}")
+        if self.pending + items > self.max_pending:
+            self.rejected += 1
+            count("http_rejected")
+            raise HTTPError(429, f"Server busy: {self.pending} items pending (limit {self.max_pending})",
+                            {"Retry-After": "1"})
+        self.pending += items
+
+    def _release(self, items: int) -> None:
+        self.pending -= items
+
+    def _submit(self, loop: asyncio.AbstractEventLoop, fn: Callable[..., Any], *args: Any) -> Future:
+        # An admitted item stays pending until its pool job finishes or is
+        # cancelled, not just until the request awaiting it gives up
+        future = self._pool.submit(_traced, fn, *args)
+
+        def release(_: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._release, 1)
+            except RuntimeError:
+                pass  # Event loop already closed at shutdown
+
+        future.add_done_callback(release)
+        return future
+
+    def _submit_all(self, fn: Callable[..., Any], items: List[Tuple[Any, ...]]) -> List[Future]:
+        # Submit every admitted item at once; items that could not be
+        # submitted are released here, the rest by their futures
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures: List[Future] = []
+        try:
+            for args in items:
+                futures.append(self._submit(loop, fn, *args))
+        finally:
+            self._release(len(items) - len(futures))
+        return futures
+
+    @staticmethod
+    async def _result(future: Future) -> Any:
+        try:
+            result, spans = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A request timeout: drop the job if a worker has not started it
+            future.cancel()
+            raise
+        for span in spans:
+            if not instrumentation.is_enabled():
+                break
+            if "counter" in span:
+                labels = {k: v for k, v in span.items() if k not in ("counter", "value")}
+                instrumentation.REGISTRY.count(span["counter"], span["value"], labels)
+            else:
+                instrumentation.REGISTRY.observe(span["stage"], span["seconds"], span["outcome"])
+        return result
+
+    async def _run_items(self, fn: Callable[..., Any], items: List[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+        self._admit(len(items))
+        futures = self._submit_all(fn, items)
+        try:
+            results = await asyncio.gather(*(self._result(f) for f in futures), return_exceptions=True)
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        return [
+            _item_error(r) if isinstance(r, BaseException) else {"success": True, **r}
+            for r in results
+        ]
+
+    async def _run_one(self, fn: Callable[..., Any], *args: Any) -> Any:
+        from pdf_parser import TextExtractionError
+
+        self._admit(1)
+        (future,) = self._submit_all(fn, [args])
+        try:
+            return await self._result(future)
+        except TextExtractionError as e:
+            raise HTTPError(422, str(e))
+
+    # -- handlers -----------------------------------------------------------------
+
+    async def health(self, request: Request) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+        }
+
+    async def metrics(self, request: Request) -> str:
+        prefix = instrumentation.METRIC_PREFIX
+        gauges = [
+            f"# TYPE {prefix}_service_pending_items gauge",
+            f"{prefix}_service_pending_items {self.pending}",
+            f"# TYPE {prefix}_service_max_pending_items gauge",
+            f"{prefix}_service_max_pending_items {self.max_pending}",
+        ]
+        return instrumentation.prometheus_text() + "\n".join(gauges) + "\n"
+
+    @staticmethod
+    def _file_name(request: Request) -> str:
+        file_name = request.query.get("filename") or request.headers.get("x-filename")
+        if not file_name:
+            raise HTTPError(400, "Pass the original file name as ?filename= or an X-Filename header")
+        if not request.body:
+            raise HTTPError(400, "Empty request body")
+        return file_name
+
+    @staticmethod
+    def _text(payload: Dict[str, Any], key: str = "text") -> str:
+        text = payload.get(key)
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(400, f"'{key}' must be a non-empty string")
+        return text
+
+    @staticmethod
+    def _ai_deadline() -> Tuple[float, Dict[str, str]]:
+        from limits import Degradation, get_analysis_limits
+
+        seconds = get_analysis_limits().ai_seconds
+        return seconds, Degradation("ai", "deadline", f"AI skipped: no response within {seconds:g}s")._asdict()
+
+    async def _recommendations(self, result: Dict[str, Any]) -> None:
+        from analyzer import generate_gemini_recommendations_async
+
+        seconds, degradation = self._ai_deadline()
+        try:
+            result["ai_recommendations"] = await asyncio.wait_for(
+                generate_gemini_recommendations_async(result["resume_text"]), seconds
+            )
+        except asyncio.TimeoutError:
+            count("degradations", stage="ai", reason="deadline")
+            result.update({"ai_recommendations": {}, "degradations": result["degradations"] + [degradation]})
+        except Exception as e:
+            logger.warning(f"Gemini recommendations failed: {str(e)}")
+            result.update({"ai_recommendations": {}, "ai_error": str(e)})
+
+    async def extract(self, request: Request) -> Dict[str, Any]:
+        return await self._run_one(_extract_job, request.body, self._file_name(request))
+
+    async def analyze(self, request: Request) -> Dict[str, Any]:
+        result = await self._run_one(_analyze_file_job, request.body, self._file_name(request))
+        if request.flag("ai"):
+            await self._recommendations(result)
+        if not request.flag("text"):
+            result.pop("resume_text")
+        return result
+
+    async def analyze_text(self, request: Request) -> Dict[str, Any]:
+        return await self._run_one(_analyze_text_job, self._text(request.json()))
+
+    async def parse_jd(self, request: Request) -> Dict[str, Any]:
+        return await self._run_one(_parse_jd_job, self._text(request.json()))
+
+    async def match(self, request: Request) -> Dict[str, Any]:
+        payload = request.json()
+        # A single match is a few set operations; cheaper inline than through the pool
+        return calculate_jd_match(payload.get("resume_analysis") or {}, payload.get("jd") or {})
+
+    async def batch_analyze(self, request: Request) -> Dict[str, Any]:
+        payload = request.json()
+        files = payload.get("files")
+        if not isinstance(files, list) or not files:
+            raise HTTPError(400, "'files' must be a non-empty list")
+        items = []
+        for i, entry in enumerate(files):
+            try:
+                items.append((base64.b64decode(entry["content_base64"], validate=True), str(entry["filename"])))
+            except (KeyError, TypeError, binascii.Error) as e:
+                raise HTTPError(400, f"files[{i}] needs 'filename' and base64 'content_base64': {str(e)}")
+        results = await self._run_items(_analyze_file_job, items)
+        if payload.get("ai"):
+            from analyzer import generate_gemini_recommendations_many
+
+            succeeded = [r for r in results if r["success"]]
+            seconds, degradation = self._ai_deadline()
+            try:
+                recommendations = await asyncio.wait_for(
+                    generate_gemini_recommendations_many([r["resume_text"] for r in succeeded]), seconds
+                )
+            except asyncio.TimeoutError:
+                count("degradations", len(succeeded), stage="ai", reason="deadline")
+                recommendations = [{} for _ in succeeded]
+                for result in succeeded:
+                    result["degradations"].append(degradation)
+            for result, ai_recommendations in zip(succeeded, recommendations):
+                result["ai_recommendations"] = ai_recommendations
+        if not payload.get("include_text"):
+            for result in results:
+                result.pop("resume_text", None)
+        for entry, result in zip(files, results):
+            result["filename"] = entry["filename"]
+        return {"results": results}
+
+    async def batch_parse_jd(self, request: Request) -> Dict[str, Any]:
+        texts = request.json().get("texts")
+        if not isinstance(texts, list) or not texts or not all(isinstance(t, str) for t in texts):
+            raise HTTPError(400, "'texts' must be a non-empty list of strings")
+        results = await self._run_items(_parse_jd_job, [(text,) for text in texts])
+        return {"results": results}
+
+    async def batch_match(self, request: Request) -> Dict[str, Any]:
+        payload = request.json()
+        jds = payload.get("jds")
+        if not isinstance(jds, list):
+            raise HTTPError(400, "'jds' must be a list of parsed JDs")
+        resume = resume_match_features(payload.get("resume_analysis") or {})
+        return {"results": [match_features(resume, jd_match_features(jd or {})) for jd in jds]}
+
+    # -- HTTP ---------------------------------------------------------------------
+
+    async def dispatch(self, request: Request) -> Tuple[int, Dict[str, str], bytes]:
+        handler = self._routes.get((request.method, request.path))
+        route = request.path.strip("/").replace("/", "_") or "root"
+        status = 200
+        try:
+            if handler is None:
+                methods = [m for m, path in self._routes if path == request.path]
+                raise HTTPError(405, "Method not allowed") if methods else HTTPError(404, "Not found")
+            with stage(f"http_{route}"):
+                result = await asyncio.wait_for(handler(request), self.request_timeout)
+            if isinstance(result, str):
+                return status, {"Content-Type": "text/plain; version=0.0.4"}, result.encode("utf-8")
+            body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+            return status, {"Content-Type": "application/json"}, body
+        except HTTPError as e:
+            status = e.status
+            headers = {"Content-Type": "application/json", **e.headers}
+            return status, headers, json.dumps({"error": str(e)}).encode("utf-8")
+        except asyncio.TimeoutError:
+            status = 504
+            return status, {"Content-Type": "application/json"}, b'{"error": "Request timed out"}'
+        except Exception as e:
+            status = 500
+            logger.exception(f"Unhandled error in {request.method} {request.path}")
+            return status, {"Content-Type": "application/json"}, json.dumps({"error": str(e)}).encode("utf-8")
+        finally:
+            count("http_requests", route=route if handler else "unknown", status=status)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request, keep_alive = await _read_request(reader)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except HTTPError as e:
+                    _write_response(writer, e.status, {"Content-Type": "application/json"},
+                                    json.dumps({"error": str(e)}).encode("utf-8"), keep_alive=False)
+                    await writer.drain()
+                    return
+                if request is None:
+                    return
+                status, headers, body = await self.dispatch(request)
+                _write_response(writer, status, headers, body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[Optional[Request], bool]:
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_TIMEOUT)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None, False
+        raise
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "Request headers too large")
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        raise HTTPError(411, "Chunked bodies are not supported; send Content-Length")
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"Request body over {MAX_BODY_BYTES} bytes")
+    body = await asyncio.wait_for(reader.readexactly(length), REQUEST_TIMEOUT) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+    return Request(method.upper(), target, headers, body), keep_alive
+
+
+def _write_response(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: bytes,
+                    keep_alive: bool) -> None:
+    head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+    headers = {**headers, "Content-Length": str(len(body)), "Connection": "keep-alive" if keep_alive else "close"}
+    head.extend(f"{name}: {value}" for name, value in headers.items())
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, service: Optional[AnalysisService] = None) -> None:
+    service = service or AnalysisService()
+    service.start()
+    server = await asyncio.start_server(service.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    logger.info(f"Analysis service listening on {host}:{port} with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTTP API for resume analysis")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-pending", type=int, help="Queued items before 429 (default: 16 x workers)")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="Per-request deadline in seconds")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    instrumentation.enable()
+    service = AnalysisService(args.workers, args.max_pending, args.timeout)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
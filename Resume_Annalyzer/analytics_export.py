@@ -0,0 +1,371 @@
+"""
+Columnar export of analysis results for offline analytics.
+
+Results of analyze_resume / generate_ats_score, parse_job_description and
+calculate_jd_match are appended to three tables (``analyses``, ``jds`` and
+``matches``) under an export directory. Each table is a directory of part
+files, one per writer, so repeated batch runs add parts instead of rewriting
+earlier ones:
+
+    export/analyses/part-<time>-<pid>-<n>.parquet
+
+Rows are buffered in memory and written a row group at a time, so exporting
+costs a list append per result until a group fills. Parquet (via pyarrow)
+is used when it is installed, with skill and keyword lists stored as
+dictionary-encoded list columns; without pyarrow the parts are CSV files
+with list items joined by "|". ``read_columns`` loads only the requested
+columns from either format.
+
+Usage:
+    with AnalyticsExporter("data/export") as exporter:
+        exporter.add_analysis(analysis, ats_score, content_hash=digest)
+    read_columns("data/export/analyses", ["ats_score", "skills_found"])
+"""
+import csv
+import itertools
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from instrumentation import count
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROW_GROUP_SIZE = 10_000
+FORMATS = ("parquet", "csv")
+LIST_SEPARATOR = "|"
+
+# Column name and type ("str", "int", "float" or "list" of strings) per table.
+# A column name has the same type in every table
+TABLES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "analyses": (
+        ("content_hash", "str"),
+        ("name", "str"),
+        ("skills_found", "list"),
+        ("experience_level", "float"),
+        ("word_count", "int"),
+        ("quant_achievements", "int"),
+        ("ats_score", "int"),
+        ("exported_at", "float"),
+    ),
+    "jds": (
+        ("jd_id", "int"),
+        ("required_skills", "list"),
+        ("experience_years", "float"),
+        ("keywords", "list"),
+        ("taxonomy_version", "int"),
+        ("exported_at", "float"),
+    ),
+    "matches": (
+        ("content_hash", "str"),
+        ("jd_id", "int"),
+        ("score", "int"),
+        ("matched_skills", "list"),
+        ("missing_skills", "list"),
+        ("matched_keywords", "list"),
+        ("missing_keywords", "list"),
+        ("exported_at", "float"),
+    ),
+}
+_COLUMN_TYPES: Dict[str, str] = {name: kind for columns in TABLES.values() for name, kind in columns}
+
+_part_numbers = itertools.count()
+
+
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def default_format() -> str:
+    """
+    "parquet" if pyarrow is installed, else "csv".
+    """
+    return "parquet" if _pyarrow_available() else "csv"
+
+
+def _arrow_schema(columns: Tuple[Tuple[str, str], ...]):
+    import pyarrow as pa
+
+    types = {
+        "str": pa.string(),
+        "int": pa.int64(),
+        "float": pa.float64(),
+        # Skills repeat across millions of rows; store each name once per row group
+        "list": pa.list_(pa.dictionary(pa.int32(), pa.string())),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns])
+
+
+_SCALARS = {"str": str, "int": int, "float": float}
+
+
+def _coerce(kind: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if kind == "list":
+        return [str(item) for item in value]
+    try:
+        return _SCALARS[kind](value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ColumnarWriter:
+    """
+    Buffered writer of one table's rows to a new part file in ``directory``.
+    The file is created on the first flush, so a writer that receives no rows
+    leaves nothing behind.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        table: str,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        format: Optional[str] = None,
+    ):
+        if table not in TABLES:
+            raise ValueError(f"Unknown table {table!r}; expected one of {sorted(TABLES)}")
+        self.format = format or default_format()
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown export format {self.format!r}; expected one of {FORMATS}")
+        self.table = table
+        self.columns = TABLES[table]
+        self.row_group_size = max(1, row_group_size)
+        self.path = os.path.join(
+            directory, f"part-{time.time_ns()}-{os.getpid()}-{next(_part_numbers)}.{self.format}"
+        )
+        self.rows_written = 0
+        self.closed = False
+        self._rows: List[Tuple[Any, ...]] = []
+        self._file = None
+        self._writer = None
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """
+        Buffer one row; missing columns are null. Writes a row group when the buffer is full.
+        """
+        if self.closed:
+            raise ValueError(f"Writer for {self.path} is closed")
+        self._rows.append(tuple(_coerce(kind, row.get(name)) for name, kind in self.columns))
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if self.format == "parquet":
+            self._write_parquet()
+        else:
+            self._write_csv()
+        count("exported_rows", len(self._rows), table=self.table)
+        self.rows_written += len(self._rows)
+        self._rows = []
+
+    def _write_parquet(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, _arrow_schema(self.columns))
+        schema = self._writer.schema
+        columns = list(zip(*self._rows))
+        self._writer.write_table(pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+        ))
+
+    def _write_csv(self) -> None:
+        if self._writer is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow([name for name, _ in self.columns])
+        kinds = [kind for _, kind in self.columns]
+        self._writer.writerows(
+            [
+                "" if value is None else LIST_SEPARATOR.join(value) if kind == "list" else value
+                for kind, value in zip(kinds, row)
+            ]
+            for row in self._rows
+        )
+        self._file.flush()
+
+    def close(self) -> None:
+        """
+        Write any buffered rows and close the part file.
+        """
+        self.flush()
+        if self.format == "parquet" and self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        self._writer = self._file = None
+        self.closed = True
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AnalyticsExporter:
+    """
+    Appends analysis, JD and match results to the tables under ``directory``.
+    Use as a context manager, or call close() to write the last row groups.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        format: Optional[str] = None,
+    ):
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.format = format or default_format()
+        if self.format == "csv" and format is None:
+            logger.info("pyarrow is not installed; exporting CSV. Install with: pip install pyarrow")
+        self._writers: Dict[str, ColumnarWriter] = {}
+
+    def _writer(self, table: str) -> ColumnarWriter:
+        writer = self._writers.get(table)
+        if writer is None:
+            writer = ColumnarWriter(os.path.join(self.directory, table), table, self.row_group_size, self.format)
+            self._writers[table] = writer
+        return writer
+
+    def add_analysis(
+        self,
+        analysis: Dict[str, Any],
+        ats_score: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        """
+        Export an analyze_resume result and its generate_ats_score score.
+        """
+        self._writer("analyses").append({
+            "content_hash": content_hash,
+            "name": name,
+            "skills_found": analysis.get("skills_found") or [],
+            "experience_level": analysis.get("experience_level"),
+            "word_count": analysis.get("_word_count"),
+            "quant_achievements": analysis.get("_quant_achievements"),
+            "ats_score": ats_score,
+            "exported_at": time.time(),
+        })
+
+    def add_jd(self, jd: Dict[str, Any], jd_id: Optional[int] = None) -> None:
+        """
+        Export a parse_job_description result (or a stored JD with its ``jd_id``).
+        """
+        self._writer("jds").append({
+            "jd_id": jd_id if jd_id is not None else jd.get("jd_id"),
+            "required_skills": jd.get("required_skills") or [],
+            "experience_years": jd.get("experience_years"),
+            "keywords": jd.get("keywords") or [],
+            "taxonomy_version": jd.get("taxonomy_version"),
+            "exported_at": time.time(),
+        })
+
+    def add_match(self, match: Dict[str, Any], content_hash: Optional[str] = None, jd_id: Optional[int] = None) -> None:
+        """
+        Export a calculate_jd_match result for a resume and a stored JD.
+        """
+        self._writer("matches").append({
+            "content_hash": content_hash if content_hash is not None else match.get("content_hash"),
+            "jd_id": jd_id if jd_id is not None else match.get("jd_id"),
+            "score": match.get("score"),
+            "matched_skills": match.get("matched_skills") or [],
+            "missing_skills": match.get("missing_skills") or [],
+            "matched_keywords": match.get("matched_keywords") or [],
+            "missing_keywords": match.get("missing_keywords") or [],
+            "exported_at": time.time(),
+        })
+
+    def flush(self) -> None:
+        for writer in self._writers.values():
+            writer.flush()
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+
+    def __enter__(self) -> "AnalyticsExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _part_files(path: str) -> List[str]:
+    if not os.path.isdir(path):
+        return [path]
+    return [
+        os.path.join(path, name)
+        for name in sorted(os.listdir(path))
+        if name.startswith("part-") and name.rsplit(".", 1)[-1] in FORMATS
+    ]
+
+
+def _read_parquet(path: str, columns: Optional[List[str]]) -> Dict[str, List[Any]]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path, columns=columns)
+    out: Dict[str, List[Any]] = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if pa.types.is_list(column.type):
+            # Decoding the dictionary in C first is several times faster than per item
+            column = column.cast(pa.list_(pa.string()))
+        out[name] = column.to_pylist()
+    return out
+
+
+def _read_csv(path: str, columns: Optional[List[str]]) -> Dict[str, List[Any]]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        wanted = columns if columns is not None else header
+        missing = [name for name in wanted if name not in header]
+        if missing:
+            raise ValueError(f"{path} has no column(s) {missing}")
+        picks = [(name, header.index(name), _COLUMN_TYPES.get(name, "str")) for name in wanted]
+        out: Dict[str, List[Any]] = {name: [] for name in wanted}
+        for row in reader:
+            for name, index, kind in picks:
+                value = row[index]
+                if kind == "list":
+                    out[name].append(value.split(LIST_SEPARATOR) if value else [])
+                else:
+                    out[name].append(_coerce(kind, value) if value else None)
+        return out
+
+
+def read_columns(path: str, columns: Optional[Iterable[str]] = None) -> Dict[str, List[Any]]:
+    """
+    Load the given columns (all for None) of an exported table.
+
+    Args:
+        path: A table directory (e.g. "data/export/analyses") or one part file
+        columns: Column names to load; other columns are not read from
+            Parquet parts and not kept from CSV parts
+
+    Returns:
+        Column name -> values, concatenated across parts in file name order
+    """
+    columns = list(columns) if columns is not None else None
+    result: Dict[str, List[Any]] = {name: [] for name in columns or ()}
+    for part in _part_files(path):
+        read = _read_parquet if part.endswith(".parquet") else _read_csv
+        for name, values in read(part, columns).items():
+            result.setdefault(name, []).extend(values)
+    return result
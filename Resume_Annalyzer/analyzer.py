@@ -1,64 +1,57 @@
-from typing import Dict, Any, List, Optional
-import re
-from streamlit.runtime.uploaded_file_manager import UploadedFile
-import streamlit as st
-import google.generativeai as genai
-import json
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+import contextvars
+import logging
+import os
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 
-# This assumes you have a pdf_parser.py file
-from pdf_parser import extract_text_from_file, TextExtractionError
+from result_cache import ResultCache, content_key
+from feature_scanner import merge_features, scan_numeric_features
+from resume_document import HEADER_SECTION, SECTION_NAMES, get_resume_document
+from instrumentation import count, stage
+from text_core import PREDEFINED_SKILLS, find_skills, taxonomy_stamp
 
-PREDEFINED_SKILLS: List[str] = [
-    "Python", "Java", "JavaScript", "SQL", "C++", "Project Management",
-    "Data Analysis", "Machine Learning", "Deep Learning", "NLP",
-    "Communication", "Leadership", "AWS", "Azure", "GCP", "Docker", "Kubernetes",
-]
+# Extraction (PyPDF2), the Gemini client (asyncio, urllib) and Streamlit are
+# imported on first use, so importing this module for analyze_resume and
+# generate_ats_score alone stays cheap in worker processes
+if TYPE_CHECKING:
+    from streamlit.runtime.uploaded_file_manager import UploadedFile
 
-def _normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text or "").strip()
+    from limits import AnalysisLimits, Degradation
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction, analysis or scoring logic changes so cached results are not reused
+ANALYZER_VERSION = "3"
+
+# Resume sections each extractor reads (see resume_document.py). Years of
+# experience in education or project blurbs are not work experience
+_EXPERIENCE_SECTIONS = frozenset({HEADER_SECTION, "summary", "experience"})
+_ACHIEVEMENT_SECTIONS = frozenset({HEADER_SECTION, "summary", "experience", "projects", "awards"})
+_SKILL_SECTIONS = SECTION_NAMES - {"interests", "references"}
+
+_RESULT_CACHE = ResultCache()
+_AI_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gemini")
 
 def _find_skills(text: str) -> List[str]:
-    found_skills = set()
-    for skill in PREDEFINED_SKILLS:
-        pattern = r"(?i)\b" + re.escape(skill) + r"\b"
-        if re.search(pattern, text):
-            found_skills.add(skill)
-    return sorted(list(found_skills))
-
-def _parse_years_of_experience(text: str) -> Optional[float]:
-    candidates: List[float] = []
-    patterns = [
-        re.compile(r"(?i)\b(\d{1,2})\s*\+?\s*(?:years?|yrs?|yoe)\b"),
-        re.compile(r"(?i)(\d{1,2})\s*to\s*(\d{1,2})\s*years"),
-        re.compile(r"(?i)experience[^\n.]{0,20}(\d{1,2})\s*years")
-    ]
-    for pat in patterns:
-        for m in pat.finditer(text):
-            nums = [float(g) for g in m.groups() if g and g.isdigit()]
-            if nums:
-                candidates.append(max(nums))
-    return max(candidates) if candidates else 0.0
-
-# ADDED BACK: Function to detect quantifiable achievements for ATS score
-def _detect_quantifiable_achievements(text: str) -> int:
-    count = 0
-    # Percentages like 20%
-    count += len(re.findall(r"\b\d+\s*%", text))
-    # Monetary gains/savings like $1M, $200k
-    count += len(re.findall(r"\$\s?\d+[\d,]*(?:k|m|b)?", text, flags=re.IGNORECASE))
-    # Action verbs followed by numbers: increased 20, reduced 15, improved 30
-    count += len(re.findall(r"\b(increased|reduced|improved|boosted|saved|grew|decreased)\b[^\n%$]{0,40}\b\d+\b", text, flags=re.IGNORECASE))
-    return count
+    return sorted(find_skills(text))
 
 def analyze_resume(resume_text: str) -> Dict[str, Any]:
-    normalized = _normalize_text(resume_text)
-    lowercase_text = normalized.lower()
+    document = get_resume_document(resume_text)
+    # Each extractor reads only its sections. Sections needed for both
+    # experience and achievements are scanned once
+    scans = [
+        (section.name, scan_numeric_features(view))
+        for section, view in document.section_views(_EXPERIENCE_SECTIONS | _ACHIEVEMENT_SECTIONS)
+    ]
+    experience = merge_features(f for name, f in scans if name in _EXPERIENCE_SECTIONS)
+    achievements = merge_features(f for name, f in scans if name in _ACHIEVEMENT_SECTIONS)
     return {
-        "skills_found": _find_skills(lowercase_text),
-        "experience_level": _parse_years_of_experience(lowercase_text),
-        "_word_count": len(normalized.split()),
+        "skills_found": _find_skills(document.section_text(_SKILL_SECTIONS)),
+        "experience_level": experience.years_of_experience,
+        "_word_count": document.word_count,
         # ADDED BACK: Quantifiable achievements data
-        "_quant_achievements": _detect_quantifiable_achievements(lowercase_text)
+        "_quant_achievements": achievements.quantifiable_achievements
     }
 
 # ADDED BACK: Function to generate the ATS score
@@ -89,21 +82,44 @@ def generate_ats_score(analysis_dict: Dict[str, Any]) -> int:
 
     return int(round(max(0.0, min(100.0, total_points))))
 
-def generate_gemini_recommendations(resume_text: str) -> Dict[str, Any]:
+def _streamlit():
+    # Only use Streamlit when the app has loaded it, so headless imports of
+    # this module (workers, scripts) never pay for importing it
+    return sys.modules.get("streamlit")
+
+def _report_gemini_error(e: Exception) -> None:
+    st = _streamlit()
+    if st is not None:
+        st.error(f"Error calling Gemini API: {e}")
+    else:
+        logger.error(f"Error calling Gemini API: {e}")
+
+def _gemini_api_key() -> Optional[str]:
+    # Environment variable first so headless runs (batch_analyze.py) work without secrets.toml
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if api_key:
+        return api_key
+    st = _streamlit()
+    if st is None:
+        return None
     try:
-        api_key = st.secrets.get("GEMINI_API_KEY")
-        if not api_key:
-            st.error("GEMINI_API_KEY not found in Streamlit secrets.")
-            return {}
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-
-        prompt = f"""
+        return st.secrets.get("GEMINI_API_KEY")
+    except Exception:
+        return None
+
+def _build_recommendation_prompt(resume_text: str) -> str:
+    from prompt_compactor import compact_resume_text
+
+    # Deterministic, so the prompt itself is the response cache key
+    compacted = compact_resume_text(resume_text)
+    count("prompt_tokens", compacted.compacted_tokens)
+    count("prompt_tokens_saved", compacted.tokens_saved)
+    logger.debug(f"Recommendation prompt: {compacted.compacted_tokens} tokens, {compacted.tokens_saved} saved")
+    return f"""
         Act as an expert career coach.
         Analyze this resume text:
 
-        {resume_text}
+        {compacted.text}
 
         Return ONLY valid JSON in this exact format:
 
@@ -114,33 +130,190 @@ def generate_gemini_recommendations(resume_text: str) -> Dict[str, Any]:
         }}
         """
 
-        response = model.generate_content(prompt)
+async def generate_gemini_recommendations_async(
+    resume_text: str, api_key: Optional[str] = None, max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Async variant of generate_gemini_recommendations. Raises GeminiError on failure.
+    ``max_concurrency`` caps the requests in flight on the shared client.
+    """
+    from gemini_client import GeminiError, get_gemini_client
+
+    api_key = api_key or _gemini_api_key()
+    if not api_key:
+        raise GeminiError("GEMINI_API_KEY not found in environment or Streamlit secrets.")
+    client = get_gemini_client(api_key, max_concurrency=max_concurrency)
+    with stage("llm"):
+        return await client.generate_json(_build_recommendation_prompt(resume_text))
+
+async def generate_gemini_recommendations_many(
+    resume_texts: List[str], max_concurrency: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Recommendations for many resumes, keeping the client's concurrency limit of
+    requests in flight. Failed entries come back as empty dicts.
+    """
+    from gemini_client import get_gemini_client
 
-        raw = response.text or "{}"
-        return json.loads(raw)
+    api_key = _gemini_api_key()
+    if not api_key:
+        return [{} for _ in resume_texts]
+    client = get_gemini_client(api_key, max_concurrency=max_concurrency)
+    results = await client.generate_json_many([_build_recommendation_prompt(text) for text in resume_texts])
+    return [r if isinstance(r, dict) else {} for r in results]
+
+def generate_gemini_recommendations(resume_text: str) -> Dict[str, Any]:
+    import asyncio
 
+    try:
+        return asyncio.run(generate_gemini_recommendations_async(resume_text))
     except Exception as e:
-        st.error(f"Error calling Gemini API: {e}")
+        _report_gemini_error(e)
         return {}
 
+def start_gemini_recommendations(resume_text: str) -> Future:
+    """
+    Start the Gemini call on a background thread and return its future, so
+    local analysis and rendering can proceed while the model responds.
+    """
+    import asyncio
+
+    # Read the key here: st.secrets needs the calling script thread's context
+    api_key = _gemini_api_key()
+    # Run in a copy of this context so an active instrumentation trace sees the LLM stage
+    context = contextvars.copy_context()
+    return _AI_EXECUTOR.submit(
+        context.run, lambda: asyncio.run(generate_gemini_recommendations_async(resume_text, api_key))
+    )
+
+def _collect_within(ai_future: Future, timeout: Optional[float]) -> Tuple[Dict[str, Any], Optional["Degradation"]]:
+    from concurrent.futures import TimeoutError as FutureTimeout
+
+    from limits import Degradation
 
-def full_analysis_pipeline(uploaded_file: UploadedFile) -> Dict[str, Any]:
-    result = {'success': False, 'error_message': None}
     try:
-        resume_text = extract_text_from_file(uploaded_file)
-        basic_analysis = analyze_resume(resume_text)
-        # ADDED BACK: ATS score calculation is now part of the pipeline
-        ats_score = generate_ats_score(basic_analysis)
-        ai_recommendations = generate_gemini_recommendations(resume_text)
-        
+        return ai_future.result(timeout=timeout), None
+    except FutureTimeout:
+        # The call is abandoned; its thread finishes on its own and a late
+        # response still lands in the Gemini client's cache
+        ai_future.cancel()
+        count("degradations", stage="ai", reason="deadline")
+        return {}, Degradation("ai", "deadline", f"AI skipped: no response within {timeout:g}s")
+    except Exception as e:
+        _report_gemini_error(e)
+        return {}, None
+
+def collect_gemini_recommendations(ai_future: Future, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Wait up to ``timeout`` seconds for a call started with
+    start_gemini_recommendations; reports errors like
+    generate_gemini_recommendations and returns {} on failure or timeout.
+    """
+    ai_recommendations, degradation = _collect_within(ai_future, timeout)
+    if degradation is not None:
+        st = _streamlit()
+        if st is not None:
+            st.warning(degradation.message)
+        else:
+            logger.warning(degradation.message)
+    return ai_recommendations
+
+
+def cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters of the analysis result cache.
+    """
+    return _RESULT_CACHE.stats()
+
+def _extract_text_cached(
+    uploaded_file: "UploadedFile", cache_key: str, limits: "AnalysisLimits"
+) -> Tuple[str, List[Dict[str, str]]]:
+    extraction = _RESULT_CACHE.get(cache_key, "extraction")
+    count("cache_lookups", kind="text", outcome="miss" if extraction is None else "hit")
+    if extraction is not None:
+        return extraction["text"], list(extraction["degradations"])
+
+    from limits import extract_text_within_limits
+
+    logger.info(f"Processing file: {uploaded_file.name}")
+    # The app handles one upload at a time, so large PDFs get the page pool
+    resume_text, degradations = extract_text_within_limits(
+        uploaded_file, uploaded_file.name, limits, parallel=True
+    )
+    degradations = [d._asdict() for d in degradations]
+    # Where a deadline cut the text depends on load, so only cache complete runs
+    if not any(d["reason"] == "deadline" for d in degradations):
+        _RESULT_CACHE.set(cache_key, "extraction", {"text": resume_text, "degradations": degradations})
+    return resume_text, degradations
+
+def _analyze_cached(resume_text: str, cache_key: str) -> Tuple[Dict[str, Any], int]:
+    basic_analysis = _RESULT_CACHE.get(cache_key, "analysis")
+    if basic_analysis is None:
+        with stage("analysis"):
+            basic_analysis = analyze_resume(resume_text)
+        _RESULT_CACHE.set(cache_key, "analysis", basic_analysis)
+
+    # ADDED BACK: ATS score calculation is now part of the pipeline
+    ats_score = _RESULT_CACHE.get(cache_key, "ats")
+    if ats_score is None:
+        with stage("scoring"):
+            ats_score = generate_ats_score(basic_analysis)
+        _RESULT_CACHE.set(cache_key, "ats", ats_score)
+    return basic_analysis, ats_score
+
+def run_local_analysis(
+    uploaded_file: "UploadedFile", start_ai: bool = False, limits: Optional["AnalysisLimits"] = None
+) -> Dict[str, Any]:
+    """
+    Extraction, analysis and ATS scoring without waiting for Gemini.
+    With ``start_ai`` the Gemini call is started right after extraction and
+    its future is returned under 'ai_future' (see collect_gemini_recommendations).
+
+    Extraction is bounded by ``limits`` (see limits.py); anything cut short
+    is listed under 'degradations'. On failure 'error_stage' names the stage
+    that failed.
+    """
+    from limits import get_analysis_limits
+
+    limits = limits or get_analysis_limits()
+    result = {'success': False, 'error_message': None, 'error_stage': None, 'degradations': []}
+    current_stage = "extraction"
+    try:
+        if not uploaded_file or not hasattr(uploaded_file, 'name'):
+            raise ValueError("Invalid file object provided")
+        cache_key = content_key(
+            uploaded_file, ANALYZER_VERSION, taxonomy_stamp(), limits.cache_version()
+        )
+        resume_text, result['degradations'] = _extract_text_cached(uploaded_file, cache_key, limits)
+        if start_ai:
+            result['ai_future'] = start_gemini_recommendations(resume_text)
+        current_stage = "analysis"
+        basic_analysis, ats_score = _analyze_cached(resume_text, cache_key)
+
         result.update({
             'success': True,
             'resume_text': resume_text,
             'basic_analysis': basic_analysis,
             'ats_score': ats_score, # Pass the score to the UI
+        })
+    except Exception as e:  # TextExtractionError and anything unexpected
+        logger.warning(f"Resume analysis failed during {current_stage}: {str(e)}")
+        result['error_message'] = str(e)
+        result['error_stage'] = current_stage
+    return result
+
+def full_analysis_pipeline(uploaded_file: "UploadedFile", limits: Optional["AnalysisLimits"] = None) -> Dict[str, Any]:
+    from limits import get_analysis_limits
+
+    limits = limits or get_analysis_limits()
+    result = run_local_analysis(uploaded_file, start_ai=True, limits=limits)
+    ai_future = result.pop('ai_future', None)
+    if result['success']:
+        ai_recommendations, degradation = _collect_within(ai_future, limits.ai_seconds)
+        if degradation is not None:
+            result['degradations'].append(degradation._asdict())
+        result.update({
             'ai_recommendations': ai_recommendations,
             'ai_available': bool(ai_recommendations)
         })
-    except (TextExtractionError, Exception) as e:
-        result['error_message'] = str(e)
     return result
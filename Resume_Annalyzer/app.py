@@ -1,9 +1,12 @@
 import streamlit as st
+from contextlib import nullcontext
 import plotly.graph_objects as go
 from typing import List, Dict
 
-# Import the main function from your analyzer file
-from analyzer import full_analysis_pipeline
+# Import the main functions from your analyzer file
+from analyzer import run_local_analysis, collect_gemini_recommendations
+import instrumentation
+from limits import get_analysis_limits
 
 def _render_score_gauge(score: int):
     if score >= 75:
@@ -37,25 +40,63 @@ def _create_skill_badges(skills: List[str]) -> str:
     ]
     return " ".join(badges)
 
+def _render_ai_feedback(ai_recommendations: Dict):
+    if not ai_recommendations:
+        st.info("AI analysis is temporarily unavailable. The basic analysis below is still available.")
+        return
+
+    summary = ai_recommendations.get("summaryParagraph", "No summary available.")
+    st.markdown(f"> {summary}") # Display summary as a blockquote
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### 🚀 Recommended Career Paths")
+        jobs = ai_recommendations.get("jobRecommendations", [])
+        if jobs:
+            for job in jobs: st.success(f"• **{job}**")
+    with col2:
+        st.markdown("#### 🧠 Skills to Learn Next")
+        suggestions = ai_recommendations.get("learningSuggestions", [])
+        if suggestions:
+            for suggestion in suggestions: st.info(f"• {suggestion}")
+
+def _render_debug_panel(spans: List[Dict]):
+    with st.expander("⏱️ Timing details", expanded=True):
+        stages = [s for s in spans if "stage" in s]
+        for span in stages:
+            details = ", ".join(f"{k}={v}" for k, v in span.items() if k not in ("stage", "seconds", "outcome"))
+            st.text(f"{span['stage']:<12} {span['seconds'] * 1000:9.1f} ms  {span['outcome']}  {details}")
+        for event in (s for s in spans if "counter" in s):
+            labels = ", ".join(f"{k}={v}" for k, v in event.items() if k not in ("counter", "value"))
+            st.text(f"{event['counter']}: {event['value']} {labels}")
+        if instrumentation.is_enabled():
+            st.code(instrumentation.prometheus_text(), language="text")
+
 def page_resume_analyzer():
     st.set_page_config(page_title="AI Resume Analyzer", layout="wide")
     st.header("📄 AI Resume Analyzer")
     st.write("Upload your resume to get an ATS score and AI-powered feedback.")
 
     uploaded_file = st.file_uploader("Upload Your Resume", type=["pdf", "docx", "doc"])
+    show_timings = st.sidebar.checkbox("Show timing details", value=instrumentation.is_enabled())
     
     if st.button("Analyze Resume", type="primary") and uploaded_file:
-        with st.spinner("Analyzing your resume... 🤖"):
-            result = full_analysis_pipeline(uploaded_file)
+        # Local analysis takes milliseconds; the Gemini call starts right after
+        # extraction and runs in the background while the results render
+        tracing = instrumentation.trace() if show_timings else nullcontext([])
+        with st.spinner("Analyzing your resume... 🤖"), tracing as spans:
+            result = run_local_analysis(uploaded_file, start_ai=True)
 
         if not result['success']:
             st.error(f"Analysis failed: {result['error_message']}")
             return
+        for degradation in result['degradations']:
+            st.info(f"ℹ️ Partial analysis: {degradation['message']}")
 
         analysis = result['basic_analysis']
         ats_score = result.get('ats_score', 0)
-        ai_recommendations = result.get('ai_recommendations', {})
-        ai_available = result.get('ai_available', False)
+        ai_future = result.get('ai_future')
 
         st.markdown("---")
         st.markdown("## 📊 Resume Analysis Results")
@@ -71,27 +112,13 @@ def page_resume_analyzer():
 
         st.markdown("---")
         
-        # AI-Powered Feedback Section
+        # AI-Powered Feedback Section: reserve its place, fill it once the model responds
         st.markdown("### 🤖 AI-Powered Feedback")
-        if not ai_available:
-            st.info("AI analysis is temporarily unavailable. The basic analysis below is still available.")
-        else:
-            summary = ai_recommendations.get("summaryParagraph", "No summary available.")
-            st.markdown(f"> {summary}") # Display summary as a blockquote
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("#### 🚀 Recommended Career Paths")
-                jobs = ai_recommendations.get("jobRecommendations", [])
-                if jobs:
-                    for job in jobs: st.success(f"• **{job}**")
-            with col2:
-                st.markdown("#### 🧠 Skills to Learn Next")
-                suggestions = ai_recommendations.get("learningSuggestions", [])
-                if suggestions:
-                    for suggestion in suggestions: st.info(f"• {suggestion}")
-        
+        ai_section = st.container()
+        with ai_section:
+            ai_pending = st.empty()
+            ai_pending.info("⏳ Generating AI feedback... the results below are ready now.")
+
         st.markdown("---")
 
         # IMPROVED: Additional Metrics Section
@@ -129,5 +156,13 @@ def page_resume_analyzer():
         st.markdown("#### 💼 Skills Found")
         st.markdown(_create_skill_badges(analysis.get("skills_found", [])), unsafe_allow_html=True)
 
+        with ai_section:
+            ai_recommendations = collect_gemini_recommendations(ai_future, timeout=get_analysis_limits().ai_seconds)
+            ai_pending.empty()
+            _render_ai_feedback(ai_recommendations)
+
+        if show_timings:
+            _render_debug_panel(spans)
+
 if __name__ == "__main__":
     page_resume_analyzer()
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""
+Headless batch analysis: extract, analyze and ATS-score a directory of resumes
+across CPU cores and stream the results to a JSONL file.
+
+Usage:
+    python batch_analyze.py resumes/ -o results.jsonl
+    python batch_analyze.py --manifest paths.txt -o results.jsonl --workers 8 --skip-ai
+
+Gemini recommendations run on an event loop in the parent process, with up to
+``--ai-in-flight`` requests outstanding at once; each finished request frees
+its slot for the next resume, while workers keep analyzing the next files.
+
+With ``--resume-store`` the features of every analyzed resume are also saved
+to the resume feature store used by ``shortlist.py``. With ``--export`` they
+are appended to the columnar analytics tables (see analytics_export.py).
+
+Every finished file is appended to a checkpoint file (``<output>.done`` by
+default); re-running the same command skips files already recorded there, so
+an interrupted run resumes where it stopped.
+
+The analytics export buffers a row group before writing it, and its buffered
+rows are written when the run ends, including on an exception or Ctrl-C. If
+the process is killed outright, files checkpointed after the last written row
+group are in the JSONL output but missing from the export.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, Optional, Set
+
+from pdf_parser import SUPPORTED_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+
+def iter_resume_paths(input_dir: Optional[str] = None, manifest: Optional[str] = None) -> Iterator[str]:
+    """
+    Lazily yield resume paths from a directory tree or a manifest file
+    (one path per line, blank lines and '#' comments ignored).
+    """
+    if manifest:
+        with open(manifest, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+        return
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().rsplit(".", 1)[-1] in SUPPORTED_EXTENSIONS:
+                yield os.path.join(root, name)
+
+
+def load_checkpoint(checkpoint_path: str) -> Set[str]:
+    if not os.path.isfile(checkpoint_path):
+        return set()
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def _file_hash(path: str) -> str:
+    # SHA-256 of the file's bytes alone. Unlike result_cache.content_key, it
+    # folds in no analyzer, taxonomy or limits versions, so it identifies the
+    # file across releases
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def analyze_path(path: str, include_text: bool = False) -> Dict[str, Any]:
+    """
+    Run extraction, analysis and ATS scoring for one file. Runs in a worker
+    process; never raises, failures are reported in the returned record.
+    """
+    # Imported here so the parent process only pays for the walker and writer
+    from analyzer import analyze_resume, generate_ats_score
+    from limits import extract_text_within_limits
+
+    record: Dict[str, Any] = {"path": path, "success": False, "error_message": None}
+    start = time.perf_counter()
+    current_stage = "extraction"
+    try:
+        # Pages are extracted serially; workers already run in parallel
+        resume_text, degradations = extract_text_within_limits(path, os.path.basename(path))
+        current_stage = "analysis"
+        basic_analysis = analyze_resume(resume_text)
+        record.update({
+            "success": True,
+            "content_hash": _file_hash(path),
+            "basic_analysis": basic_analysis,
+            "ats_score": generate_ats_score(basic_analysis),
+            "degradations": [d._asdict() for d in degradations],
+        })
+        if include_text:
+            record["resume_text"] = resume_text
+    except Exception as e:
+        record["error_message"] = str(e)
+        record["error_stage"] = current_stage
+    record["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return record
+
+
+async def _recommend(record: Dict[str, Any], max_concurrency: int) -> Dict[str, Any]:
+    from analyzer import generate_gemini_recommendations_async
+
+    try:
+        return await generate_gemini_recommendations_async(record["resume_text"], max_concurrency=max_concurrency)
+    except Exception as e:
+        logger.warning(f"{record['path']}: Gemini recommendations failed: {e}")
+        return {}
+
+
+def run_batch(
+    paths: Iterator[str],
+    output_path: str,
+    checkpoint_path: str,
+    workers: int,
+    max_in_flight: int,
+    skip_ai: bool = True,
+    include_text: bool = False,
+    ai_in_flight: int = 8,
+    resume_store_path: Optional[str] = None,
+    export_dir: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Analyze ``paths`` in a process pool, appending each result to
+    ``output_path`` as soon as it finishes. At most ``max_in_flight`` files
+    are queued at once, so memory stays bounded however long the input is.
+    Unless ``skip_ai``, up to ``ai_in_flight`` Gemini requests run at once.
+    Successful analyses are also saved to ``resume_store_path`` and exported
+    to ``export_dir`` if given.
+    """
+    done = load_checkpoint(checkpoint_path)
+    resume_store = None
+    if resume_store_path:
+        from resume_store import get_resume_store
+
+        resume_store = get_resume_store(resume_store_path)
+    exporter = None
+    if export_dir:
+        from analytics_export import AnalyticsExporter
+
+        exporter = AnalyticsExporter(export_dir)
+    counts = {"processed": 0, "failed": 0, "skipped": 0}
+    ai_in_flight = max(1, ai_in_flight)
+    # Gemini calls for analyzed records, keyed by their future
+    awaiting_ai: Dict[Future, Dict[str, Any]] = {}
+    ai_loop = ai_thread = None
+    if not skip_ai:
+        ai_loop = asyncio.new_event_loop()
+        ai_thread = threading.Thread(target=ai_loop.run_forever, name="gemini-batch", daemon=True)
+        ai_thread.start()
+
+    try:
+        with open(output_path, "a", encoding="utf-8") as out, \
+                open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+
+            def write(record):
+                if not include_text:
+                    record.pop("resume_text", None)
+                if resume_store is not None and record["success"]:
+                    resume_store.put(
+                        record["content_hash"], record["basic_analysis"], record["ats_score"],
+                        name=os.path.basename(record["path"]),
+                    )
+                if exporter is not None and record["success"]:
+                    exporter.add_analysis(
+                        record["basic_analysis"], record["ats_score"],
+                        content_hash=record["content_hash"], name=os.path.basename(record["path"]),
+                    )
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                # Checkpoint only after the record is on disk
+                checkpoint.write(record["path"] + "\n")
+                checkpoint.flush()
+                counts["processed"] += 1
+                if not record["success"]:
+                    counts["failed"] += 1
+                    logger.warning(f"{record['path']}: {record['error_message']}")
+
+            def drain(pending):
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record = awaiting_ai.pop(future, None)
+                    if record is not None:
+                        ai_recommendations = future.result()
+                        record["ai_recommendations"] = ai_recommendations
+                        record["ai_available"] = bool(ai_recommendations)
+                        write(record)
+                        continue
+                    record = future.result()
+                    if skip_ai or not record["success"]:
+                        write(record)
+                        continue
+                    # The client's semaphore keeps ai_in_flight requests running;
+                    # the rest wait on the loop until a slot frees up
+                    ai_future = asyncio.run_coroutine_threadsafe(_recommend(record, ai_in_flight), ai_loop)
+                    awaiting_ai[ai_future] = record
+                    pending.add(ai_future)
+                return pending
+
+            try:
+                pending = set()
+                for path in paths:
+                    if path in done:
+                        counts["skipped"] += 1
+                        continue
+                    # The Gemini stage needs the text back from the worker
+                    pending.add(pool.submit(analyze_path, path, include_text or not skip_ai))
+                    # Bound queued files and Gemini calls. Up to ai_in_flight more
+                    # calls wait for a slot, so a finished request is replaced at once
+                    while pending and (
+                        len(pending) - len(awaiting_ai) >= max_in_flight or len(awaiting_ai) >= 2 * ai_in_flight
+                    ):
+                        pending = drain(pending)
+                while pending:
+                    pending = drain(pending)
+            finally:
+                if ai_loop is not None:
+                    ai_loop.call_soon_threadsafe(ai_loop.stop)
+                    ai_thread.join()
+                    ai_loop.close()
+    finally:
+        # Write the buffered export rows however the run ends
+        if exporter is not None:
+            exporter.close()
+
+    return counts
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch resume analysis to JSONL")
+    parser.add_argument("input_dir", nargs="?", help="Directory to scan recursively for pdf/docx/doc files")
+    parser.add_argument("--manifest", help="File listing one resume path per line (instead of input_dir)")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file to append results to")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.done)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-in-flight", type=int, help="Max queued files (default: 4 x workers)")
+    parser.add_argument("--skip-ai", action="store_true", help="Skip the Gemini recommendations stage")
+    parser.add_argument("--ai-in-flight", type=int, default=8, help="Concurrent Gemini requests")
+    parser.add_argument("--include-text", action="store_true", help="Include extracted text in each record")
+    parser.add_argument("--resume-store", help="Also save features to this resume store (e.g. data/resumes.sqlite3)")
+    parser.add_argument("--export", help="Also append results to columnar analytics tables in this directory")
+    args = parser.parse_args(argv)
+
+    if bool(args.input_dir) == bool(args.manifest):
+        parser.error("provide exactly one of input_dir or --manifest")
+
+    logging.basicConfig(level=logging.WARNING)
+    start = time.perf_counter()
+    counts = run_batch(
+        iter_resume_paths(args.input_dir, args.manifest),
+        output_path=args.output,
+        checkpoint_path=args.checkpoint or args.output + ".done",
+        workers=args.workers,
+        max_in_flight=args.max_in_flight or 4 * args.workers,
+        skip_ai=args.skip_ai,
+        include_text=args.include_text,
+        ai_in_flight=args.ai_in_flight,
+        resume_store_path=args.resume_store,
+        export_dir=args.export,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"processed={counts['processed']} failed={counts['failed']} "
+          f"skipped={counts['skipped']} elapsed={elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Columnar analytics export of synthetic analyses: Parquet and CSV parts versus
+the JSONL records batch_analyze writes, and reading one column back.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_analytics_export.py --rows 200000
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics_export import AnalyticsExporter, _pyarrow_available, read_columns  # noqa: E402
+from text_core import PREDEFINED_SKILLS  # noqa: E402
+
+
+def make_analyses(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    for i in range(count):
+        analysis = {
+            "skills_found": sorted(rng.sample(PREDEFINED_SKILLS, rng.randint(0, 12))),
+            "experience_level": rng.choice([None, 1.0, 2.0, 3.0, 5.0, 8.0, 12.0]),
+            "_word_count": rng.randint(150, 1200),
+            "_quant_achievements": rng.randint(0, 6),
+        }
+        yield hashlib.sha256(f"resume-{i}".encode()).hexdigest(), analysis, rng.randint(20, 95)
+
+
+def _size_mb(path: str) -> float:
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 1e6
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--row-group-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    rows = list(make_analyses(args.rows))
+    tmp = tempfile.mkdtemp(prefix="bench_export_")
+    try:
+        jsonl = os.path.join(tmp, "results.jsonl")
+        start = time.perf_counter()
+        with open(jsonl, "w", encoding="utf-8") as out:
+            for content_hash, analysis, ats_score in rows:
+                record = {"content_hash": content_hash, "basic_analysis": analysis, "ats_score": ats_score}
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+        print(f"{'jsonl':8s} write {time.perf_counter() - start:6.2f}s  {_size_mb(jsonl):7.1f} MB")
+
+        formats = ["parquet", "csv"] if _pyarrow_available() else ["csv"]
+        for fmt in formats:
+            directory = os.path.join(tmp, fmt)
+            start = time.perf_counter()
+            with AnalyticsExporter(directory, args.row_group_size, fmt) as exporter:
+                for content_hash, analysis, ats_score in rows:
+                    exporter.add_analysis(analysis, ats_score, content_hash=content_hash)
+            write_seconds = time.perf_counter() - start
+
+            table = os.path.join(directory, "analyses")
+            start = time.perf_counter()
+            scores = read_columns(table, ["ats_score"])["ats_score"]
+            one_column = time.perf_counter() - start
+            start = time.perf_counter()
+            read_columns(table)
+            all_columns = time.perf_counter() - start
+            assert scores == [ats_score for _, _, ats_score in rows]
+            print(f"{fmt:8s} write {write_seconds:6.2f}s  {_size_mb(directory):7.1f} MB  "
+                  f"read ats_score {one_column * 1000:7.1f} ms  all columns {all_columns * 1000:7.1f} ms")
+        if len(formats) == 1:
+            print("pyarrow not installed; timing the CSV fallback only")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+DOCX extraction on a large synthetic resume (long tables plus embedded
+images): the streaming document.xml parser versus docx2txt, which reads and
+regex-strips every XML part of the archive.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_docx_extractor.py --rows 5000 --images 20
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import _CONTENT_TYPES, _RELS, make_resume_text  # noqa: E402
+from pdf_parser import extract_text_from_docx  # noqa: E402
+
+
+def make_large_docx(rows: int, images: int, image_bytes: int, seed: int = 3) -> bytes:
+    """
+    A DOCX with a resume, a ``rows`` x 4 table and ``images`` incompressible media parts.
+    """
+    rng = random.Random(seed)
+    body = [f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+            for line in make_resume_text(seed=seed).split("\n")]
+    body.append("<w:tbl>")
+    for i in range(rows):
+        cells = "".join(
+            f'<w:tc><w:p><w:r><w:t>{escape(f"Project {i} item {j} {rng.random():.6f}")}</w:t></w:r></w:p></w:tc>'
+            for j in range(4)
+        )
+        body.append(f"<w:tr>{cells}</w:tr>")
+    body.append("</w:tbl>")
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}</w:body></w:document>'
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        archive.writestr("_rels/.rels", _RELS)
+        archive.writestr("word/document.xml", document)
+        for i in range(images):
+            archive.writestr(f"word/media/image{i + 1}.png", rng.randbytes(image_bytes))
+    return out.getvalue()
+
+
+def _measure(fn, data: bytes, repeat: int):
+    fn(data)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(data)
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    fn(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--image-kb", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_large_docx(args.rows, args.images, args.image_kb * 1024)
+    print(f"docx: {len(data) / 1e6:.1f} MB, {args.rows} table rows, {args.images} images")
+
+    engines = {"streaming": extract_text_from_docx}
+    try:
+        import docx2txt
+        engines["docx2txt"] = lambda b: docx2txt.process(io.BytesIO(b))
+    except ImportError:
+        print("docx2txt not installed; timing the streaming extractor only")
+
+    texts = {}
+    for name, fn in engines.items():
+        elapsed, peak = _measure(fn, data, args.repeat)
+        texts[name] = fn(data)
+        print(f"{name:10s} {elapsed * 1000:8.1f} ms   peak {peak / 1e6:6.1f} MB")
+    if "docx2txt" in texts:
+        same = texts["streaming"].split() == texts["docx2txt"].split()
+        print(f"same words as docx2txt: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark of the one-pass numeric feature scanner against the
+per-pattern regex passes analyze_resume used before.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_feature_scanner.py --words 500,5000,50000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_scanner import scan_numeric_features  # noqa: E402
+
+_VOCAB = ("led a team of 6 engineers increased revenue by 25% saved $1.2m over 3 years "
+          "with 4+ yrs of python and sql experience reduced latency 30 ms built services "
+          "for customers 2015 to 2019 designed apis deployed to aws improved onboarding").split()
+
+
+def legacy_features(text: str):
+    normalized = re.sub(r"\s+", " ", text or "").strip()
+    lowercase_text = normalized.lower()
+    candidates: List[float] = []
+    patterns = [
+        re.compile(r"(?i)\b(\d{1,2})\s*\+?\s*(?:years?|yrs?|yoe)\b"),
+        re.compile(r"(?i)(\d{1,2})\s*to\s*(\d{1,2})\s*years"),
+        re.compile(r"(?i)experience[^\n.]{0,20}(\d{1,2})\s*years"),
+    ]
+    for pat in patterns:
+        for m in pat.finditer(lowercase_text):
+            nums = [float(g) for g in m.groups() if g and g.isdigit()]
+            if nums:
+                candidates.append(max(nums))
+    count = len(re.findall(r"\b\d+\s*%", lowercase_text))
+    count += len(re.findall(r"\$\s?\d+[\d,]*(?:k|m|b)?", lowercase_text, flags=re.IGNORECASE))
+    count += len(re.findall(r"\b(increased|reduced|improved|boosted|saved|grew|decreased)\b[^\n%$]{0,40}\b\d+\b",
+                            lowercase_text, flags=re.IGNORECASE))
+    return (max(candidates) if candidates else 0.0), count, len(normalized.split())
+
+
+def scanner_features(text: str):
+    words = (text or "").split()
+    features = scan_numeric_features(" ".join(words).lower())
+    return features.years_of_experience, features.quantifiable_achievements, len(words)
+
+
+def make_resume(words: int, seed: int = 5) -> str:
+    rng = random.Random(seed)
+    out = []
+    for i in range(words):
+        out.append(rng.choice(_VOCAB))
+        if i % 12 == 11:
+            out.append("\n")
+    return " ".join(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", default="500,5000,50000")
+    args = parser.parse_args()
+
+    print(f"{'words':>7} {'legacy ms':>10} {'scanner ms':>11} {'speedup':>8}")
+    for words in (int(w) for w in args.words.split(",")):
+        text = make_resume(words)
+        if legacy_features(text) != scanner_features(text):
+            raise SystemExit(f"feature mismatch at {words} words")
+        number = max(1, 20000 // words)
+        legacy = min(timeit.repeat(lambda: legacy_features(text), number=number, repeat=5)) / number
+        scanner = min(timeit.repeat(lambda: scanner_features(text), number=number, repeat=5)) / number
+        print(f"{words:>7} {legacy * 1000:>10.2f} {scanner * 1000:>11.2f} {legacy / scanner:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Fuzzy (hashed n-gram) skill matching against exact matching: build time,
+throughput, recall on resumes with misspelled skill names, and precision
+when the same resumes also contain multi-word skills with their words
+reordered ("learning machine"), which must not match.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_fuzzy_matcher.py --sizes 17,100,1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List, Set, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_skill_matcher import _FILLER, _rate, make_taxonomy  # noqa: E402
+from fuzzy_matcher import FuzzySkillMatcher, _phrase_features  # noqa: E402
+from skill_matcher import SkillMatcher  # noqa: E402
+
+
+def misspell(skill: str, rng: random.Random) -> str:
+    # One edit that keeps the name recognizable: a dropped, doubled or
+    # hyphenated character, or an inflected ending
+    chars = list(skill.lower())
+    edit = rng.choice(("drop", "double", "hyphen", "suffix"))
+    if edit == "suffix" or len(chars) < 6:
+        return skill.lower() + "s"
+    i = rng.randrange(2, len(chars) - 2)
+    if edit == "drop":
+        del chars[i]
+    elif edit == "double":
+        chars.insert(i, chars[i])
+    else:
+        chars[i] = "-" if chars[i] == " " else chars[i]
+    return "".join(chars)
+
+
+def make_resume(taxonomy: List[str], words: int, seed: int) -> Tuple[str, Set[str]]:
+    rng = random.Random(seed)
+    multi_word = [s for s in taxonomy if " " in s]
+    out: List[str] = []
+    planted: Set[str] = set()
+    while len(out) < words:
+        roll = rng.random()
+        if roll < 0.05:
+            skill = rng.choice([s for s in taxonomy if len(s) >= 6])
+            planted.add(skill)
+            out.extend(misspell(skill, rng).split())
+        elif roll < 0.07 and multi_word:
+            # Decoy: the words of a skill in reverse order
+            out.extend(reversed(rng.choice(multi_word).lower().split()))
+        else:
+            out.append(rng.choice(_FILLER))
+    return " ".join(out), planted
+
+
+def _ratio(hits: int, total: int) -> float:
+    return hits / total if total else 1.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="17,100,1000")
+    parser.add_argument("--words", type=int, default=800)
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per measurement")
+    args = parser.parse_args()
+
+    print(f"{'skills':>7} {'build ms':>9} {'exact res/s':>12} {'fuzzy res/s':>12} "
+          f"{'cold res/s':>11} {'exact recall':>13} {'fuzzy recall':>13} {'fuzzy precision':>16}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        taxonomy = make_taxonomy(size)
+        texts = [make_resume(taxonomy, args.words, seed) for seed in range(20)]
+        exact = SkillMatcher(taxonomy)
+        start = time.perf_counter()
+        fuzzy = FuzzySkillMatcher(taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        exact_hits = fuzzy_hits = planted_total = fuzzy_only_hits = fuzzy_found = 0
+        for text, planted in texts:
+            exact_found, found = exact.find(text), fuzzy.find(text)
+            planted_total += len(planted)
+            exact_hits += len(planted & exact_found)
+            fuzzy_hits += len(planted & found)
+            # Precision of what fuzzy matching adds; exact hits on the
+            # synthetic names' component words are not its doing
+            fuzzy_only = found - exact_found
+            fuzzy_only_hits += len(planted & fuzzy_only)
+            fuzzy_found += len(fuzzy_only)
+
+        text = texts[0][0]
+        exact_rate = _rate(lambda: exact.find(text), args.budget)
+        fuzzy_rate = _rate(lambda: fuzzy.find(text), args.budget)
+
+        def cold():
+            _phrase_features.cache_clear()
+            fuzzy.find(text)
+
+        cold_rate = _rate(cold, args.budget)
+        print(f"{size:>7} {build_ms:>9.1f} {exact_rate:>12.1f} {fuzzy_rate:>12.1f} {cold_rate:>11.1f} "
+              f"{_ratio(exact_hits, planted_total):>13.2f} {_ratio(fuzzy_hits, planted_total):>13.2f} "
+              f"{_ratio(fuzzy_only_hits, fuzzy_found):>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Top-k JD ranking with JDMatchIndex versus calling calculate_jd_match per JD.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_jd_ranker.py --jds 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jd_ranker import JDMatchIndex  # noqa: E402
+from job_description_manager import PREDEFINED_SKILLS, calculate_jd_match  # noqa: E402
+
+_KEYWORDS = ["team", "python", "cloud", "docker", "agile", "sql", "design", "aws", "backend", "api"]
+
+
+def make_jds(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    jds = []
+    for _ in range(count):
+        jds.append({
+            "required_skills": rng.sample(PREDEFINED_SKILLS, rng.randint(0, 8)),
+            "experience_years": rng.choice([None, 0.0, 1.0, 2.0, 3.0, 5.0, 8.0]),
+            "keywords": rng.sample(_KEYWORDS, rng.randint(0, 6)),
+        })
+    return jds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jds", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--check", type=int, default=20000, help="JDs to verify against calculate_jd_match")
+    args = parser.parse_args()
+
+    jds = make_jds(args.jds)
+    resume = {"skills_found": ["Python", "SQL", "Docker", "AWS", "Communication"], "experience_level": 3.0}
+
+    start = time.perf_counter()
+    index = JDMatchIndex(jds)
+    build_s = time.perf_counter() - start
+
+    scores = index.scores(resume)
+    for i in range(min(args.check, len(jds))):
+        if scores[i] != calculate_jd_match(resume, jds[i])["score"]:
+            raise SystemExit(f"score mismatch at JD {i}")
+
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        top = index.top_k(resume, args.k)
+    vector_ms = (time.perf_counter() - start) / runs * 1000
+
+    start = time.perf_counter()
+    loop = sorted(((-calculate_jd_match(resume, jd)["score"], i) for i, jd in enumerate(jds)))[:args.k]
+    loop_ms = (time.perf_counter() - start) * 1000
+    if [i for _, i in loop] != [r["index"] for r in top]:
+        raise SystemExit("top-k mismatch")
+
+    print(f"jds={args.jds} build={build_s:.2f}s top{args.k}: vectorized={vector_ms:.1f}ms "
+          f"per-JD loop={loop_ms:.1f}ms speedup={loop_ms / vector_ms:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
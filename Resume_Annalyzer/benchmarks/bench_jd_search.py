@@ -0,0 +1,103 @@
+"""
+BM25 retrieval of stored JDs by resume text: index build, cold load from
+disk, query latency and incremental updates, checked against a brute-force
+BM25 over the same tokens.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_jd_search.py --jds 100000
+"""
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import make_jd_text, make_resume_text  # noqa: E402
+from jd_search import BM25Index, tokenize  # noqa: E402
+from jd_store import JDStore  # noqa: E402
+from job_description_manager import parse_job_description  # noqa: E402
+
+
+def brute_force(store: JDStore, query: str, k: int, k1: float = 1.2, b: float = 0.75):
+    docs = {jd["jd_id"]: Counter(tokenize(jd.get("raw_text", ""))) for jd in store.iter_jds()}
+    lengths = {jd_id: sum(tf.values()) for jd_id, tf in docs.items()}
+    avgdl = sum(lengths.values()) / len(docs)
+    df = Counter(term for tf in docs.values() for term in tf)
+    terms = set(tokenize(query))
+    scores = {}
+    for jd_id, tf in docs.items():
+        score = 0.0
+        for term in terms & tf.keys():
+            idf = math.log1p((len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * lengths[jd_id] / avgdl))
+        if score > 0:
+            scores[jd_id] = score
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jds", type=int, default=100000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--updates", type=int, default=500, help="JDs added after the initial build")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_jd_search_")
+    try:
+        # Bulk-load through the legacy JSON migration: one transaction instead of one per JD
+        legacy_path = os.path.join(workdir, "jds.json")
+        with open(legacy_path, "w", encoding="utf-8") as f:
+            json.dump([parse_job_description(make_jd_text(seed=i)) for i in range(args.jds)], f)
+        store = JDStore(os.path.join(workdir, "jds.sqlite3"))
+        store.migrate_from_json(legacy_path)
+        queries = [make_resume_text(words=600, seed=10_000 + i) for i in range(args.queries)]
+
+        start = time.perf_counter()
+        index = BM25Index(store)
+        index.refresh()
+        build_s = time.perf_counter() - start
+        size_mb = os.path.getsize(index.index_path) / (1024 * 1024)
+
+        start = time.perf_counter()
+        cold = BM25Index(store)
+        cold.search(queries[0], args.k)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, args.k)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        for i in range(args.updates):
+            store.append(parse_job_description(make_jd_text(seed=args.jds + i)))
+        start = time.perf_counter()
+        index.search(queries[0], args.k)
+        catch_up_ms = (time.perf_counter() - start) * 1000
+
+        index.save()
+        expected = brute_force(store, queries[0], args.k)
+        got = index.search(queries[0], args.k)
+        if [r["jd_id"] for r in got] != [jd_id for jd_id, _ in expected] or any(
+            not math.isclose(r["score"], score, rel_tol=1e-9) for r, (_, score) in zip(got, expected)
+        ):
+            raise SystemExit("BM25 results differ from brute force")
+
+        print(f"jds={args.jds} build={build_s:.2f}s index={size_mb:.1f}MB cold load+query={load_ms:.0f}ms")
+        print(f"query top{args.k}: p50={statistics.median(timings):.1f}ms max={max(timings):.1f}ms; "
+              f"catch up {args.updates} new JDs + query={catch_up_ms:.0f}ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Prompt compaction on synthetic multi-page resumes with running page headers,
+footers and page numbers, as extract_text_from_pdf returns them: estimated
+tokens before and after, and time per resume.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_prompt_compactor.py --budget 1500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import LINES_PER_PAGE, make_resume_text  # noqa: E402
+from prompt_compactor import compact_resume_text  # noqa: E402
+
+
+def with_page_artifacts(text: str, seed: int) -> str:
+    lines = text.split("\n")
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    out = []
+    for number, page in enumerate(pages, 1):
+        out.append(f"Candidate {seed}  |  candidate{seed}@example.com  |  +1 555 0100")
+        out.extend(page)
+        out.extend(["", f"Page {number} of {len(pages)}", "\f"])
+    return "\n".join(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'words':>6} {'tokens in':>10} {'tokens out':>11} {'saved':>7} {'ms/resume':>10}")
+    for words in (300, 600, 1500, 4000):
+        texts = [with_page_artifacts(make_resume_text(words, seed=s), s) for s in range(args.samples)]
+        start = time.perf_counter()
+        results = [compact_resume_text(t, args.budget) for t in texts]
+        elapsed = (time.perf_counter() - start) / len(texts)
+        before = sum(r.original_tokens for r in results) / len(results)
+        after = sum(r.compacted_tokens for r in results) / len(results)
+        assert all(compact_resume_text(t, args.budget) == r for t, r in zip(texts[:5], results))
+        print(f"{words:>6} {before:>10.0f} {after:>11.0f} {1 - after / before:>7.0%} {elapsed * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
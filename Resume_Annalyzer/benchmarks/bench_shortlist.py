@@ -0,0 +1,86 @@
+"""
+Recruiter shortlist over a synthetic resume feature store: serial versus
+sharded across worker processes, checked against sorting every candidate by
+calculate_jd_match.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_shortlist.py --candidates 50000 --workers 4
+"""
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_description_manager import PREDEFINED_SKILLS, calculate_jd_match  # noqa: E402
+from resume_store import ResumeStore  # noqa: E402
+from shortlist import shortlist  # noqa: E402
+
+
+def make_candidates(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    for i in range(count):
+        analysis = {
+            "skills_found": sorted(rng.sample(PREDEFINED_SKILLS, rng.randint(0, 10))),
+            "experience_level": rng.choice([0.0, 1.0, 2.0, 3.0, 5.0, 8.0, 12.0]),
+            "_word_count": rng.randint(150, 1200),
+            "_quant_achievements": rng.randint(0, 6),
+        }
+        yield hashlib.sha256(f"resume-{i}".encode()).hexdigest(), analysis, rng.randint(20, 95), f"resume-{i}.pdf"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--k", type=int, default=25)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_shortlist_")
+    try:
+        db_path = os.path.join(workdir, "resumes.sqlite3")
+        store = ResumeStore(db_path)
+        batch = []
+        for item in make_candidates(args.candidates):
+            batch.append(item)
+            if len(batch) == 5000:
+                store.put_many(batch)
+                batch = []
+        store.put_many(batch)
+        jd = {
+            "required_skills": ["Python", "SQL", "Docker", "AWS", "Machine Learning", "Communication"],
+            "experience_years": 4.0,
+            "keywords": ["python", "docker", "backend", "sql", "api"],
+        }
+
+        start = time.perf_counter()
+        expected = sorted(
+            ((-calculate_jd_match(record, jd)["score"], record["resume_id"]) for record in store.iter_resumes()),
+        )[:args.k]
+        brute_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        serial = shortlist(jd, args.k, db_path, workers=1)
+        serial_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sharded = shortlist(jd, args.k, db_path, workers=args.workers)
+        sharded_s = time.perf_counter() - start
+
+        for result in (serial, sharded):
+            if [(-r["score"], r["resume_id"]) for r in result] != expected:
+                raise SystemExit("shortlist differs from brute-force ranking")
+
+        print(f"candidates={args.candidates} top{args.k}: full sort={brute_s:.2f}s "
+              f"serial={serial_s:.2f}s workers={args.workers}: {sharded_s:.2f}s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Throughput of the single-pass SkillMatcher against the per-skill regex loop
+it replaced, for growing taxonomy sizes.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_skill_matcher.py
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer import PREDEFINED_SKILLS  # noqa: E402
+from skill_matcher import SkillMatcher, TOKEN_BOUNDARY, WORD_BOUNDARY  # noqa: E402
+
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ro", "ta", "vu", "zen", "dat", "net", "py", "js", "ops", "ml"]
+_FILLER = ("designed built maintained services for customers across the team using "
+           "modern tooling and delivered features on time with measurable impact").split()
+
+
+def make_taxonomy(size: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    skills = list(PREDEFINED_SKILLS)
+    seen = {s.lower() for s in skills}
+    while len(skills) < size:
+        words = ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(1, 3)))
+                 for _ in range(rng.randint(1, 3))]
+        skill = " ".join(words).title()
+        if rng.random() < 0.1:
+            skill += rng.choice(["++", "#", ".js"])
+        if skill.lower() not in seen:
+            seen.add(skill.lower())
+            skills.append(skill)
+    return skills[:size]
+
+
+def make_resume(taxonomy: List[str], words: int = 800, seed: int = 11) -> str:
+    rng = random.Random(seed)
+    out = []
+    while len(out) < words:
+        if rng.random() < 0.05:
+            out.extend(rng.choice(taxonomy).split())
+        else:
+            out.append(rng.choice(_FILLER))
+    return " ".join(out).lower()
+
+
+def per_skill_loop(text: str, skills: List[str], prefix: str, suffix: str) -> set:
+    found = set()
+    for skill in skills:
+        if re.search("(?i)" + prefix + re.escape(skill) + suffix, text):
+            found.add(skill)
+    return found
+
+
+def _rate(fn, budget: float) -> float:
+    runs, start = 0, time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget:
+            return runs / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="17,100,1000,8000")
+    parser.add_argument("--words", type=int, default=800)
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds per measurement")
+    args = parser.parse_args()
+
+    print(f"{'skills':>7} {'boundary':>8} {'build ms':>9} {'loop res/s':>11} {'matcher res/s':>14} {'speedup':>8}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        taxonomy = make_taxonomy(size)
+        text = make_resume(taxonomy, args.words)
+        for name, boundary in (("word", WORD_BOUNDARY), ("token", TOKEN_BOUNDARY)):
+            start = time.perf_counter()
+            matcher = SkillMatcher(taxonomy, boundary=boundary)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            expected = per_skill_loop(text, taxonomy, *boundary)
+            if matcher.find(text) != expected:
+                raise SystemExit(f"mismatch for {size} skills ({name} boundary)")
+
+            loop_rate = _rate(lambda: per_skill_loop(text, taxonomy, *boundary), args.budget)
+            matcher_rate = _rate(lambda: matcher.find(text), args.budget)
+            print(f"{size:>7} {name:>8} {build_ms:>9.1f} {loop_rate:>11.1f} "
+                  f"{matcher_rate:>14.1f} {matcher_rate / loop_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
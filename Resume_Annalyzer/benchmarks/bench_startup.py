@@ -0,0 +1,94 @@
+"""
+Cold-start import time and memory of the core modules, each measured in a
+fresh interpreter, plus a check that no heavyweight optional package is
+loaded as a side effect.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --check   # exit 1 if a heavy package loads
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ("analyzer", "job_description_manager", "pdf_parser", "jd_ranker", "batch_analyze")
+
+# Packages the headless core must not import at module load
+HEAVY_PACKAGES = ("streamlit", "plotly", "google.generativeai", "pdfplumber", "pandas")
+
+_PROBE = """
+import json, sys, time
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+before = rss_mb()
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_before_mb": before,
+    "rss_after_mb": rss_mb(),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(module: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_PACKAGES)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--modules", default=",".join(MODULES))
+    parser.add_argument("--check", action="store_true", help="Fail if any heavy package gets imported")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for module in (m for m in args.modules.split(",") if m):
+        runs = [measure(module) for _ in range(args.runs)]
+        after = [r["rss_after_mb"] for r in runs if r["rss_after_mb"] is not None]
+        results[module] = {
+            "import_ms_median": statistics.median(r["seconds"] for r in runs) * 1000,
+            "import_ms_min": min(r["seconds"] for r in runs) * 1000,
+            "peak_rss_mb": statistics.median(after) if after else None,
+            "heavy_imports": sorted({name for r in runs for name in r["heavy"]}),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'module':<26} {'median ms':>10} {'min ms':>8} {'peak RSS MB':>12}  heavy imports")
+        for module, r in results.items():
+            rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "n/a"
+            print(f"{module:<26} {r['import_ms_median']:>10.1f} {r['import_ms_min']:>8.1f} {rss:>12}  "
+                  f"{', '.join(r['heavy_imports']) or '-'}")
+
+    offenders = {m: r["heavy_imports"] for m, r in results.items() if r["heavy_imports"]}
+    if args.check and offenders:
+        print(f"heavy packages imported at startup: {offenders}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
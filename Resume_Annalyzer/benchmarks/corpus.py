@@ -0,0 +1,185 @@
+"""
+Deterministic synthetic corpus for the benchmarks: resume and JD texts of a
+given size and skill density, rendered as PDF or DOCX bytes.
+
+The PDF and DOCX writers only use the standard library, so the corpus can be
+generated anywhere the parsers themselves can run. The same seed always
+produces byte-identical files.
+"""
+import io
+import os
+import random
+import sys
+import zipfile
+from typing import List
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_description_manager import PREDEFINED_SKILLS  # noqa: E402
+
+_FILLER = (
+    "designed built maintained services for customers across teams and led reviews of "
+    "internal tooling delivered features on schedule collaborated with product owners "
+    "mentored engineers documented processes owned the release pipeline and supported "
+    "stakeholders in planning sessions with a focus on reliability and quality"
+).split()
+
+_ACHIEVEMENTS = [
+    "increased conversion by {n}%",
+    "reduced infrastructure cost by ${n}k",
+    "improved response times by {n}%",
+    "saved {n} hours per week",
+    "grew the user base to {n}k accounts",
+]
+
+_SECTIONS = ["Summary", "Experience", "Projects", "Education", "Skills", "Certifications"]
+
+LINES_PER_PAGE = 50
+CHARS_PER_LINE = 90
+
+
+def make_resume_text(words: int = 600, skill_density: float = 0.05, seed: int = 0) -> str:
+    """
+    Resume-like text of roughly ``words`` words, where ``skill_density`` is the
+    fraction of words drawn from the skill taxonomy.
+    """
+    rng = random.Random(seed)
+    years = rng.randint(1, 15)
+    lines: List[str] = [f"Candidate {seed}", f"Software professional with {years}+ years of experience"]
+    count = 0
+    section = 0
+    while count < words:
+        if count % 120 == 0:
+            lines.append(_SECTIONS[section % len(_SECTIONS)])
+            section += 1
+        sentence: List[str] = []
+        for _ in range(rng.randint(8, 16)):
+            if rng.random() < skill_density:
+                sentence.append(rng.choice(PREDEFINED_SKILLS))
+            else:
+                sentence.append(rng.choice(_FILLER))
+        if rng.random() < 0.3:
+            sentence.append(rng.choice(_ACHIEVEMENTS).format(n=rng.randint(2, 90)))
+        count += len(sentence)
+        text = " ".join(sentence)
+        lines.append("- " + text[0].upper() + text[1:] + ".")
+    return "\n".join(lines)
+
+
+def make_jd_text(words: int = 250, skill_density: float = 0.08, seed: int = 0) -> str:
+    """
+    Job-description-like text with a requirements line and an experience range.
+    """
+    rng = random.Random(seed + 1_000_003)
+    low = rng.randint(1, 6)
+    required = rng.sample(PREDEFINED_SKILLS, min(len(PREDEFINED_SKILLS), max(1, int(words * skill_density))))
+    body = make_resume_text(words, skill_density, seed + 2_000_003).split("\n", 2)[-1]
+    return (
+        f"Senior Engineer {seed}\n"
+        f"We are looking for {low} to {low + rng.randint(1, 4)} years of experience.\n"
+        f"Requirements: {', '.join(required)}\n"
+        f"{body}"
+    )
+
+
+def _wrap(text: str, width: int = CHARS_PER_LINE) -> List[str]:
+    out: List[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) > width:
+                out.append(line)
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        out.append(line)
+    return out
+
+
+def _pdf_string(line: str) -> str:
+    safe = line.encode("latin-1", "replace").decode("latin-1")
+    return "(" + safe.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def make_pdf(text: str, min_pages: int = 1) -> bytes:
+    """
+    A minimal text-layer PDF (Helvetica, one Tj per line) of ``text``,
+    padded with repeated content to at least ``min_pages`` pages.
+    """
+    lines = _wrap(text)
+    while len(lines) < min_pages * LINES_PER_PAGE:
+        lines.extend(_wrap(text))
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+
+    # Objects: 1 catalog, 2 pages, 3 font, then a page and content stream per page
+    objects: List[bytes] = [b"", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "40 800 Td"]
+        for line in page_lines:
+            ops.append(f"{_pdf_string(line)} Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        page_id = len(objects) + 1
+        kids.append(f"{page_id} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode("latin-1")
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode("latin-1")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def make_docx(text: str) -> bytes:
+    """
+    A minimal DOCX with one paragraph per line of ``text``.
+    """
+    paragraphs = "".join(
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in text.split("\n")
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        # Fixed timestamps keep the archive bytes identical across runs
+        for name, data in (("[Content_Types].xml", _CONTENT_TYPES), ("_rels/.rels", _RELS),
+                           ("word/document.xml", document)):
+            archive.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), data)
+    return out.getvalue()
@@ -0,0 +1,244 @@
+"""
+Stage benchmarks for the resume pipeline on a synthetic corpus.
+
+Times text extraction (PDF, DOCX), analyze_resume, generate_ats_score,
+parse_job_description, calculate_jd_match and the Gemini round trip (against
+the local stub, never the real API). Each stage runs in a fresh process so its
+peak RSS is its own. Results are saved as JSON; ``compare`` flags stages whose
+latency or memory grew past a threshold and exits non-zero.
+
+Run from the Resume_Annalyzer directory:
+    python benchmarks/run_benchmarks.py run --samples 30 --output baseline.json
+    python benchmarks/run_benchmarks.py run --output current.json
+    python benchmarks/run_benchmarks.py compare baseline.json current.json --threshold 0.15
+"""
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus  # noqa: E402
+
+STAGES = (
+    "extract_pdf",
+    "extract_docx",
+    "analyze_resume",
+    "generate_ats_score",
+    "parse_job_description",
+    "calculate_jd_match",
+    "gemini_recommendations",
+)
+
+# Metrics compared between runs; for all of them larger is worse
+COMPARED_METRICS = ("p50_ms", "p95_ms", "peak_rss_mb")
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    # Nearest-rank percentile
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def _prepare(stage: str, config: Dict[str, Any]) -> Tuple[Callable[[Any], Any], List[Any], Callable[[], None]]:
+    """
+    The function under test, its inputs (warm-up input first) and a cleanup callback.
+    """
+    count = config["samples"] + 1
+    seeds = [config["seed"] + i for i in range(count)]
+    resumes = [corpus.make_resume_text(config["resume_words"], config["skill_density"], s) for s in seeds]
+    jds = [corpus.make_jd_text(config["jd_words"], config["skill_density"], s) for s in seeds]
+    cleanup: Callable[[], None] = lambda: None
+
+    if stage == "extract_pdf":
+        from pdf_parser import extract_text_from_pdf
+        return extract_text_from_pdf, [corpus.make_pdf(t, config["pages"]) for t in resumes], cleanup
+    if stage == "extract_docx":
+        from pdf_parser import extract_text_from_docx
+        return extract_text_from_docx, [corpus.make_docx(t) for t in resumes], cleanup
+    if stage == "analyze_resume":
+        from analyzer import analyze_resume
+        return analyze_resume, resumes, cleanup
+    if stage == "generate_ats_score":
+        from analyzer import analyze_resume, generate_ats_score
+        return generate_ats_score, [analyze_resume(t) for t in resumes], cleanup
+    if stage == "parse_job_description":
+        from job_description_manager import parse_job_description
+        return parse_job_description, jds, cleanup
+    if stage == "calculate_jd_match":
+        from analyzer import analyze_resume
+        from job_description_manager import calculate_jd_match, parse_job_description
+        pairs = [(analyze_resume(r), parse_job_description(j)) for r, j in zip(resumes, jds)]
+        return lambda pair: calculate_jd_match(*pair), pairs, cleanup
+    if stage == "gemini_recommendations":
+        from analyzer import _build_recommendation_prompt
+        from gemini_client import GeminiClient
+        from gemini_stub import start_stub_server
+        stub = start_stub_server(latency=config["gemini_latency"])
+        # No rate limit or cache, so every sample is a full round trip
+        client = GeminiClient("stub", base_url=stub.base_url, requests_per_minute=1e9, cache_size=0)
+
+        def recommend(text: str) -> Dict[str, Any]:
+            return asyncio.run(client.generate_json(_build_recommendation_prompt(text)))
+        return recommend, resumes, stub.shutdown
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def run_stage(stage: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Time one stage over ``config["samples"]`` inputs after a warm-up call.
+    """
+    fn, inputs, cleanup = _prepare(stage, config)
+    try:
+        fn(inputs[0])
+        timings: List[float] = []
+        for item in inputs[1:]:
+            start = time.perf_counter()
+            fn(item)
+            timings.append(time.perf_counter() - start)
+    finally:
+        cleanup()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        "samples": len(timings),
+        "p50_ms": _percentile(timings, 0.50) * 1000,
+        "p95_ms": _percentile(timings, 0.95) * 1000,
+        "mean_ms": total / len(timings) * 1000,
+        "throughput_per_s": len(timings) / total if total else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_benchmarks(config: Dict[str, Any], stages: Sequence[str], isolate: bool = True) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for stage in stages:
+        if isolate:
+            # spawn, not fork: a forked child would inherit the parent's peak RSS
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results[stage] = pool.submit(run_stage, stage, config).result()
+        else:
+            results[stage] = run_stage(stage, config)
+        r = results[stage]
+        print(f"{stage:<24} p50={r['p50_ms']:9.3f}ms p95={r['p95_ms']:9.3f}ms "
+              f"{r['throughput_per_s'] or 0:10.1f}/s rss={r['peak_rss_mb'] or 0:7.1f}MB", file=sys.stderr)
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "isolated": isolate,
+        },
+        "config": config,
+        "stages": results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """
+    One row per stage and metric present in both runs; ``regressed`` is set
+    when the current value exceeds the baseline by more than ``threshold``.
+    """
+    rows: List[Dict[str, Any]] = []
+    for stage, base in baseline.get("stages", {}).items():
+        cur = current.get("stages", {}).get(stage)
+        if cur is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = base.get(metric), cur.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1.0
+            rows.append({"stage": stage, "metric": metric, "baseline": before, "current": after,
+                         "change": change, "regressed": change > threshold})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the stage benchmarks")
+    run.add_argument("--samples", type=int, default=20, help="Timed calls per stage")
+    run.add_argument("--resume-words", type=int, default=600)
+    run.add_argument("--jd-words", type=int, default=250)
+    run.add_argument("--skill-density", type=float, default=0.05, help="Fraction of words that are skills")
+    run.add_argument("--pages", type=int, default=2, help="Minimum pages per generated PDF")
+    run.add_argument("--gemini-latency", type=float, default=0.0, help="Seconds the stub waits per request")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--stages", default=",".join(STAGES), help="Comma-separated subset of stages")
+    run.add_argument("--no-isolate", action="store_true", help="Run all stages in this process")
+    run.add_argument("--output", help="Write results JSON here (default: stdout)")
+
+    cmp = sub.add_parser("compare", help="Flag regressions between two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="Allowed relative increase, e.g. 0.10 = 10%%")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        stages = [s for s in args.stages.split(",") if s]
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+        config = {
+            "samples": args.samples,
+            "resume_words": args.resume_words,
+            "jd_words": args.jd_words,
+            "skill_density": args.skill_density,
+            "pages": args.pages,
+            "gemini_latency": args.gemini_latency,
+            "seed": args.seed,
+        }
+        results = run_benchmarks(config, stages, isolate=not args.no_isolate)
+        payload = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(payload + "\n")
+        else:
+            print(payload)
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+    if baseline.get("config") != current.get("config"):
+        print("warning: runs used different configurations", file=sys.stderr)
+
+    rows = compare_results(baseline, current, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else "ok"
+        print(f"{row['stage']:<24} {row['metric']:<12} {row['baseline']:10.3f} -> {row['current']:10.3f} "
+              f"{row['change']:+7.1%}  {flag}")
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) past {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
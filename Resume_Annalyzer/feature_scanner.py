@@ -0,0 +1,148 @@
+"""
+One-pass scanner for the numeric resume features used by analyze_resume.
+
+The experience and achievement patterns below are the ones analyze_resume has
+always used. Instead of running each of them over the whole text, the text is
+walked once for digit runs (every pattern needs a digit) and searched with
+``str.find`` for the literal words some patterns start with ("experience" and
+the action verbs). Each pattern is then matched at its candidate positions
+only, skipping candidates inside that pattern's previous match, which
+reproduces ``finditer``/``findall`` results exactly.
+"""
+import re
+from typing import Iterable, List, NamedTuple, Optional
+
+_ACTION_VERBS = "increased|reduced|improved|boosted|saved|grew|decreased"
+
+# Experience patterns: "5 years", "3 to 5 years", "experience of 4 years"
+_YEARS_SIMPLE = re.compile(r"(?i)\b(\d{1,2})\s*\+?\s*(?:years?|yrs?|yoe)\b")
+_YEARS_RANGE = re.compile(r"(?i)(\d{1,2})\s*to\s*(\d{1,2})\s*years")
+_YEARS_CONTEXT = re.compile(r"(?i)experience[^\n.]{0,20}(\d{1,2})\s*years")
+
+# Quantifiable achievements: percentages, money, action verbs followed by numbers
+_PERCENT = re.compile(r"\b\d+\s*%")
+_MONEY = re.compile(r"\$\s?\d+[\d,]*(?:k|m|b)?", flags=re.IGNORECASE)
+_ACTION = re.compile(r"\b(" + _ACTION_VERBS + r")\b[^\n%$]{0,40}\b\d+\b", flags=re.IGNORECASE)
+
+_DIGIT_RUNS = re.compile(r"\d+")
+_CONTEXT_WORDS = ("experience",) + tuple(_ACTION_VERBS.split("|"))
+
+
+class NumericFeatures(NamedTuple):
+    years_candidates: List[float]
+    percentages: int
+    money: int
+    action_verbs: int
+
+    @property
+    def years_of_experience(self) -> float:
+        return max(self.years_candidates) if self.years_candidates else 0.0
+
+    @property
+    def quantifiable_achievements(self) -> int:
+        return self.percentages + self.money + self.action_verbs
+
+
+def _years_from_match(m: "re.Match[str]") -> Optional[float]:
+    nums = [float(g) for g in m.groups() if g and g.isdigit()]
+    return max(nums) if nums else None
+
+
+def _probe_text(text: str) -> Optional[str]:
+    """
+    A same-length copy of ``text`` in which every character that the
+    IGNORECASE patterns would match against an ASCII letter is that letter,
+    so plain ``str.find`` locates every case-insensitive occurrence.
+    """
+    # U+0130 is the only character whose lowercase changes the string length
+    if "\u0130" in text:
+        return None
+    probe = text.lower()
+    if not probe.isascii():
+        # Non-ASCII letters that re's IGNORECASE folds onto i and s
+        probe = probe.replace("\u0131", "i").replace("\u017f", "s")
+    return probe
+
+
+def _find_all(probe: str, word: str) -> List[int]:
+    positions = []
+    pos = probe.find(word)
+    while pos != -1:
+        positions.append(pos)
+        pos = probe.find(word, pos + 1)
+    return positions
+
+
+def _legacy_scan(text: str) -> NumericFeatures:
+    years: List[float] = []
+    for pattern in (_YEARS_SIMPLE, _YEARS_RANGE, _YEARS_CONTEXT):
+        for m in pattern.finditer(text):
+            value = _years_from_match(m)
+            if value is not None:
+                years.append(value)
+    return NumericFeatures(
+        years, len(_PERCENT.findall(text)), len(_MONEY.findall(text)), len(_ACTION.findall(text))
+    )
+
+
+def scan_numeric_features(text: str) -> NumericFeatures:
+    """
+    Experience-year candidates and achievement counts for ``text`` in one pass.
+    """
+    probe = _probe_text(text)
+    if probe is None:
+        return _legacy_scan(text)
+
+    # Every pattern needs a digit; this is the only regex walk over the whole text
+    digit_runs = [m.span() for m in _DIGIT_RUNS.finditer(text)]
+    if not digit_runs:
+        return NumericFeatures([], 0, 0, 0)
+
+    years: List[float] = []
+
+    def collect(pattern: "re.Pattern[str]", candidates) -> int:
+        # Emulates finditer: leftmost match at or after the previous match's end
+        count, last_end = 0, 0
+        for pos in candidates:
+            if pos < last_end:
+                continue
+            m = pattern.match(text, pos)
+            if m:
+                count += 1
+                last_end = m.end()
+                if pattern.groups and pattern is not _ACTION:
+                    value = _years_from_match(m)
+                    if value is not None:
+                        years.append(value)
+        return count
+
+    # \b-anchored patterns can only start at the first digit of a run
+    run_starts = [start for start, _ in digit_runs]
+    collect(_YEARS_SIMPLE, run_starts)
+    percentages = collect(_PERCENT, run_starts) if "%" in text else 0
+    # (\d{1,2})\s*to can only start one or two digits before a run ends
+    collect(_YEARS_RANGE, (pos for start, end in digit_runs for pos in (end - 2, end - 1) if pos >= start))
+
+    word_positions = {word: _find_all(probe, word) for word in _CONTEXT_WORDS}
+    collect(_YEARS_CONTEXT, word_positions.pop("experience"))
+    action_verbs = collect(_ACTION, sorted(pos for positions in word_positions.values() for pos in positions))
+
+    # "$" is a literal prefix, which the regex engine already searches for quickly
+    money = len(_MONEY.findall(text)) if "$" in text else 0
+
+    return NumericFeatures(years, percentages, money, action_verbs)
+
+
+def merge_features(features: Iterable[NumericFeatures]) -> NumericFeatures:
+    """
+    Features of several texts (e.g. resume sections) scanned separately.
+    """
+    years: List[float] = []
+    percentages = money = action_verbs = 0
+    for f in features:
+        years.extend(f.years_candidates)
+        percentages += f.percentages
+        money += f.money
+        action_verbs += f.action_verbs
+    return NumericFeatures(years, percentages, money, action_verbs)
+
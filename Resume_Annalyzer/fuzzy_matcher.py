@@ -0,0 +1,208 @@
+"""
+Fuzzy skill matching with hashed character n-grams.
+
+Every taxonomy skill and alias is embedded once as an L2-normalized vector of
+hashed character 2- and 3-grams. A text is cut into candidate phrases (runs
+of one to a few words); their vectors are stacked into a sparse matrix and
+scored against all skills with a single sparse product in NumPy. Phrases
+whose cosine similarity reaches ``threshold`` count as a match, so
+"Kubernets", "java script" and "machine-learnings" are found.
+
+Short names (under ``min_length`` characters, e.g. "SQL", "k8s") are only
+matched exactly, since a one-letter edit turns them into unrelated words.
+N-grams ignore word order, so a match involving several words must also be
+similar character by character in order, which keeps "learning machines"
+from matching Machine Learning.
+Exact and alias matches always count. Everything runs offline; nothing is
+downloaded.
+"""
+import re
+import zlib
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from skill_matcher import WORD_BOUNDARY, SkillMatcher
+
+NGRAM_SIZES = (2, 3)
+HASH_BITS = 20
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_MIN_LENGTH = 5
+# A phrase must be about as long as the name it matches, so "learning" does
+# not match "Deep Learning" however similar their n-grams are
+MIN_LENGTH_RATIO = 0.8
+# Phrase x skill cells scored at once
+_MAX_BLOCK_CELLS = 1 << 21
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def _canonical_form(text: str) -> str:
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+@lru_cache(maxsize=65536)
+def _phrase_features(phrase: str) -> Tuple[np.ndarray, np.ndarray]:
+    # Hashed n-gram ids and their L2-normalized weights. Cached because the
+    # same phrases recur across resumes and JDs
+    padded = f" {phrase} "
+    counts: Dict[int, int] = {}
+    mask = (1 << HASH_BITS) - 1
+    for n in NGRAM_SIZES:
+        for i in range(len(padded) - n + 1):
+            h = zlib.crc32(padded[i:i + n].encode("utf-8")) & mask
+            counts[h] = counts.get(h, 0) + 1
+    ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+    weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    return ids, weights / np.sqrt(np.dot(weights, weights))
+
+
+@lru_cache(maxsize=65536)
+def _in_order(phrase: str, form: str, threshold: float) -> bool:
+    # Word-order check for a phrase that passed the n-gram score against a
+    # multi-word form, or a multi-word phrase against a one-word form:
+    # matching characters must line up in sequence, ignoring spaces
+    a, b = phrase.replace(" ", ""), form.replace(" ", "")
+    return SequenceMatcher(None, a, b, autojunk=False).ratio() >= threshold - 1e-9
+
+
+class FuzzySkillMatcher:
+    """
+    Drop-in alternative to SkillMatcher that also finds misspelled and
+    alternatively spelled skills.
+    """
+
+    def __init__(
+        self,
+        skills: Iterable[str],
+        aliases: Optional[Dict[str, str]] = None,
+        boundary: Tuple[str, str] = WORD_BOUNDARY,
+        threshold: float = DEFAULT_THRESHOLD,
+        min_length: int = DEFAULT_MIN_LENGTH,
+    ):
+        self.skills: List[str] = [s for s in skills if s]
+        self.threshold = threshold
+        self.min_length = min_length
+        known = set(self.skills)
+        aliases = {alias: skill for alias, skill in (aliases or {}).items() if skill in known}
+        self._exact = SkillMatcher(self.skills, aliases, boundary)
+
+        # One row per distinct surface form long enough for fuzzy matching
+        surfaces: Dict[str, str] = {}
+        for surface, canonical in [(s, s) for s in self.skills] + list(aliases.items()):
+            form = _canonical_form(surface)
+            if len(form) >= min_length:
+                surfaces.setdefault(form, canonical)
+        self._forms: List[str] = list(surfaces)
+        self._canonicals: List[str] = [surfaces[f] for f in self._forms]
+        self._form_lengths = np.array([len(f) for f in self._forms], dtype=np.float64)
+        self._max_words = max((f.count(" ") + 1 for f in self._forms), default=0) + 1
+
+        # Skill matrix in CSC-like layout: for each distinct n-gram id (sorted),
+        # the rows containing it and their weights
+        grams, rows, weights = [], [], []
+        for row, form in enumerate(self._forms):
+            ids, w = _phrase_features(form)
+            grams.append(ids)
+            rows.append(np.full(len(ids), row, dtype=np.int64))
+            weights.append(w)
+        grams_all = np.concatenate(grams) if grams else np.zeros(0, dtype=np.int64)
+        order = np.argsort(grams_all, kind="stable")
+        grams_all = grams_all[order]
+        self._gram_ids, starts = np.unique(grams_all, return_index=True)
+        self._gram_ptr = np.append(starts, len(grams_all)).astype(np.int64)
+        self._rows = np.concatenate(rows)[order] if rows else np.zeros(0, dtype=np.int64)
+        self._weights = np.concatenate(weights)[order] if weights else np.zeros(0)
+
+    def _candidates(self, text: str) -> List[str]:
+        # Only phrases whose length is compatible with some surface form
+        words = _WORD_RE.findall(text)
+        min_chars = self._form_lengths.min() * MIN_LENGTH_RATIO
+        max_chars = self._form_lengths.max() / MIN_LENGTH_RATIO
+        phrases: Set[str] = set()
+        for n in range(1, self._max_words + 1):
+            for i in range(len(words) - n + 1):
+                phrase = " ".join(words[i:i + n])
+                if min_chars <= len(phrase) <= max_chars:
+                    phrases.add(phrase)
+        return sorted(phrases)
+
+    def similarities(self, phrases: List[str]) -> np.ndarray:
+        """
+        Cosine similarity of each phrase (rows) to each skill surface form (columns).
+        """
+        scores = np.zeros(len(phrases) * len(self._forms))
+        if not phrases or not self._forms:
+            return scores.reshape(len(phrases), len(self._forms))
+        features = [_phrase_features(p) for p in phrases]
+        phrase_rows = np.repeat(np.arange(len(phrases)), [len(ids) for ids, _ in features])
+        ids = np.concatenate([ids for ids, _ in features])
+        weights = np.concatenate([w for _, w in features])
+
+        # Sparse product: join phrase n-grams with the skill matrix on n-gram id
+        slots = np.minimum(np.searchsorted(self._gram_ids, ids), len(self._gram_ids) - 1)
+        hit = self._gram_ids[slots] == ids
+        slots, phrase_rows, weights = slots[hit], phrase_rows[hit], weights[hit]
+        starts = self._gram_ptr[slots]
+        lengths = self._gram_ptr[slots + 1] - starts
+        total = int(lengths.sum())
+        if total:
+            # Expand each matched n-gram into the skill rows that contain it
+            # and sum the products per (phrase, form) cell
+            entries = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+            cells = np.repeat(phrase_rows * len(self._forms), lengths) + self._rows[entries]
+            products = np.repeat(weights, lengths) * self._weights[entries]
+            scores = np.bincount(cells, weights=products, minlength=len(scores))
+        return scores.reshape(len(phrases), len(self._forms))
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Return the canonical names of all skills present in ``text``,
+        exactly, through an alias or within the similarity threshold.
+        """
+        found = self._exact.find(text)
+        if not text or not self._forms:
+            return found
+        phrases = self._candidates(text.lower())
+        lengths = np.array([len(p) for p in phrases], dtype=np.float64)
+        matched = np.zeros(len(self._forms), dtype=bool)
+        # Score in blocks of phrases so the dense score block stays small
+        block = max(1, _MAX_BLOCK_CELLS // len(self._forms))
+        for start in range(0, len(phrases), block):
+            scores = self.similarities(phrases[start:start + block])
+            block_lengths = lengths[start:start + block, None]
+            close = (np.minimum(block_lengths, self._form_lengths)
+                     >= MIN_LENGTH_RATIO * np.maximum(block_lengths, self._form_lengths))
+            rows, cols = np.nonzero((scores >= self.threshold - 1e-9) & close & ~matched)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                if matched[col]:
+                    continue
+                phrase, form = phrases[start + row], self._forms[col]
+                if (" " not in phrase and " " not in form) or _in_order(phrase, form, self.threshold):
+                    matched[col] = True
+        found.update(self._canonicals[col] for col in np.flatnonzero(matched).tolist())
+        return found
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(
+    skills: Tuple[str, ...],
+    aliases: Tuple[Tuple[str, str], ...],
+    boundary: Tuple[str, str],
+    threshold: float,
+) -> FuzzySkillMatcher:
+    return FuzzySkillMatcher(skills, dict(aliases), boundary, threshold)
+
+
+def get_fuzzy_skill_matcher(
+    skills: Iterable[str],
+    aliases: Optional[Dict[str, str]] = None,
+    boundary: Tuple[str, str] = WORD_BOUNDARY,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> FuzzySkillMatcher:
+    """
+    Return a fuzzy matcher for a taxonomy, embedding it only on first use.
+    """
+    return _cached_matcher(tuple(skills), tuple(sorted((aliases or {}).items())), boundary, threshold)
@@ -0,0 +1,287 @@
+"""
+Reusable Gemini client with an asyncio API.
+
+Talks to the Gemini REST endpoint (``generateContent``) directly so that the
+base URL can point at a local stub (see gemini_stub.py) and every request has
+a real timeout. Requests share a concurrency limit and a token-bucket rate
+limit, are retried with exponential backoff under an overall deadline, and
+successful JSON responses are cached with TTL eviction.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 60.0
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class GeminiError(Exception):
+    """Raised when a Gemini request fails or returns an unusable response"""
+    pass
+
+
+class _TTLCache:
+    def __init__(self, max_items: int, ttl_seconds: float):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._items: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                self._items.pop(key, None)
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+
+class _RateLimiter:
+    """Token bucket shared by every event loop and client using it."""
+
+    def __init__(self, requests_per_minute: float, burst: int):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _try_acquire(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        while True:
+            wait = self._try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+def _extract_json(raw: str) -> Dict[str, Any]:
+    raw = (raw or "").strip()
+    # Models sometimes wrap JSON in a markdown code fence
+    if raw.startswith("```"):
+        raw = raw.split("\n", 1)[1] if "\n" in raw else ""
+        raw = raw.rsplit("```", 1)[0]
+    data = json.loads(raw or "{}")
+    if not isinstance(data, dict):
+        raise GeminiError("Gemini response is not a JSON object")
+    return data
+
+
+class GeminiClient:
+    """
+    Async Gemini client with concurrency/rate limiting, retries and caching.
+
+    Args:
+        api_key: Gemini API key
+        model: Model name used in the generateContent URL
+        base_url: API root; point it at a local stub for tests
+        request_timeout: Seconds allowed for a single HTTP request
+        deadline: Seconds allowed for one call including all retries
+        max_retries: Retries after the first attempt for retryable failures
+        max_concurrency: Requests in flight at once (per event loop; HTTP threads per client)
+        requests_per_minute: Sustained request rate across all callers
+        cache_ttl: Seconds a cached response stays valid
+        cache_size: Maximum number of cached responses
+        rate_limiter: Token bucket to share with other clients of the same
+            key and model; by default the client gets its own
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = DEFAULT_MODEL,
+        base_url: str = DEFAULT_BASE_URL,
+        request_timeout: float = 30.0,
+        deadline: float = 60.0,
+        max_retries: int = 4,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        cache_ttl: float = 24 * 3600,
+        cache_size: int = 1024,
+        rate_limiter: Optional[_RateLimiter] = None,
+    ):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url.rstrip("/")
+        self.request_timeout = request_timeout
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.max_concurrency = max_concurrency
+        self._rate_limiter = rate_limiter or _RateLimiter(requests_per_minute, burst=max_concurrency)
+        self._cache = _TTLCache(cache_size, cache_ttl)
+        # Blocking HTTP calls run here; the loop's default executor may have
+        # fewer threads than max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="gemini-http")
+        # asyncio primitives are bound to a loop; Streamlit runs a new loop per call
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def cache_key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def cache_stats(self) -> Dict[str, int]:
+        return {"hits": self._cache.hits, "misses": self._cache.misses}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    def _post(self, prompt: str, timeout: float) -> str:
+        url = f"{self.base_url}/v1beta/models/{self.model}:generateContent"
+        body = json.dumps({
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {"responseMimeType": "application/json"},
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            url,
+            data=body,
+            headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.loads(response.read().decode("utf-8"))
+        try:
+            parts = payload["candidates"][0]["content"]["parts"]
+        except (KeyError, IndexError, TypeError):
+            raise GeminiError(f"Unexpected Gemini response: {str(payload)[:200]}")
+        return "".join(part.get("text", "") for part in parts)
+
+    async def generate_json(self, prompt: str, cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send ``prompt`` and return the model's reply parsed as a JSON object.
+
+        Responses are cached under ``cache_key`` (defaults to a hash of the
+        prompt). Raises GeminiError when the deadline or retries run out.
+        """
+        key = cache_key or self.cache_key(prompt)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        give_up_at = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                raise GeminiError(f"Gemini request exceeded the {self.deadline}s deadline")
+            try:
+                async with self._semaphore():
+                    await self._rate_limiter.acquire()
+                    timeout = min(self.request_timeout, max(0.1, give_up_at - time.monotonic()))
+                    raw = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, self._post, prompt, timeout
+                    )
+                result = _extract_json(raw)
+                self._cache.set(key, result)
+                return result
+            except urllib.error.HTTPError as e:
+                if e.code not in _RETRYABLE_STATUS:
+                    raise GeminiError(f"Gemini request failed with HTTP {e.code}: {e.reason}")
+                error: Exception = e
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+                error = e
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise GeminiError(f"Gemini returned invalid JSON: {str(e)}")
+
+            attempt += 1
+            delay = min(8.0, 0.5 * 2 ** (attempt - 1)) * (0.5 + random.random() / 2)
+            if attempt > self.max_retries or time.monotonic() + delay >= give_up_at:
+                raise GeminiError(f"Gemini request failed after {attempt} attempt(s): {str(error)}")
+            logger.warning(f"Gemini request failed ({str(error)}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def generate_json_many(
+        self,
+        prompts: Sequence[str],
+        cache_keys: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[Any]:
+        """
+        Run many prompts with up to ``max_concurrency`` requests in flight.
+        Returns results in input order; failed prompts yield their GeminiError.
+        """
+        keys = list(cache_keys) if cache_keys is not None else [None] * len(prompts)
+        return await asyncio.gather(
+            *(self.generate_json(prompt, key) for prompt, key in zip(prompts, keys)),
+            return_exceptions=True,
+        )
+
+
+_clients: Dict[Tuple[str, str, str, int], GeminiClient] = {}
+# The quota is per key and model, so clients that only differ in their
+# concurrency limit draw from one bucket
+_rate_limiters: Dict[Tuple[str, str], _RateLimiter] = {}
+_clients_lock = threading.Lock()
+
+
+def get_gemini_client(
+    api_key: str,
+    model: str = DEFAULT_MODEL,
+    base_url: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+) -> GeminiClient:
+    """
+    Return a shared client for the key/model/endpoint/concurrency limit,
+    creating it on first use. Clients for the same key and model share one
+    rate limiter; only the concurrency limit is per client.
+    ``GEMINI_BASE_URL`` overrides the default endpoint (e.g. a local stub).
+    """
+    base_url = base_url or os.environ.get("GEMINI_BASE_URL") or DEFAULT_BASE_URL
+    max_concurrency = max(1, max_concurrency or DEFAULT_MAX_CONCURRENCY)
+    key = (api_key, model, base_url, max_concurrency)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            rate_limiter = _rate_limiters.get((api_key, model))
+            if rate_limiter is None:
+                rate_limiter = _RateLimiter(DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_MAX_CONCURRENCY)
+                _rate_limiters[(api_key, model)] = rate_limiter
+            client = GeminiClient(
+                api_key, model=model, base_url=base_url, max_concurrency=max_concurrency,
+                rate_limiter=rate_limiter,
+            )
+            _clients[key] = client
+        return client
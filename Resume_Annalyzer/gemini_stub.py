@@ -0,0 +1,86 @@
+"""
+Local stand-in for the Gemini generateContent endpoint, for tests and benchmarks.
+
+Usage:
+    python gemini_stub.py --port 8765 --latency 0.5 --fail-rate 0.1
+    GEMINI_BASE_URL=http://127.0.0.1:8765 GEMINI_API_KEY=stub streamlit run app.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+STUB_RECOMMENDATIONS: Dict[str, Any] = {
+    "summaryParagraph": "Stub summary: solid technical background with room to quantify impact.",
+    "jobRecommendations": ["Software Engineer", "Data Analyst", "Backend Developer"],
+    "learningSuggestions": ["System Design", "Cloud Fundamentals", "Technical Writing"],
+}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: "GeminiStubServer"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.server.request_count += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.fail_rate and random.random() < self.server.fail_rate:
+            self.send_error(503, "Stub induced failure")
+            return
+        if not self.path.endswith(":generateContent"):
+            self.send_error(404, "Unknown endpoint")
+            return
+
+        body = json.dumps({
+            "candidates": [{"content": {"parts": [{"text": json.dumps(self.server.response)}]}}]
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GeminiStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, fail_rate: float = 0.0,
+                 response: Optional[Dict[str, Any]] = None):
+        super().__init__(("127.0.0.1", port), _StubHandler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.response = response or STUB_RECOMMENDATIONS
+        self.request_count = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+def start_stub_server(**kwargs) -> GeminiStubServer:
+    """
+    Start a stub server on a background thread; call ``shutdown()`` when done.
+    """
+    server = GeminiStubServer(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Gemini generateContent stub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep per request")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+    stub = GeminiStubServer(args.port, args.latency, args.fail_rate)
+    print(f"Gemini stub listening on {stub.base_url}")
+    stub.serve_forever()
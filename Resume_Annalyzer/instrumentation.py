@@ -0,0 +1,236 @@
+"""
+Lightweight stage timings and counters for the analysis pipeline.
+
+Wrap a stage with ``with stage("extract", format="pdf") as span:`` and record
+events with ``count("pdf_pages", 3)``. Metrics are collected only when
+enabled (``RESUME_METRICS=1`` or ``enable()``) or while a ``trace()`` is
+active; otherwise ``stage`` hands back a shared no-op span and ``count``
+returns immediately, so instrumented code pays one flag check.
+
+Collected metrics are exported as Prometheus text (``prometheus_text()``) or
+a JSON-serializable dict (``snapshot()``). ``trace()`` additionally collects
+the spans of one request, e.g. for the debug timing panel in app.py.
+"""
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "resume"
+
+_enabled = os.environ.get("RESUME_METRICS", "").lower() in ("1", "true", "yes")
+_trace: "contextvars.ContextVar[Optional[List[Dict[str, Any]]]]" = contextvars.ContextVar(
+    "resume_trace", default=None
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Histogram:
+    __slots__ = ("buckets", "total", "count")
+
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        self.total += seconds
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of stage duration histograms and labelled counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations: Dict[str, _Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+
+    def observe(self, stage_name: str, seconds: float, outcome: str) -> None:
+        with self._lock:
+            histogram = self._durations.get(stage_name)
+            if histogram is None:
+                histogram = self._durations[stage_name] = _Histogram()
+            histogram.observe(seconds)
+            key = ("stage_outcomes", (("outcome", outcome), ("stage", stage_name)))
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def count(self, name: str, value: float, labels: Dict[str, Any]) -> None:
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                name: {
+                    "count": h.count,
+                    "total_seconds": h.total,
+                    "mean_seconds": h.total / h.count if h.count else 0.0,
+                    "buckets": {str(bound): n for bound, n in zip(DURATION_BUCKETS, h.buckets)},
+                }
+                for name, h in self._durations.items()
+            }
+            counters: Dict[str, List[Dict[str, Any]]] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return {"enabled": _enabled, "stages": stages, "counters": counters}
+
+    def prometheus_text(self) -> str:
+        snap = self.snapshot()
+        name = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each analysis pipeline stage.",
+            f"# TYPE {name} histogram",
+        ]
+        for stage_name, h in sorted(snap["stages"].items()):
+            label = f'stage="{_escape(stage_name)}"'
+            cumulative = 0
+            for bound, n in h["buckets"].items():
+                cumulative += n
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label},le="+Inf"}} {h["count"]}')
+            lines.append(f"{name}_sum{{{label}}} {h['total_seconds']}")
+            lines.append(f"{name}_count{{{label}}} {h['count']}")
+        for counter, series in snap["counters"].items():
+            full = f"{METRIC_PREFIX}_{counter}_total"
+            lines.append(f"# TYPE {full} counter")
+            for entry in series:
+                labels = ",".join(f'{k}="{_escape(v)}"' for k, v in entry["labels"].items())
+                lines.append(f"{full}{{{labels}}} {entry['value']}" if labels else f"{full} {entry['value']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Span:
+    __slots__ = ("name", "labels", "outcome", "_start")
+
+    def __init__(self, name: str, labels: Dict[str, Any]):
+        self.name = name
+        self.labels = labels
+        self.outcome = "ok"
+
+    def set(self, **labels: Any) -> None:
+        """
+        Attach details learned inside the stage (backend used, page count...).
+        """
+        self.labels.update(labels)
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.outcome = "error"
+        if _enabled:
+            REGISTRY.observe(self.name, seconds, self.outcome)
+        spans = _trace.get()
+        if spans is not None:
+            spans.append({"stage": self.name, "seconds": seconds, "outcome": self.outcome, **self.labels})
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **labels: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def stage(name: str, **labels: Any):
+    """
+    Context manager timing one pipeline stage. Exceptions are recorded with
+    outcome "error" and re-raised.
+    """
+    if not _enabled and _trace.get() is None:
+        return _NOOP_SPAN
+    return _Span(name, labels)
+
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    """
+    Add ``value`` to the counter ``name`` (exported as resume_<name>_total).
+    """
+    if _enabled:
+        REGISTRY.count(name, value, labels)
+    spans = _trace.get()
+    if spans is not None:
+        spans.append({"counter": name, "value": value, **labels})
+
+
+@contextmanager
+def trace() -> Iterator[List[Dict[str, Any]]]:
+    """
+    Collect the spans and counter events recorded in this context, in order
+    of completion. Work handed to other threads is included when it runs in
+    a copy of this context (``contextvars.copy_context().run``).
+    """
+    spans: List[Dict[str, Any]] = []
+    token = _trace.set(spans)
+    try:
+        yield spans
+    finally:
+        _trace.reset(token)
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def snapshot() -> Dict[str, Any]:
+    return REGISTRY.snapshot()
+
+
+def prometheus_text() -> str:
+    return REGISTRY.prometheus_text()
+
+
+def reset() -> None:
+    REGISTRY.reset()
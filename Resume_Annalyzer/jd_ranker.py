@@ -0,0 +1,143 @@
+"""
+Vectorized ranking of one resume against many stored JDs.
+
+JDMatchIndex encodes every JD's required skills and keywords once as sparse
+rows over a shared lowercase vocabulary (index arrays plus row ids), so the
+70/25/5 score of ``calculate_jd_match`` can be computed for all JDs with a
+handful of NumPy operations per resume. The top-k JDs are then matched with
+``match_features``, the engine behind ``calculate_jd_match``, to fill in
+matched/missing skills and keywords, so results are identical to calling it
+once per JD.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from job_description_manager import JDS_JSON_PATH, iter_jds, match_features
+from text_core import as_float, jd_match_features, resume_match_features
+
+
+class JDMatchIndex:
+    """
+    Precomputed match features for a fixed list of JD requirement dicts.
+    """
+
+    def __init__(self, jds: Iterable[Dict[str, Any]]):
+        self.jds: List[Dict[str, Any]] = list(jds)
+        self.vocabulary: Dict[str, int] = {}
+
+        skill_cols: List[int] = []
+        skill_rows: List[int] = []
+        keyword_cols: List[int] = []
+        keyword_rows: List[int] = []
+        skill_counts = np.zeros(len(self.jds), dtype=np.float64)
+        keyword_counts = np.zeros(len(self.jds), dtype=np.float64)
+        years = np.zeros(len(self.jds), dtype=np.float64)
+
+        for row, jd in enumerate(self.jds):
+            jd = jd or {}
+            skills = jd.get("required_skills", []) or []
+            keywords = jd.get("keywords", []) or []
+            # A JD skill counts once however often it is listed, but the ratio
+            # divides by the full list length, exactly like calculate_jd_match
+            for term in {s.lower() for s in skills}:
+                skill_cols.append(self._column(term))
+                skill_rows.append(row)
+            for kw in keywords:
+                keyword_cols.append(self._column(kw.lower()))
+                keyword_rows.append(row)
+            skill_counts[row] = len(skills)
+            keyword_counts[row] = len(keywords)
+            years[row] = as_float(jd.get("experience_years"))
+
+        self._skill_cols = np.asarray(skill_cols, dtype=np.int64)
+        self._skill_rows = np.asarray(skill_rows, dtype=np.int64)
+        self._keyword_cols = np.asarray(keyword_cols, dtype=np.int64)
+        self._keyword_rows = np.asarray(keyword_rows, dtype=np.int64)
+        self._skill_counts = skill_counts
+        self._keyword_counts = keyword_counts
+        self._years = years
+
+    @classmethod
+    def from_store(cls, json_path: str = JDS_JSON_PATH) -> "JDMatchIndex":
+        return cls(iter_jds(json_path))
+
+    def __len__(self) -> int:
+        return len(self.jds)
+
+    def _column(self, term: str) -> int:
+        col = self.vocabulary.get(term)
+        if col is None:
+            col = len(self.vocabulary)
+            self.vocabulary[term] = col
+        return col
+
+    def scores(self, resume_analysis_dict: Dict[str, Any]) -> np.ndarray:
+        """
+        Integer match scores (0-100) of the resume against every JD, in JD order.
+        """
+        n = len(self.jds)
+        resume_skills: List[str] = (resume_analysis_dict or {}).get("skills_found", []) or []
+        resume_years = as_float((resume_analysis_dict or {}).get("experience_level"))
+
+        # Matched skills are counted per distinct resume skill string
+        skill_hits = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for skill in set(resume_skills):
+            col = self.vocabulary.get(skill.lower())
+            if col is not None:
+                skill_hits[col] += 1.0
+        keyword_hits = (skill_hits > 0).astype(np.float64)
+
+        matched_skills = np.bincount(self._skill_rows, weights=skill_hits[self._skill_cols], minlength=n)
+        matched_keywords = np.bincount(self._keyword_rows, weights=keyword_hits[self._keyword_cols], minlength=n)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            skills_ratio = np.where(self._skill_counts > 0, matched_skills / self._skill_counts, 1.0)
+            keyword_ratio = np.where(self._keyword_counts > 0, matched_keywords / self._keyword_counts, 1.0)
+            experience = np.clip(resume_years / self._years, 0.0, 1.0)
+        # max(0.0, min(1.0, nan)) is 1.0 in calculate_jd_match
+        experience = np.where(np.isnan(experience), 1.0, experience)
+        experience = np.where(self._years <= 0, 1.0, experience)
+
+        score = 100.0 * (0.70 * skills_ratio + 0.25 * experience + 0.05 * keyword_ratio)
+        # np.rint rounds half to even, like round()
+        return np.rint(np.clip(score, 0.0, 100.0)).astype(np.int64)
+
+    def top_k(self, resume_analysis_dict: Dict[str, Any], k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Best-matching JDs, highest score first (ties keep JD order). Each entry
+        is the ``calculate_jd_match`` result plus ``index`` and ``jd_id``.
+        """
+        n = len(self.jds)
+        if n == 0 or k <= 0:
+            return []
+        scores = self.scores(resume_analysis_dict)
+        # Unique sort key: score first, then earlier JDs win ties
+        order_key = scores * (n + 1) + (n - np.arange(n))
+        if k < n:
+            candidates = np.argpartition(-order_key, k - 1)[:k]
+        else:
+            candidates = np.arange(n)
+        ranked = candidates[np.argsort(-order_key[candidates])]
+
+        resume = resume_match_features(resume_analysis_dict)
+        results: List[Dict[str, Any]] = []
+        for index in ranked.tolist():
+            jd = self.jds[index]
+            match = match_features(resume, jd_match_features(jd))
+            match["index"] = index
+            match["jd_id"] = (jd or {}).get("jd_id")
+            results.append(match)
+        return results
+
+
+def rank_jds_for_resume(
+    resume_analysis_dict: Dict[str, Any],
+    k: int = 10,
+    index: Optional[JDMatchIndex] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Top-k stored JDs for a resume analysis. Build the index once with
+    ``JDMatchIndex.from_store()`` and pass it in when ranking many resumes.
+    """
+    return (index or JDMatchIndex.from_store()).top_k(resume_analysis_dict, k)
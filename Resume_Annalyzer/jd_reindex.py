@@ -0,0 +1,49 @@
+"""
+Re-index stored JDs after a skill taxonomy or matching mode change.
+
+Only records whose ``taxonomy_stamp`` (taxonomy version, fingerprint and
+RESUME_SKILL_MATCHING mode) differs from the current one are touched. Exact-
+mode records from an older version only re-evaluate the skills added or
+removed since; other changes, such as new aliases or a mode switch, re-match
+the whole JD text.
+Each batch is committed as it finishes, so re-running after an interruption
+continues with the records that are still outdated.
+
+Usage:
+    python jd_reindex.py --workers 4
+    python jd_reindex.py --jds data/jds.json --batch-size 1000 --dry-run
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from typing import Optional
+
+from job_description_manager import JDS_JSON_PATH, count_outdated_jds, reindex_jds
+from text_core import taxonomy_stamp
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-index stored JDs against the current skill taxonomy")
+    parser.add_argument("--jds", default=JDS_JSON_PATH, help="JD store location (legacy JSON path)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many records are outdated")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    outdated = count_outdated_jds(args.jds)
+    print(f"taxonomy {taxonomy_stamp()}: {outdated} outdated JD(s)", file=sys.stderr)
+    if args.dry_run or not outdated:
+        return 0
+
+    start = time.perf_counter()
+    counts = reindex_jds(args.jds, workers=args.workers, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"processed={counts['processed']} changed={counts['changed']} elapsed={elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
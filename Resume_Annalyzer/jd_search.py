@@ -0,0 +1,424 @@
+"""
+BM25 full-text retrieval over the ``raw_text`` of stored JDs.
+
+BM25Index keeps an inverted index of the JD store: a compacted base segment
+held as CSR arrays (per-term slices of document slots and term frequencies)
+plus a small in-memory delta of JDs added since the last compaction. JDs that
+are updated or deleted are tombstoned and dropped at the next compaction.
+
+The store logs every insert, update and delete (see ``JDStore.changes_since``),
+so the index catches up with JDs saved by any session or process before each
+query; nothing has to call into this module when a JD is saved. The base
+segment is persisted next to the database as ``<db>.bm25.npz`` and loaded on
+first use; each save prunes the log entries it covers, and an index that
+falls behind the pruned log is reloaded or rebuilt. Until a compaction,
+document count and frequencies used for IDF still include tombstoned JDs, as
+in Lucene; average length counts live JDs.
+"""
+import logging
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from instrumentation import count, stage
+from jd_store import ChangesPruned, JDStore
+from job_description_manager import JDS_JSON_PATH, _STOPWORDS, _store_for
+
+logger = logging.getLogger(__name__)
+
+# Bump when tokenization or the file layout changes; older files are rebuilt
+INDEX_FORMAT = 1
+
+# Compact and save once this many JDs were added or tombstoned since the last save
+AUTOSAVE_CHANGES = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def index_path_for(store: JDStore) -> str:
+    return os.path.splitext(store.db_path)[0] + ".bm25.npz"
+
+
+class BM25Index:
+    """
+    Incrementally maintained BM25 index of one JD store.
+    """
+
+    def __init__(self, store: JDStore, index_path: Optional[str] = None, k1: float = 1.2, b: float = 0.75):
+        self.store = store
+        self.index_path = index_path or index_path_for(store)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    # -- state ---------------------------------------------------------------
+
+    def _reset(self) -> None:
+        self._terms: List[str] = []
+        self._term_ids: Dict[str, int] = {}
+        # Base segment: postings of term t are slots/tfs[term_ptr[t]:term_ptr[t + 1]]
+        self._term_ptr = np.zeros(1, dtype=np.int64)
+        self._post_slots = np.zeros(0, dtype=np.int32)
+        self._post_tfs = np.zeros(0, dtype=np.float32)
+        self._doc_ids = np.zeros(0, dtype=np.int64)
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._impacts: Optional[np.ndarray] = None
+        self._impacts_key: Optional[Tuple[float, float, float]] = None
+        # Delta segment: slots continue after the base segment
+        self._delta_ids: List[int] = []
+        self._delta_len: List[float] = []
+        self._delta_alive: List[bool] = []
+        self._delta_postings: Dict[int, Tuple[List[int], List[float]]] = {}
+        self._slots: Dict[int, int] = {}
+        self._live_docs = 0
+        self._live_len = 0.0
+        self._pending = 0
+        self.last_seq = 0
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = len(self._terms)
+            self._term_ids[term] = term_id
+            self._terms.append(term)
+        return term_id
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return self._live_docs
+
+    # -- incremental updates --------------------------------------------------
+
+    def _remove(self, jd_id: int) -> None:
+        slot = self._slots.pop(jd_id, None)
+        if slot is None:
+            return
+        base = len(self._doc_ids)
+        if slot < base:
+            self._alive[slot] = False
+            length = float(self._doc_len[slot])
+        else:
+            self._delta_alive[slot - base] = False
+            length = self._delta_len[slot - base]
+        self._live_docs -= 1
+        self._live_len -= length
+        self._pending += 1
+
+    def _add(self, jd_id: int, text: str) -> None:
+        self._remove(jd_id)
+        tokens = tokenize(text)
+        slot = len(self._doc_ids) + len(self._delta_ids)
+        for term, tf in Counter(tokens).items():
+            slots, tfs = self._delta_postings.setdefault(self._term_id(term), ([], []))
+            slots.append(slot)
+            tfs.append(float(tf))
+        self._delta_ids.append(jd_id)
+        self._delta_len.append(float(len(tokens)))
+        self._delta_alive.append(True)
+        self._slots[jd_id] = slot
+        self._live_docs += 1
+        self._live_len += len(tokens)
+        self._pending += 1
+
+    def _apply_changes(self) -> int:
+        applied = 0
+        for seq, jd_id, op, record in self.store.changes_since(self.last_seq):
+            if op == "upsert" and record is not None:
+                self._add(jd_id, record.get("raw_text") or "")
+            else:
+                self._remove(jd_id)
+            self.last_seq = seq
+            applied += 1
+        return applied
+
+    def refresh(self) -> int:
+        """
+        Apply JDs saved, updated or deleted since the last refresh; returns
+        the number of changes applied. Called by ``search``.
+        """
+        with self._lock:
+            # A freshly loaded index has already caught up with the log
+            self._ensure_loaded()
+            if self.store.last_change() <= self.last_seq:
+                return 0
+            try:
+                applied = self._apply_changes()
+            except ChangesPruned:
+                # Another process saved and pruned changes this index never saw
+                self._loaded = False
+                self._ensure_loaded()
+                applied = self._apply_changes()
+            if self._pending >= AUTOSAVE_CHANGES:
+                self.save()
+            return applied
+
+    # -- building, compaction and persistence ---------------------------------
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        self._reset()
+        if not self._load():
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """
+        Index every stored JD from scratch and save the result.
+        """
+        with self._lock:
+            self._reset()
+            # Read the log position first: changes racing the scan are replayed
+            # on the next refresh, and replaying an upsert is idempotent
+            self.last_seq = self.store.last_change()
+            terms, slots, tfs = array("q"), array("q"), array("f")
+            doc_ids, doc_len = array("q"), array("f")
+            for jd in self.store.iter_jds():
+                tokens = tokenize(jd.get("raw_text") or "")
+                slot = len(doc_ids)
+                for term, tf in Counter(tokens).items():
+                    terms.append(self._term_id(term))
+                    slots.append(slot)
+                    tfs.append(tf)
+                doc_ids.append(jd["jd_id"])
+                doc_len.append(len(tokens))
+            self._set_base(
+                np.frombuffer(terms, dtype=np.int64), np.frombuffer(slots, dtype=np.int64),
+                np.frombuffer(tfs, dtype=np.float32), np.frombuffer(doc_ids, dtype=np.int64),
+                np.frombuffer(doc_len, dtype=np.float32),
+            )
+            self._loaded = True
+            self._apply_changes()
+            self.save()
+            logger.info(f"Built BM25 index of {self._live_docs} JDs at {self.index_path}")
+
+    def _set_base(self, terms: np.ndarray, slots: np.ndarray, tfs: np.ndarray,
+                  doc_ids: np.ndarray, doc_len: np.ndarray) -> None:
+        # Install postings given as parallel (term id, slot, tf) arrays as the
+        # base segment, dropping terms that no longer occur anywhere
+        used = np.bincount(terms, minlength=len(self._terms)) > 0
+        remap = np.cumsum(used) - 1
+        self._terms = [t for t, keep in zip(self._terms, used.tolist()) if keep]
+        self._term_ids = {t: i for i, t in enumerate(self._terms)}
+        terms = remap[terms]
+        order = np.lexsort((slots, terms))
+        self._term_ptr = np.zeros(len(self._terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(self._terms)), out=self._term_ptr[1:])
+        self._post_slots = slots[order].astype(np.int32)
+        self._post_tfs = tfs[order].astype(np.float32)
+        self._doc_ids = doc_ids.astype(np.int64)
+        self._doc_len = doc_len.astype(np.float32)
+        self._alive = np.ones(len(doc_ids), dtype=bool)
+        self._impacts = None
+        self._delta_ids, self._delta_len, self._delta_alive = [], [], []
+        self._delta_postings = {}
+        self._slots = {jd_id: slot for slot, jd_id in enumerate(self._doc_ids.tolist())}
+        self._live_docs = len(doc_ids)
+        self._live_len = float(self._doc_len.sum(dtype=np.float64))
+        self._pending = 0
+
+    def compact(self) -> None:
+        """
+        Merge the delta segment into the base segment and drop tombstoned JDs.
+        """
+        with self._lock:
+            base_terms = np.repeat(np.arange(len(self._term_ptr) - 1), np.diff(self._term_ptr))
+            delta_terms, delta_slots, delta_tfs = [], [], []
+            for term_id, (slots, tfs) in self._delta_postings.items():
+                delta_terms.extend([term_id] * len(slots))
+                delta_slots.extend(slots)
+                delta_tfs.extend(tfs)
+            terms = np.concatenate([base_terms, np.asarray(delta_terms, dtype=np.int64)])
+            slots = np.concatenate([self._post_slots.astype(np.int64), np.asarray(delta_slots, dtype=np.int64)])
+            tfs = np.concatenate([self._post_tfs, np.asarray(delta_tfs, dtype=np.float32)])
+            alive = np.concatenate([self._alive, np.asarray(self._delta_alive, dtype=bool)])
+            doc_ids = np.concatenate([self._doc_ids, np.asarray(self._delta_ids, dtype=np.int64)])
+            doc_len = np.concatenate([self._doc_len, np.asarray(self._delta_len, dtype=np.float32)])
+
+            keep = alive[slots]
+            new_slot = np.cumsum(alive) - 1
+            self._set_base(terms[keep], new_slot[slots[keep]], tfs[keep], doc_ids[alive], doc_len[alive])
+
+    def save(self) -> None:
+        """
+        Compact and write the index atomically to ``index_path``, then prune
+        the store's change log up to the saved position.
+        """
+        with self._lock:
+            self.compact()
+            directory = os.path.dirname(self.index_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            vocab = np.frombuffer("\n".join(self._terms).encode("utf-8"), dtype=np.uint8)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    np.savez(
+                        f, format=np.array([INDEX_FORMAT, self.last_seq], dtype=np.int64),
+                        vocab=vocab, term_ptr=self._term_ptr, post_slots=self._post_slots,
+                        post_tfs=self._post_tfs, doc_ids=self._doc_ids, doc_len=self._doc_len,
+                    )
+                os.replace(tmp_path, self.index_path)
+            except OSError as e:
+                # The in-memory index stays usable; it is rebuilt or caught up next time
+                logger.warning(f"Could not save BM25 index {self.index_path}: {str(e)}")
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                return
+            # The saved file now covers the log up to last_seq
+            self.store.prune_changes(self.last_seq)
+
+    def _load(self) -> bool:
+        if not os.path.isfile(self.index_path):
+            return False
+        try:
+            with np.load(self.index_path, allow_pickle=False) as data:
+                index_format, last_seq = data["format"].tolist()
+                if index_format != INDEX_FORMAT or last_seq > self.store.last_change():
+                    # Older layout, or a file left over from a different database
+                    return False
+                if last_seq < self.store.pruned_through():
+                    # Changes since this file was saved are no longer logged
+                    return False
+                vocab = data["vocab"].tobytes().decode("utf-8")
+                self._terms = vocab.split("\n") if vocab else []
+                self._term_ptr = data["term_ptr"]
+                self._post_slots = data["post_slots"]
+                self._post_tfs = data["post_tfs"]
+                self._doc_ids = data["doc_ids"]
+                self._doc_len = data["doc_len"]
+        except Exception as e:
+            logger.warning(f"Could not load BM25 index {self.index_path}, rebuilding: {str(e)}")
+            self._reset()
+            return False
+        self._term_ids = {t: i for i, t in enumerate(self._terms)}
+        self._alive = np.ones(len(self._doc_ids), dtype=bool)
+        self._slots = {jd_id: slot for slot, jd_id in enumerate(self._doc_ids.tolist())}
+        self._live_docs = len(self._doc_ids)
+        self._live_len = float(self._doc_len.sum(dtype=np.float64))
+        self.last_seq = last_seq
+        self._loaded = True
+        try:
+            self._apply_changes()
+        except ChangesPruned:
+            # Pruned since the check above
+            self._reset()
+            self._loaded = False
+            return False
+        return True
+
+    # -- queries ---------------------------------------------------------------
+
+    def _norm(self, doc_len: np.ndarray, avgdl: float) -> np.ndarray:
+        return self.k1 * (1.0 - self.b + self.b * doc_len / avgdl)
+
+    def _base_impacts(self, avgdl: float) -> np.ndarray:
+        # tf * (k1 + 1) / (tf + norm) of every base posting. It only depends on
+        # the average length, so it is recomputed after changes, not per query
+        key = (avgdl, self.k1, self.b)
+        if self._impacts is None or self._impacts_key != key:
+            tf = self._post_tfs.astype(np.float64)
+            norm = self._norm(self._doc_len.astype(np.float64), avgdl)
+            self._impacts = tf * (self.k1 + 1.0) / (tf + norm[self._post_slots])
+            self._impacts_key = key
+        return self._impacts
+
+    def scores(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        BM25 score of ``text`` against every slot, plus the slot's jd_id;
+        tombstoned slots score 0. Each distinct query term counts once.
+        """
+        with self._lock:
+            self.refresh()
+            doc_ids = np.concatenate([self._doc_ids, np.asarray(self._delta_ids, dtype=np.int64)])
+            scores = np.zeros(len(doc_ids), dtype=np.float64)
+            if self._live_docs == 0:
+                return scores, doc_ids
+            alive = np.concatenate([self._alive, np.asarray(self._delta_alive, dtype=bool)])
+            avgdl = self._live_len / self._live_docs or 1.0
+            impacts = self._base_impacts(avgdl)
+            delta_norm = self._norm(np.asarray(self._delta_len, dtype=np.float64), avgdl)
+            base_docs = len(self._doc_ids)
+
+            # A JD occurs at most once per posting list, so each term's weights
+            # can be scattered straight into the scores. Terms are visited in
+            # sorted order to keep float sums identical from run to run
+            base_terms = len(self._term_ptr) - 1
+            for term in sorted(set(tokenize(text))):
+                term_id = self._term_ids.get(term)
+                if term_id is None:
+                    continue
+                start = end = 0
+                if term_id < base_terms:
+                    start, end = self._term_ptr[term_id], self._term_ptr[term_id + 1]
+                delta = self._delta_postings.get(term_id)
+                df = (end - start) + (len(delta[0]) if delta is not None else 0)
+                if df == 0:
+                    continue
+                idf = np.log1p((len(doc_ids) - df + 0.5) / (df + 0.5))
+                if end > start:
+                    scores[self._post_slots[start:end]] += idf * impacts[start:end]
+                if delta is not None:
+                    slots = np.asarray(delta[0], dtype=np.int64)
+                    tf = np.asarray(delta[1], dtype=np.float64)
+                    scores[slots] += idf * tf * (self.k1 + 1.0) / (tf + delta_norm[slots - base_docs])
+            scores[~alive] = 0.0
+            return scores, doc_ids
+
+    def search(self, text: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Top-k JDs for a query text (e.g. a resume's full text), best first,
+        as ``{"jd_id", "score"}`` dicts. JDs sharing no term with the query
+        are not returned; ties go to the lower jd_id.
+        """
+        with stage("jd_search") as span:
+            scores, doc_ids = self.scores(text)
+            matching = np.flatnonzero(scores > 0)
+            span.set(candidates=len(matching))
+            if k <= 0 or len(matching) == 0:
+                return []
+            if k < len(matching):
+                matching = matching[np.argpartition(-scores[matching], k - 1)[:k]]
+                # Include every candidate tied with the k-th so tie-breaking is by jd_id
+                threshold = scores[matching].min()
+                matching = np.flatnonzero(scores >= threshold)
+            ranked = matching[np.lexsort((doc_ids[matching], -scores[matching]))][:k]
+            count("jd_search_results", len(ranked))
+            return [{"jd_id": int(doc_ids[i]), "score": float(scores[i])} for i in ranked]
+
+
+_indexes: Dict[str, BM25Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_bm25_index(json_path: str = JDS_JSON_PATH) -> BM25Index:
+    """
+    The BM25 index of the JD store behind ``json_path``, shared per process.
+    Nothing is read from disk until the first query.
+    """
+    store = _store_for(json_path)
+    key = os.path.abspath(store.db_path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = BM25Index(store)
+            _indexes[key] = index
+        return index
+
+
+def search_jds(resume_text: str, k: int = 10, json_path: str = JDS_JSON_PATH) -> List[Dict[str, Any]]:
+    """
+    Stored JDs whose raw text best matches ``resume_text`` by BM25, best first.
+    """
+    return get_bm25_index(json_path).search(resume_text, k)
@@ -0,0 +1,320 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jds (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+-- Change log for derived indexes (see jd_search.py); written by triggers so
+-- every writer, in any process, is recorded in the same transaction. Entries
+-- a saved index already covers are deleted by prune_changes
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    jd_id INTEGER NOT NULL,
+    op TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS jds_log_insert AFTER INSERT ON jds BEGIN
+    INSERT INTO changes (jd_id, op) VALUES (new.id, 'upsert');
+END;
+CREATE TRIGGER IF NOT EXISTS jds_log_update AFTER UPDATE OF data ON jds BEGIN
+    INSERT INTO changes (jd_id, op) VALUES (new.id, 'upsert');
+END;
+CREATE TRIGGER IF NOT EXISTS jds_log_delete AFTER DELETE ON jds BEGIN
+    INSERT INTO changes (jd_id, op) VALUES (old.id, 'delete');
+END;
+"""
+
+# meta key set once a legacy JSON file has been imported into the store
+_MIGRATED_KEY = "legacy_json_migrated"
+
+
+class ChangesPruned(Exception):
+    """
+    Raised by JDStore.changes_since when changes after the requested
+    position were already pruned, so the log can no longer bring a reader
+    up to date.
+    """
+
+
+class JDStore:
+    """
+    SQLite-backed store for parsed job descriptions.
+
+    Each JD is one row holding its JSON, so appends are O(1) single-statement
+    transactions and concurrent writers (several Streamlit sessions or
+    processes) are serialized by SQLite instead of overwriting each other.
+    Records returned by the store carry their row id under ``jd_id``.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            # WAL lets readers stream while another session appends
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _decode(row_id: int, data: str) -> Dict[str, Any]:
+        record = json.loads(data)
+        record["jd_id"] = row_id
+        return record
+
+    @staticmethod
+    def _encode(jd_dict: Dict[str, Any]) -> str:
+        record = {k: v for k, v in jd_dict.items() if k != "jd_id"}
+        return json.dumps(record, ensure_ascii=False)
+
+    def append(self, jd_dict: Dict[str, Any]) -> int:
+        """
+        Store one JD and return its id.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jds (data, created_at) VALUES (?, ?)",
+                (self._encode(jd_dict), time.time()),
+            )
+            return cursor.lastrowid
+
+    def update(self, jd_id: int, jd_dict: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE jds SET data = ? WHERE id = ?", (self._encode(jd_dict), jd_id))
+
+    def update_many(self, items: Iterable[Tuple[int, Dict[str, Any]]]) -> int:
+        """
+        Rewrite several JDs in one transaction; returns the number of rows written.
+        """
+        rows = [(self._encode(jd_dict), jd_id) for jd_id, jd_dict in items]
+        if not rows:
+            return 0
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("UPDATE jds SET data = ? WHERE id = ?", rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def delete(self, jd_id: int) -> bool:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM jds WHERE id = ?", (jd_id,)).rowcount > 0
+
+    def get(self, jd_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT id, data FROM jds WHERE id = ?", (jd_id,)).fetchone()
+        return self._decode(*row) if row else None
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jds").fetchone()[0]
+
+    def iter_jds(self, batch_size: int = 500, after_id: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Stream stored JDs in insertion order, ``batch_size`` rows per query, so
+        memory use does not grow with the corpus. ``after_id`` resumes a scan.
+        """
+        last_id = after_id
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT id, data FROM jds WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, data in rows:
+                yield self._decode(row_id, data)
+            last_id = rows[-1][0]
+
+    def count_outdated(self, taxonomy_stamp: str) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM jds WHERE COALESCE(json_extract(data, '$.taxonomy_stamp'), '') != ?",
+                (taxonomy_stamp,),
+            ).fetchone()[0]
+
+    def iter_outdated(self, taxonomy_stamp: str, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Stream JDs whose ``taxonomy_stamp`` differs from ``taxonomy_stamp``
+        (unstamped records included).
+        """
+        last_id = 0
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT id, data FROM jds WHERE id > ? "
+                    "AND COALESCE(json_extract(data, '$.taxonomy_stamp'), '') != ? ORDER BY id LIMIT ?",
+                    (last_id, taxonomy_stamp, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, data in rows:
+                yield self._decode(row_id, data)
+            last_id = rows[-1][0]
+
+    def last_change(self) -> int:
+        with self._connect() as conn:
+            # AUTOINCREMENT keeps the high-water mark even once the log is pruned
+            return conn.execute(
+                "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'changes'), 0)"
+            ).fetchone()[0]
+
+    def pruned_through(self) -> int:
+        """
+        The last change deleted by prune_changes; a reader that has not
+        applied the log up to here has to rebuild from the JDs.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'changes_pruned'").fetchone()
+        return int(row[0]) if row else 0
+
+    def prune_changes(self, seq: int) -> int:
+        """
+        Delete logged changes up to ``seq`` once they are reflected in a saved
+        index; returns the number of entries deleted.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = conn.execute("DELETE FROM changes WHERE seq <= ?", (seq,)).rowcount
+                row = conn.execute("SELECT value FROM meta WHERE key = 'changes_pruned'").fetchone()
+                if row is None or int(row[0]) < seq:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('changes_pruned', ?)", (str(seq),)
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return deleted
+
+    def changes_since(
+        self, seq: int, batch_size: int = 500
+    ) -> Iterator[Tuple[int, int, str, Optional[Dict[str, Any]]]]:
+        """
+        Changes logged after ``seq`` as (seq, jd_id, op, record), oldest
+        first; op is "upsert" (record is the current JD, or None if it has
+        since been deleted) or "delete".
+
+        Raises:
+            ChangesPruned: If entries after ``seq`` were pruned before they
+                were read, including between batches
+        """
+        while True:
+            with self._connect() as conn:
+                # One read transaction, so a prune cannot land between the check and the rows
+                conn.execute("BEGIN")
+                try:
+                    row = conn.execute("SELECT value FROM meta WHERE key = 'changes_pruned'").fetchone()
+                    rows = conn.execute(
+                        "SELECT c.seq, c.jd_id, c.op, j.data FROM changes c LEFT JOIN jds j ON j.id = c.jd_id "
+                        "WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+                        (seq, batch_size),
+                    ).fetchall()
+                finally:
+                    conn.execute("COMMIT")
+            pruned = int(row[0]) if row else 0
+            if pruned > seq:
+                raise ChangesPruned(f"changes up to {pruned} were pruned; reader is at {seq}")
+            if not rows:
+                return
+            for change_seq, jd_id, op, data in rows:
+                record = self._decode(jd_id, data) if data is not None and op == "upsert" else None
+                yield change_seq, jd_id, op, record
+            seq = rows[-1][0]
+
+    @staticmethod
+    def _migrated(conn: sqlite3.Connection) -> bool:
+        # Stores migrated before the marker was path-independent carry one
+        # "migrated:<absolute path>" key instead
+        return conn.execute(
+            "SELECT 1 FROM meta WHERE key = ? OR key LIKE 'migrated:%' LIMIT 1", (_MIGRATED_KEY,)
+        ).fetchone() is not None
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        One-time import of a legacy JSON array file. Safe to call repeatedly
+        and from several processes; only the first call imports anything,
+        whatever path the file is reached through later.
+        Returns the number of imported records.
+        """
+        if not os.path.isfile(json_path):
+            return 0
+        with self._connect() as conn:
+            if self._migrated(conn):
+                return 0
+            try:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not read legacy JD file {json_path}: {str(e)}")
+                legacy = []
+            if not isinstance(legacy, list):
+                legacy = []
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-check under the write lock in case another process just migrated
+                if self._migrated(conn):
+                    conn.execute("ROLLBACK")
+                    return 0
+                now = time.time()
+                conn.executemany(
+                    "INSERT INTO jds (data, created_at) VALUES (?, ?)",
+                    [(self._encode(jd), now) for jd in legacy if isinstance(jd, dict)],
+                )
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, ?)", (_MIGRATED_KEY, os.path.abspath(json_path))
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        logger.info(f"Migrated {len(legacy)} JDs from {json_path} to {self.db_path}")
+        return len(legacy)
+
+
+_stores: Dict[str, JDStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_jd_store(db_path: str, legacy_json_path: Optional[str] = None) -> JDStore:
+    """
+    Return the store for ``db_path``, creating it (and migrating
+    ``legacy_json_path`` into it) on first use in this process.
+    """
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = JDStore(db_path)
+            if legacy_json_path:
+                store.migrate_from_json(legacy_json_path)
+            _stores[key] = store
+        return store
@@ -1,31 +1,23 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from functools import lru_cache
 import os
-import json
 import re
 
-# Simple storage location for prototype
+from skill_matcher import fuzzy_matching_enabled
+from jd_store import JDStore, get_jd_store
+from taxonomy import get_taxonomy
+from text_core import (
+    PREDEFINED_SKILLS, MatchFeatures, find_skills, get_document, jd_match_features, parse_required_years,
+    resume_match_features, skill_matcher, taxonomy_stamp,
+)
+
+# Simple storage location for prototype. JDs are stored in SQLite next to the
+# legacy JSON file, which is migrated into the database on first use.
 JDS_JSON_PATH = os.path.join("data", "jds.json")
 
-# Reuse a basic predefined skills list similar to resume analyzer
-PREDEFINED_SKILLS: List[str] = [
-    "Python",
-    "Java",
-    "JavaScript",
-    "SQL",
-    "C++",
-    "Project Management",
-    "Data Analysis",
-    "Machine Learning",
-    "Deep Learning",
-    "NLP",
-    "Communication",
-    "Leadership",
-    "AWS",
-    "Azure",
-    "GCP",
-    "Docker",
-    "Kubernetes",
-]
+# PREDEFINED_SKILLS comes from text_core, shared with the resume analyzer.
+# Parsed JDs record the taxonomy version they were computed with, and the
+# taxonomy stamp (version, fingerprint and matching mode) that marks them outdated.
 
 _STOPWORDS = {
     "and", "or", "the", "a", "an", "with", "to", "for", "of", "in", "on", "by",
@@ -33,45 +25,6 @@ _STOPWORDS = {
     "at", "from", "per", "ages", "years", "yr", "yrs", "plus", "experience"
 }
 
-def _normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text or "").strip()
-
-def _find_skills(text: str) -> List[str]:
-    found: List[str] = []
-    for skill in PREDEFINED_SKILLS:
-        pattern = r"(?i)(?<![\w#])" + re.escape(skill) + r"(?![\w+])"
-        if re.search(pattern, text):
-            found.append(skill)
-    return sorted(set(found), key=lambda s: PREDEFINED_SKILLS.index(s) if s in PREDEFINED_SKILLS else s)
-
-def _parse_years_of_experience(text: str) -> Optional[float]:
-    # Range e.g., 3-5 years -> take upper bound
-    m_range = re.search(r"(?i)(\d{1,2})\s*\-\s*(\d{1,2})\s*(years|yrs|year)", text)
-    if m_range:
-        try:
-            return float(max(int(m_range.group(1)), int(m_range.group(2))))
-        except Exception:
-            pass
-
-    patterns: List[re.Pattern[str]] = [
-        re.compile(r"(?i)(over|approximately|around|about)?\s*(\d{1,2})\s*\+?\s*(years|yrs|y/o|yo|year)"),
-        re.compile(r"(?i)(\d{1,2})\s*\+\s*years"),
-        re.compile(r"(?i)(\d{1,2})\s*\-?\s*year\b"),
-    ]
-    for pat in patterns:
-        m = pat.search(text)
-        if m:
-            nums = [float(g) for g in m.groups() if isinstance(g, str) and g.isdigit()]
-            if nums:
-                return float(nums[-1])
-    m_simple = re.search(r"(?i)(\d{1,2})\s*\+?\s*(years|yrs)\b", text)
-    if m_simple:
-        try:
-            return float(m_simple.group(1))
-        except Exception:
-            return None
-    return None
-
 def _extract_keywords(text: str, max_keywords: int = 25) -> List[str]:
     words = re.findall(r"[A-Za-z][A-Za-z\-\+#]{2,}", text)
     kws: List[str] = []
@@ -92,18 +45,19 @@ def parse_job_description(jd_text: str) -> Dict[str, Any]:
     """
     Extract key requirements from a job description: required skills, keywords, and experience.
     """
-    normalized = _normalize_text(jd_text)
-    lowercase_text = normalized.lower()
+    document = get_document(jd_text or "")
 
-    required_skills = _find_skills(lowercase_text)
-    experience_years = _parse_years_of_experience(lowercase_text)
-    keywords = _extract_keywords(lowercase_text)
+    required_skills = sorted(document.skills, key=get_taxonomy().sort_key)
+    experience_years = parse_required_years(document.lower)
+    keywords = _extract_keywords(document.lower)
 
     return {
         "required_skills": required_skills,
         "experience_years": experience_years,
         "keywords": keywords,
-        "raw_text": normalized,
+        "raw_text": document.normalized,
+        "taxonomy_version": get_taxonomy().version,
+        "taxonomy_stamp": taxonomy_stamp(),
     }
 
 def calculate_jd_match(resume_analysis_dict: Dict[str, Any], jd_requirements_dict: Dict[str, Any]) -> Dict[str, Any]:
@@ -112,40 +66,30 @@ def calculate_jd_match(resume_analysis_dict: Dict[str, Any], jd_requirements_dic
     Considers skills overlap, experience alignment, and keyword coverage.
     Returns score, matched/missing skills and keywords.
     """
-    resume_skills: List[str] = (resume_analysis_dict or {}).get("skills_found", []) or []
-    resume_skills_lc = [s.lower() for s in resume_skills]
-    resume_years = (resume_analysis_dict or {}).get("experience_level")
-    try:
-        resume_years_val = float(resume_years) if resume_years is not None else 0.0
-    except Exception:
-        resume_years_val = 0.0
-
-    jd_skills: List[str] = (jd_requirements_dict or {}).get("required_skills", []) or []
-    jd_skills_lc = [s.lower() for s in jd_skills]
-    jd_years = (jd_requirements_dict or {}).get("experience_years")
-    try:
-        jd_years_val = float(jd_years) if jd_years is not None else 0.0
-    except Exception:
-        jd_years_val = 0.0
-
-    jd_keywords: List[str] = (jd_requirements_dict or {}).get("keywords", []) or []
-
-    # Skills overlap
-    matched_skills = sorted(set(s for s in resume_skills if s.lower() in jd_skills_lc))
-    missing_skills = sorted(set(jd_skills) - set(matched_skills))
-    skills_ratio = (len(matched_skills) / len(jd_skills)) if jd_skills else 1.0
+    return match_features(resume_match_features(resume_analysis_dict), jd_match_features(jd_requirements_dict))
+
+def match_features(resume: MatchFeatures, jd: MatchFeatures) -> Dict[str, Any]:
+    """
+    calculate_jd_match on features prepared with text_core.resume_match_features
+    and jd_match_features. Prepare the fixed side once when matching one
+    resume or JD against many.
+    """
+    # Skills overlap; both sides are sorted already
+    matched_skills = [s for s, lc in resume.skill_keys if lc in jd.skills_lc]
+    matched_set = set(matched_skills)
+    missing_skills = [s for s, _ in jd.skill_keys if s not in matched_set]
+    skills_ratio = (len(matched_skills) / jd.skill_count) if jd.skill_count else 1.0
 
     # Experience alignment: if resume >= JD -> full credit; else proportional
-    if jd_years_val <= 0:
+    if jd.years <= 0:
         experience_factor = 1.0
     else:
-        experience_factor = max(0.0, min(1.0, resume_years_val / jd_years_val))
+        experience_factor = max(0.0, min(1.0, resume.years / jd.years))
 
     # Keyword coverage: prototype approximation compares JD keywords against resume skills tokens
-    combined_resume_tokens = set(resume_skills_lc)
-    matched_keywords = sorted([kw for kw in jd_keywords if kw.lower() in combined_resume_tokens])
-    missing_keywords = sorted([kw for kw in jd_keywords if kw.lower() not in combined_resume_tokens])
-    keyword_ratio = (len(matched_keywords) / len(jd_keywords)) if jd_keywords else 1.0
+    matched_keywords = [kw for kw, lc in jd.keywords if lc in resume.skills_lc]
+    missing_keywords = [kw for kw, lc in jd.keywords if lc not in resume.skills_lc]
+    keyword_ratio = (len(matched_keywords) / len(jd.keywords)) if jd.keywords else 1.0
 
     # Weighted score: skills 70%, experience 25%, keywords 5%
     score = 100.0 * (0.70 * skills_ratio + 0.25 * experience_factor + 0.05 * keyword_ratio)
@@ -159,38 +103,150 @@ def calculate_jd_match(resume_analysis_dict: Dict[str, Any], jd_requirements_dic
         "missing_keywords": missing_keywords,
     }
 
+def _store_for(json_path: str) -> JDStore:
+    return get_jd_store(os.path.splitext(json_path)[0] + ".sqlite3", legacy_json_path=json_path)
+
 def save_jd_to_json(jd_dict: Dict[str, Any], json_path: str = JDS_JSON_PATH) -> None:
     """
-    Append a JD dict to the JSON store (creates file if missing).
-    """
-    os.makedirs(os.path.dirname(json_path), exist_ok=True)
-    existing: List[Dict[str, Any]] = []
-    if os.path.isfile(json_path):
-        try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                existing = json.load(f)
-                if not isinstance(existing, list):
-                    existing = []
-        except Exception:
-            existing = []
-    existing.append(jd_dict)
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(existing, f, ensure_ascii=False, indent=2)
+    Append a JD dict to the JD store (creates it if missing).
+    """
+    _store_for(json_path).append(jd_dict)
 
 def load_jds_from_json(json_path: str = JDS_JSON_PATH) -> List[Dict[str, Any]]:
     """
-    Load all JDs from the JSON store; returns an empty list if none.
+    Load all JDs from the JD store; returns an empty list if none.
     """
-    if not os.path.isfile(json_path):
-        return []
-    try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return []
-    except Exception:
-        return []
+    return list(iter_jds(json_path))
+
+def iter_jds(json_path: str = JDS_JSON_PATH) -> Iterator[Dict[str, Any]]:
+    """
+    Stream stored JDs without loading the whole corpus into memory.
+    """
+    return _store_for(json_path).iter_jds()
+
+def get_jd(jd_id: int, json_path: str = JDS_JSON_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Look up a stored JD by its ``jd_id``; returns None if it does not exist.
+    """
+    return _store_for(json_path).get(jd_id)
+
+def count_outdated_jds(json_path: str = JDS_JSON_PATH) -> int:
+    """
+    Number of stored JDs stamped with another taxonomy or matching mode than the current one.
+    """
+    return _store_for(json_path).count_outdated(taxonomy_stamp())
+
+@lru_cache(maxsize=32)
+def _added_skills_matcher(stamped: int):
+    # One matcher per stamped version for a whole reindex run, however many
+    # JDs share that version
+    added, _ = get_taxonomy().changes_since(stamped)
+    return skill_matcher(added, fuzzy=False)
+
+def _parse_stamp(stamp: Any) -> Tuple[int, str]:
+    # (version, mode) of a taxonomy_stamp; (0, "") if missing or malformed
+    parts = str(stamp or "").split(":")
+    if len(parts) != 3 or not parts[0].isdigit():
+        return 0, ""
+    return int(parts[0]), parts[2]
+
+def reindex_jd(jd_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bring a parsed JD up to the current taxonomy and matching mode without
+    re-parsing it. A JD matched in exact mode at an older taxonomy version
+    is updated incrementally: skills removed since then are dropped and only
+    the added skills are searched for in ``raw_text``. Anything else (fuzzy
+    mode, where aliases and similar spellings of every skill matter, a mode
+    switch, a taxonomy edited without a version bump, or no stamp) is matched
+    again in full. Returns a new dict stamped with the current taxonomy.
+    """
+    taxonomy = get_taxonomy()
+    stamp = taxonomy_stamp()
+    stamped, mode = _parse_stamp(jd_dict.get("taxonomy_stamp"))
+    raw_text = (jd_dict.get("raw_text") or "").lower()
+    current = set(taxonomy.skills)
+    incremental = (
+        jd_dict.get("taxonomy_stamp") == stamp
+        or (mode == "exact" and not fuzzy_matching_enabled() and 0 < stamped < taxonomy.version)
+    )
+
+    if incremental:
+        added, removed = taxonomy.changes_since(stamped)
+        skills = {s for s in jd_dict.get("required_skills", []) or [] if s not in removed}
+        # An added skill can only match if its lowercase form occurs in the
+        # text, which is much cheaper to check than scanning for it
+        if any(s.lower() in raw_text for s in added):
+            skills.update(_added_skills_matcher(stamped).find(raw_text))
+    elif raw_text:
+        skills = find_skills(raw_text)
+    else:
+        skills = {s for s in jd_dict.get("required_skills", []) or [] if s in current}
+
+    updated = dict(jd_dict)
+    updated["required_skills"] = sorted(skills, key=taxonomy.sort_key)
+    updated["taxonomy_version"] = taxonomy.version
+    updated["taxonomy_stamp"] = stamp
+    return updated
+
+def _reindex_batch(jds: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any], bool]]:
+    results = []
+    for jd in jds:
+        updated = reindex_jd(jd)
+        results.append((jd["jd_id"], updated, updated["required_skills"] != jd.get("required_skills")))
+    return results
+
+def reindex_jds(
+    json_path: str = JDS_JSON_PATH,
+    workers: int = 1,
+    batch_size: int = 500,
+    max_in_flight: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Re-index stored JDs stamped with another taxonomy or matching mode, in batches
+    spread over ``workers`` processes. Each batch is written (and stamped)
+    in one transaction as soon as it finishes, so an interrupted run resumes
+    with the records that are still outdated.
+
+    Returns counts of records ``processed`` and with ``changed`` skills.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    store = _store_for(json_path)
+    stamp = taxonomy_stamp()
+    counts = {"processed": 0, "changed": 0}
+
+    def write(results: List[Tuple[int, Dict[str, Any], bool]]) -> None:
+        store.update_many((jd_id, updated) for jd_id, updated, _ in results)
+        counts["processed"] += len(results)
+        counts["changed"] += sum(1 for _, _, changed in results if changed)
+
+    def batches() -> Iterator[List[Dict[str, Any]]]:
+        batch: List[Dict[str, Any]] = []
+        for jd in store.iter_outdated(stamp, batch_size):
+            batch.append(jd)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    if workers <= 1:
+        for batch in batches():
+            write(_reindex_batch(batch))
+        return counts
+
+    max_in_flight = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in batches():
+            pending.add(pool.submit(_reindex_batch, batch))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result())
+        for future in pending:
+            write(future.result())
+    return counts
 
 def load_job_descriptions(data_dir: str = 'data') -> List[str]:
     """
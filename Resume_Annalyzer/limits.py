@@ -0,0 +1,185 @@
+"""
+Resource limits for analyzing one upload.
+
+Every analysis is bounded in file bytes, PDF pages, extracted characters and
+wall time per stage. Going over a soft limit does not fail the request: the
+pipeline keeps what it has so far (the first pages, the first characters) and
+reports a Degradation, such as "first 20 pages analyzed" or "AI skipped:
+deadline", alongside the results. Only a file that leaves nothing to analyze
+(too large, unreadable, no text) fails.
+
+Deadlines are checked between pages and document blocks, so a single slow
+page can still overrun its stage, except when PDF pages are extracted in
+parallel, where the pool stops waiting at the deadline; analysis_service
+additionally bounds each request with a timeout.
+"""
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import BinaryIO, List, NamedTuple, Optional, Tuple, Union
+
+from instrumentation import count, stage
+from pdf_parser import MAX_FILE_BYTES, DocumentSource, TextExtractionError, iter_document_pages
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisLimits(NamedTuple):
+    max_bytes: int = MAX_FILE_BYTES
+    max_pages: int = 20
+    max_chars: int = 100_000
+    extraction_seconds: float = 30.0
+    ai_seconds: float = 45.0
+
+    @classmethod
+    def from_env(cls) -> "AnalysisLimits":
+        """
+        Defaults, overridden by RESUME_LIMIT_<FIELD> environment variables
+        (e.g. RESUME_LIMIT_MAX_PAGES=10, RESUME_LIMIT_AI_SECONDS=20).
+        """
+        values = {}
+        for field, default in cls._field_defaults.items():
+            raw = os.environ.get(f"RESUME_LIMIT_{field.upper()}")
+            if not raw:
+                continue
+            try:
+                values[field] = type(default)(raw)
+            except ValueError:
+                logger.warning(f"Ignoring invalid RESUME_LIMIT_{field.upper()}={raw!r}")
+        return cls(**values)
+
+    def cache_version(self) -> str:
+        """
+        The limits that change extracted text, for result cache keys.
+        """
+        return f"limits:{self.max_bytes}:{self.max_pages}:{self.max_chars}"
+
+
+@lru_cache(maxsize=1)
+def get_analysis_limits() -> AnalysisLimits:
+    return AnalysisLimits.from_env()
+
+
+class Degradation(NamedTuple):
+    stage: str  # "extraction" or "ai"
+    reason: str  # "page_limit", "char_limit" or "deadline"
+    message: str
+
+
+class Deadline:
+    """
+    A point in time ``seconds`` from now; ``None`` never expires.
+    """
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, seconds: Optional[float]):
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+
+def _cut(text: str, max_chars: int) -> str:
+    # At the last line break or space before the limit, if there is one in reach
+    cut = text[:max_chars]
+    boundary = max(cut.rfind("\n"), cut.rfind(" "))
+    return cut[:boundary] if boundary > max_chars // 2 else cut
+
+
+def _char_limit(limits: AnalysisLimits) -> Degradation:
+    return Degradation("extraction", "char_limit", f"text truncated to the first {limits.max_chars:,} characters")
+
+
+def _record(degradations: List[Degradation]) -> None:
+    for degradation in degradations:
+        logger.warning(f"Degraded {degradation.stage}: {degradation.message}")
+        count("degradations", stage=degradation.stage, reason=degradation.reason)
+
+
+def limit_text(text: str, limits: Optional[AnalysisLimits] = None) -> Tuple[str, List[Degradation]]:
+    """
+    Cut text that did not come through extract_text_within_limits (such as
+    pasted text) to the character limit.
+    """
+    limits = limits or get_analysis_limits()
+    if len(text) <= limits.max_chars:
+        return text, []
+    degradations = [_char_limit(limits)]
+    _record(degradations)
+    return _cut(text, limits.max_chars), degradations
+
+
+def extract_text_within_limits(
+    source: Union[bytes, str, BinaryIO, DocumentSource],
+    file_name: Optional[str] = None,
+    limits: Optional[AnalysisLimits] = None,
+    parallel: bool = False,
+) -> Tuple[str, List[Degradation]]:
+    """
+    Extract text from a PDF or DOCX page by page (DOCX: paragraph by
+    paragraph), stopping at the page, character or time limit.
+
+    Args:
+        source: Document bytes, path, binary file-like object or DocumentSource
+        file_name: Name used to pick the extractor (as for extract_text)
+        limits: Limits to apply (defaults to get_analysis_limits())
+        parallel: Extract the pages of a large PDF in a process pool, bounded
+            by the same deadline (leave off where callers already run in
+            parallel)
+
+    Returns:
+        The extracted text and the degradations applied to get it
+
+    Raises:
+        TextExtractionError: If the file is too large, unsupported or
+            unreadable, or no text was extracted before a limit was hit
+    """
+    limits = limits or get_analysis_limits()
+    deadline = Deadline(limits.extraction_seconds)
+    degradations: List[Degradation] = []
+
+    def page_limit(page_count: int) -> None:
+        degradations.append(Degradation(
+            "extraction", "page_limit", f"first {limits.max_pages} of {page_count} pages analyzed"
+        ))
+
+    chunks: List[str] = []
+    used = 0
+
+    def deadline_reached() -> None:
+        degradations.append(Degradation(
+            "extraction", "deadline",
+            f"extraction stopped after {limits.extraction_seconds:g}s; "
+            f"text up to {used:,} characters analyzed",
+        ))
+
+    with stage("extraction"):
+        chunk_iter = iter_document_pages(
+            source, file_name, max_bytes=limits.max_bytes, max_pages=limits.max_pages, on_page_limit=page_limit,
+            parallel=parallel, expires_at=deadline.expires_at, on_deadline=deadline_reached,
+        )
+        try:
+            for chunk in chunk_iter:
+                remaining = limits.max_chars - used
+                if len(chunk) > remaining:
+                    # used counts the line break before this chunk, so it
+                    # can already be past the limit
+                    if remaining > 0:
+                        chunks.append(_cut(chunk, remaining))
+                    degradations.append(_char_limit(limits))
+                    break
+                chunks.append(chunk)
+                used += len(chunk) + 1
+                if deadline.expired():
+                    deadline_reached()
+                    break
+        finally:
+            chunk_iter.close()
+
+    text = "\n".join(c for c in chunks if c).strip()
+    if not text:
+        raise TextExtractionError("No text could be extracted within the analysis limits")
+    _record(degradations)
+    return text, degradations
@@ -1,25 +1,245 @@
 import logging
 import io
-from typing import Optional
-from streamlit.runtime.uploaded_file_manager import UploadedFile
-import docx2txt
+import mmap
+import re
+import multiprocessing
+import os
+import tempfile
+import time
+import zipfile
+import zlib
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+from xml.etree.ElementTree import ParseError, iterparse
 from PyPDF2 import PdfReader
 from PyPDF2.errors import PdfReadError
 
+from instrumentation import count, stage
+
+if TYPE_CHECKING:
+    from streamlit.runtime.uploaded_file_manager import UploadedFile
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parallel extraction settings: documents with fewer pages stay serial to avoid pool overhead
+PARALLEL_MIN_PAGES = 16
+PARALLEL_PAGE_TIMEOUT = 10.0
+
+# Ingestion limits. Uploads larger than SPOOL_MAX_MEMORY are copied to a
+# temporary file in chunks and memory-mapped instead of being held in RAM
+MAX_FILE_BYTES = 25 * 1024 * 1024
+MAX_PDF_PAGES = 300
+SPOOL_MAX_MEMORY = 2 * 1024 * 1024
+_COPY_CHUNK = 1024 * 1024
+
 class TextExtractionError(Exception):
     """Custom exception for text extraction errors"""
     pass
 
-def extract_text_from_pdf_pypdf2(file_content: bytes) -> str:
+class _MappedStream(mmap.mmap):
+    """
+    A read-only memory map with the file-object methods zipfile and the PDF
+    parsers probe for (``mmap`` itself only gained ``seekable`` in 3.13).
+    """
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+class DocumentSource:
+    """
+    Read-only bytes of one input document, held in memory or memory-mapped
+    from a file. Every parser gets its own stream from ``open_stream()``,
+    sharing the same buffer, so a fallback parser never copies the document
+    again.
+    """
+
+    def __init__(
+        self,
+        data: Optional[bytes] = None,
+        file_obj=None,
+        path: Optional[str] = None,
+        temporary: bool = False,
+    ):
+        self.path = path
+        self._data = data
+        self._file = file_obj
+        self._mmap = None
+        # ``path`` is a spool file to delete on close
+        self._temporary = temporary
+        self._streams: List[_MappedStream] = []
+        if data is None:
+            self._mmap = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(data) if data is not None else len(self._mmap)
+
+    def open_stream(self) -> BinaryIO:
+        if self._data is not None:
+            # BytesIO shares the bytes object until written to
+            return io.BytesIO(self._data)
+        # A second map of the same file shares its pages but has its own position
+        stream = _MappedStream(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._streams.append(stream)
+        return stream
+
+    def worker_input(self) -> Union[str, bytes]:
+        """
+        What to send to extraction worker processes: the path when the
+        document is a file (workers map it themselves), else its bytes.
+        """
+        if self.path is not None:
+            return self.path
+        if self._data is not None:
+            return self._data
+        # Only a DocumentSource built by hand around an unnamed file gets here
+        return self._mmap[:]
+
+    def close(self) -> None:
+        for stream in self._streams:
+            try:
+                stream.close()
+            except BufferError:
+                # A parser still holds a view into the map; it is freed with the parser
+                pass
+        self._streams = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._temporary and self.path is not None:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self._temporary = False
+
+    def __enter__(self) -> "DocumentSource":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def _too_large(size: int, max_bytes: int) -> TextExtractionError:
+    return TextExtractionError(
+        f"File is {size / (1024 * 1024):.1f} MB; the maximum supported size is {max_bytes / (1024 * 1024):.0f} MB"
+    )
+
+def open_document_source(
+    source: Union[bytes, str, "os.PathLike[str]", BinaryIO, DocumentSource],
+    max_bytes: int = MAX_FILE_BYTES,
+) -> DocumentSource:
+    """
+    Wrap bytes, a file path or a binary file-like object for the extractors.
+    
+    Paths are memory-mapped without reading them. In-memory uploads (objects
+    with ``getvalue()``, such as Streamlit's UploadedFile) are used without
+    copying. Other streams are copied in chunks, into memory up to
+    SPOOL_MAX_MEMORY and past that into a named temporary file that is
+    memory-mapped (workers map it by path) and deleted on close().
+    
+    Args:
+        source: Document bytes, path or binary file-like object
+        max_bytes: Largest accepted document size
+        
+    Returns:
+        DocumentSource; close it (or use it as a context manager) when done
+        
+    Raises:
+        TextExtractionError: If the document is empty, too large or unreadable
+    """
+    if isinstance(source, DocumentSource):
+        return source
+
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        try:
+            size = os.path.getsize(path)
+            if size > max_bytes:
+                raise _too_large(size, max_bytes)
+            if size == 0:
+                raise TextExtractionError("File is empty or could not be read")
+            file_obj = open(path, 'rb')
+        except OSError as e:
+            raise TextExtractionError(f"Could not read file {path}: {str(e)}")
+        try:
+            return DocumentSource(file_obj=file_obj, path=path)
+        except (OSError, ValueError) as e:
+            file_obj.close()
+            raise TextExtractionError(f"Could not read file {path}: {str(e)}")
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    elif hasattr(source, 'getvalue'):
+        data = source.getvalue()
+    elif hasattr(source, 'read'):
+        chunks: List[bytes] = []
+        spool = None
+        total = 0
+        try:
+            while True:
+                chunk = source.read(_COPY_CHUNK)
+                if not chunk:
+                    break
+                total += len(chunk)
+                if total > max_bytes:
+                    raise _too_large(total, max_bytes)
+                if spool is None and total > SPOOL_MAX_MEMORY:
+                    # Too large to hold in memory: continue in a named temporary
+                    # file, which extraction workers can map by path
+                    spool = tempfile.NamedTemporaryFile(prefix="resume-", suffix=".spool", delete=False)
+                    spool.writelines(chunks)
+                    chunks = []
+                if spool is not None:
+                    spool.write(chunk)
+                else:
+                    chunks.append(chunk)
+            if spool is not None:
+                spool.flush()
+                return DocumentSource(file_obj=spool, path=spool.name, temporary=True)
+        except BaseException:
+            if spool is not None:
+                spool.close()
+                os.unlink(spool.name)
+            raise
+        data = b"".join(chunks)
+    else:
+        raise TextExtractionError(f"Unsupported document source: {type(source).__name__}")
+
+    if not data:
+        raise TextExtractionError("File is empty or could not be read")
+    if len(data) > max_bytes:
+        raise _too_large(len(data), max_bytes)
+    return DocumentSource(data=data)
+
+@contextmanager
+def _opened(source, max_bytes: int = MAX_FILE_BYTES) -> Iterator[DocumentSource]:
+    # Close the DocumentSource afterwards only if it was created here
+    document_source = open_document_source(source, max_bytes)
+    try:
+        yield document_source
+    finally:
+        if document_source is not source:
+            document_source.close()
+
+def _stream(file_content: Union[bytes, DocumentSource]) -> BinaryIO:
+    if isinstance(file_content, DocumentSource):
+        return file_content.open_stream()
+    return io.BytesIO(file_content)
+
+def extract_text_from_pdf_pypdf2(file_content: Union[bytes, DocumentSource]) -> str:
     """
     Extract text from PDF using PyPDF2.
     
     Args:
-        file_content: PDF file content as bytes
+        file_content: PDF file content as bytes or a DocumentSource
         
     Returns:
         Extracted text as string
@@ -28,7 +248,7 @@ def extract_text_from_pdf_pypdf2(file_content: bytes) -> str:
         TextExtractionError: If extraction fails
     """
     try:
-        pdf_file = io.BytesIO(file_content)
+        pdf_file = _stream(file_content)
         reader = PdfReader(pdf_file)
         
         if reader.is_encrypted:
@@ -61,12 +281,12 @@ def extract_text_from_pdf_pypdf2(file_content: bytes) -> str:
     except Exception as e:
         raise TextExtractionError(f"Unexpected error extracting PDF text: {str(e)}")
 
-def extract_text_from_pdf_pdfplumber(file_content: bytes) -> str:
+def extract_text_from_pdf_pdfplumber(file_content: Union[bytes, DocumentSource]) -> str:
     """
     Extract text from PDF using pdfplumber (fallback method).
     
     Args:
-        file_content: PDF file content as bytes
+        file_content: PDF file content as bytes or a DocumentSource
         
     Returns:
         Extracted text as string
@@ -76,7 +296,7 @@ def extract_text_from_pdf_pdfplumber(file_content: bytes) -> str:
     """
     try:
         import pdfplumber
-        pdf_file = io.BytesIO(file_content)
+        pdf_file = _stream(file_content)
         
         text_parts = []
         with pdfplumber.open(pdf_file) as pdf:
@@ -101,59 +321,728 @@ def extract_text_from_pdf_pdfplumber(file_content: bytes) -> str:
     except Exception as e:
         raise TextExtractionError(f"Error extracting PDF text with pdfplumber: {str(e)}")
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+# Share of control/replacement/private-use characters above which page text counts as garbled
+GARBLED_CHAR_RATIO = 0.3
+_BAD_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffd\ue000-\uf8ff]")
+# Text-showing operators: Tj, TJ, and ' / " after a string operand
+_SHOW_TEXT = re.compile(rb"(?<![A-Za-z])T[jJ](?![A-Za-z])|[)>]\s*['\"]")
+
+def _draws_text(resources, content: bytes, depth: int = 0) -> bool:
+    resources = resources.get_object() if resources is not None else {}
+    fonts = resources.get("/Font")
+    if fonts is not None and len(fonts.get_object()) > 0 and _SHOW_TEXT.search(content):
+        return True
+    xobjects = resources.get("/XObject")
+    if xobjects is None or depth >= 3:
+        return False
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        if xobject.get("/Subtype") == "/Form" and _draws_text(xobject.get("/Resources"), xobject.get_data(), depth + 1):
+            return True
+    return False
+
+def _looks_garbled(text: Optional[str]) -> bool:
+    if not text or not text.strip():
+        return True
+    return len(_BAD_CHARS.findall(text)) > GARBLED_CHAR_RATIO * len(text)
+
+class _PdfPages:
+    """
+    A PDF opened once with PyPDF2, with per-page pdfplumber fallback.
+
+    pdfplumber is only opened if some page's PyPDF2 text is empty or garbled,
+    and then only that page is re-extracted with it.
     """
-    Extract text from PDF using PyPDF2 with pdfplumber fallback.
+
+    def __init__(self, source: DocumentSource):
+        self._source = source
+        self._plumber = None
+        try:
+            self.reader = PdfReader(source.open_stream())
+            if self.reader.is_encrypted:
+                logger.warning("PDF is encrypted, attempting to decrypt with empty password")
+                try:
+                    self.reader.decrypt("")
+                except Exception as e:
+                    raise TextExtractionError(f"PDF is encrypted and cannot be decrypted: {str(e)}")
+            self.pages = self.reader.pages
+            self.page_count = len(self.pages)
+        except TextExtractionError:
+            raise
+        except PdfReadError as e:
+            raise TextExtractionError(f"PDF file is corrupted or invalid: {str(e)}")
+        except Exception as e:
+            raise TextExtractionError(f"Unexpected error opening PDF: {str(e)}")
+
+    def has_text_layer(self, page_num: int) -> bool:
+        """
+        Cheap check of the page's resources and content stream: text needs a
+        font and a text-showing operator, on the page itself or inside a form
+        XObject. Scanned pages only draw images.
+        """
+        try:
+            page = self.pages[page_num]
+            contents = page.get_contents()
+            return _draws_text(page.get("/Resources"), contents.get_data() if contents is not None else b"")
+        except Exception:
+            # Unusual structure: let extraction decide
+            return True
+
+    def _fallback_page_text(self, page_num: int) -> Optional[str]:
+        try:
+            if self._plumber is None:
+                import pdfplumber
+                self._plumber = pdfplumber.open(self._source.open_stream())
+            return self._plumber.pages[page_num].extract_text()
+        except Exception as e:
+            logger.warning(f"pdfplumber fallback failed on page {page_num + 1}: {str(e)}")
+            return None
+
+    def extract_page(self, page_num: int) -> Optional[str]:
+        try:
+            text = self.pages[page_num].extract_text()
+        except Exception as e:
+            logger.warning(f"Error extracting text from page {page_num + 1}: {str(e)}")
+            text = None
+        if not _looks_garbled(text):
+            return text
+
+        logger.info(f"PyPDF2 text empty or garbled on page {page_num + 1}, trying pdfplumber")
+        count("extraction_backend", backend="pdfplumber_page")
+        fallback = self._fallback_page_text(page_num)
+        if fallback and not _looks_garbled(fallback):
+            return fallback
+        return None
+
+    def close(self) -> None:
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+
+# Per-process state for parallel extraction workers, set by _init_page_worker
+_worker_pages = None
+_worker_error: Optional[str] = None
+
+def _init_page_worker(file_input: Union[str, bytes], backend: str) -> None:
+    global _worker_pages, _worker_error
+    try:
+        # A path is memory-mapped here, so the document is not pickled to every worker
+        source = open_document_source(file_input, max_bytes=float("inf"))
+        if backend == "pdfplumber":
+            import pdfplumber
+            pages = pdfplumber.open(source.open_stream()).pages
+            _worker_pages = lambda page_num: pages[page_num].extract_text()
+        else:
+            _worker_pages = _PdfPages(source).extract_page
+    except Exception as e:
+        # Never raise from a pool initializer: the pool would keep respawning workers
+        _worker_error = str(e)
+
+def _extract_page_worker(page_num: int) -> Optional[str]:
+    if _worker_pages is None:
+        raise TextExtractionError(f"Worker could not open PDF: {_worker_error}")
+    try:
+        return _worker_pages(page_num)
+    except Exception as e:
+        logger.warning(f"Error extracting text from page {page_num + 1}: {str(e)}")
+        return None
+
+def _iter_pages_parallel(
+    file_input: Union[str, bytes],
+    backend: str,
+    page_nums: List[int],
+    max_workers: Optional[int],
+    page_timeout: float,
+    expires_at: Optional[float] = None,
+    on_deadline: Optional[Callable[[], None]] = None,
+) -> Iterator[str]:
+    # Page text in page order, as each page comes back from the pool. A page
+    # gets at most page_timeout seconds and never waits past expires_at (a
+    # time.monotonic() value): at that point on_deadline is called and the
+    # remaining pages are dropped
+    workers = min(max_workers or os.cpu_count() or 1, len(page_nums))
+    logger.info(f"Extracting {len(page_nums)} PDF pages with {backend} across {workers} processes")
+
+    with multiprocessing.Pool(workers, initializer=_init_page_worker, initargs=(file_input, backend)) as pool:
+        pending = [(page_num, pool.apply_async(_extract_page_worker, (page_num,))) for page_num in page_nums]
+        for page_num, result in pending:
+            timeout = page_timeout
+            if expires_at is not None:
+                timeout = min(timeout, max(expires_at - time.monotonic(), 0.0))
+            try:
+                page_text = result.get(timeout=timeout)
+            except multiprocessing.TimeoutError:
+                if expires_at is not None and time.monotonic() >= expires_at:
+                    logger.warning(f"Extraction deadline reached at page {page_num + 1} of {len(page_nums)}")
+                    if on_deadline is not None:
+                        on_deadline()
+                    break
+                logger.warning(f"Timed out extracting text from page {page_num + 1} after {page_timeout}s")
+                continue
+            except TextExtractionError as e:
+                raise TextExtractionError(f"Error extracting PDF text with {backend}: {str(e)}")
+            if page_text:
+                yield page_text
+            else:
+                logger.warning(f"No text found on page {page_num + 1}")
+        # Leaving the block terminates the pool, including workers stuck on a
+        # timed-out page, and so does closing this generator early
+
+def _count_pdf_pages(source: DocumentSource) -> int:
+    reader = PdfReader(source.open_stream())
+    if reader.is_encrypted:
+        reader.decrypt("")
+    return len(reader.pages)
+
+def extract_text_from_pdf_parallel(
+    file_content: Union[bytes, DocumentSource],
+    backend: str = "pypdf2",
+    max_workers: Optional[int] = None,
+    page_timeout: float = PARALLEL_PAGE_TIMEOUT,
+    min_pages: int = PARALLEL_MIN_PAGES,
+) -> str:
+    """
+    Extract text from PDF pages in a process pool, reassembled in page order.
+    
+    Documents with fewer than ``min_pages`` pages are extracted serially.
+    Each worker opens the document once and then extracts single pages, so a
+    pathological page only blocks its own worker; a page that does not finish
+    within ``page_timeout`` seconds is skipped and the pool is terminated
+    once the remaining pages are collected.
     
     Args:
-        file_content: PDF file content as bytes
+        file_content: PDF file content as bytes or a DocumentSource
+        backend: "pypdf2" (with per-page pdfplumber fallback) or "pdfplumber"
+        max_workers: Number of worker processes (defaults to CPU count)
+        page_timeout: Seconds to wait for each page
+        min_pages: Page count below which extraction stays serial
         
     Returns:
         Extracted text as string
         
     Raises:
-        TextExtractionError: If both extraction methods fail
+        TextExtractionError: If extraction fails
     """
-    # Try PyPDF2 first
+    serial = extract_text_from_pdf_pdfplumber if backend == "pdfplumber" else extract_text_from_pdf_pypdf2
+    with _opened(file_content, max_bytes=float("inf")) as source:
+        try:
+            page_count = _count_pdf_pages(source)
+        except Exception:
+            # Let the serial extractor produce its usual error for unreadable files
+            return serial(source)
+        if page_count < max(min_pages, 2):
+            return serial(source)
+
+        text_parts = list(_iter_pages_parallel(
+            source.worker_input(), backend, list(range(page_count)), max_workers, page_timeout
+        ))
+    if not text_parts:
+        raise TextExtractionError("No text could be extracted from PDF")
+
+    return "\n".join(text_parts)
+
+def _text_layer_pages(
+    document: _PdfPages, max_pages: int, on_page_limit: Optional[Callable[[int], None]] = None
+) -> List[int]:
+    # Page cap first: checking text layers is itself per-page work
+    page_count = _cap_pages(document.page_count, max_pages, on_page_limit)
+    count("extraction_backend", backend="pypdf2")
+    count("pdf_pages", page_count)
+    text_pages = [n for n in range(page_count) if document.has_text_layer(n)]
+    if not text_pages:
+        raise TextExtractionError(
+            "PDF has no text layer (scanned or image-only); please upload a text-based PDF or DOCX"
+        )
+    skipped = page_count - len(text_pages)
+    if skipped:
+        logger.warning(f"Skipping {skipped} image-only page(s)")
+        count("pdf_image_only_pages", skipped)
+    return text_pages
+
+def _open_pdf(source: DocumentSource) -> Tuple[Optional[_PdfPages], Optional[TextExtractionError]]:
+    logger.info("Attempting PDF text extraction with PyPDF2")
     try:
-        logger.info("Attempting PDF text extraction with PyPDF2")
-        return extract_text_from_pdf_pypdf2(file_content)
+        return _PdfPages(source), None
     except TextExtractionError as e:
-        logger.warning(f"PyPDF2 extraction failed: {str(e)}")
+        logger.warning(f"PyPDF2 could not open PDF: {str(e)}")
+        return None, e
+
+def _pdfplumber_fallback(source: DocumentSource, pypdf2_error: TextExtractionError) -> str:
+    try:
+        logger.info("Attempting PDF text extraction with pdfplumber")
+        count("extraction_backend", backend="pdfplumber")
+        return extract_text_from_pdf_pdfplumber(source)
+    except TextExtractionError as e2:
+        raise TextExtractionError(f"Both PyPDF2 and pdfplumber failed. PyPDF2: {str(pypdf2_error)}, pdfplumber: {str(e2)}")
+
+def _cap_pages(page_count: int, max_pages: int, on_page_limit: Optional[Callable[[int], None]]) -> int:
+    if page_count <= max_pages:
+        return page_count
+    if on_page_limit is None:
+        raise TextExtractionError(f"PDF has {page_count} pages; the maximum supported is {max_pages}")
+    on_page_limit(page_count)
+    return max_pages
+
+def _iter_pdfplumber_pages(
+    source: DocumentSource,
+    pypdf2_error: TextExtractionError,
+    max_pages: int,
+    on_page_limit: Optional[Callable[[int], None]] = None,
+) -> Iterator[str]:
+    # pdfplumber page by page, under the same page cap as the PyPDF2 path;
+    # yielding each page lets the caller stop at its deadline in between
+    def failed(reason: str) -> TextExtractionError:
+        return TextExtractionError(
+            f"Both PyPDF2 and pdfplumber failed. PyPDF2: {str(pypdf2_error)}, pdfplumber: {reason}"
+        )
+
+    logger.info("Attempting PDF text extraction with pdfplumber")
+    count("extraction_backend", backend="pdfplumber")
+    try:
+        import pdfplumber
+        pdf = pdfplumber.open(source.open_stream())
+    except ImportError:
+        raise failed("pdfplumber is not installed. Install with: pip install pdfplumber")
+    except Exception as e:
+        raise failed(f"Error extracting PDF text with pdfplumber: {str(e)}")
+    with pdf:
+        try:
+            pages = pdf.pages
+        except Exception as e:
+            raise failed(f"Error extracting PDF text with pdfplumber: {str(e)}")
+        page_count = _cap_pages(len(pages), max_pages, on_page_limit)
+        count("pdf_pages", page_count)
+        produced = False
+        for page_num in range(page_count):
+            try:
+                page_text = pages[page_num].extract_text()
+            except Exception as e:
+                logger.warning(f"Error extracting text from page {page_num + 1}: {str(e)}")
+                continue
+            if page_text:
+                produced = True
+                yield page_text
+            else:
+                logger.warning(f"No text found on page {page_num + 1}")
+    if not produced:
+        raise failed("No text could be extracted from PDF")
+
+def iter_pdf_pages(
+    file_content: Union[bytes, str, BinaryIO, DocumentSource],
+    max_pages: int = MAX_PDF_PAGES,
+    max_bytes: int = MAX_FILE_BYTES,
+    on_page_limit: Optional[Callable[[int], None]] = None,
+    parallel: bool = False,
+    expires_at: Optional[float] = None,
+    on_deadline: Optional[Callable[[], None]] = None,
+) -> Iterator[str]:
+    """
+    Yield the text of each PDF page as soon as it is extracted, so callers
+    can start analyzing before the whole document is done. Pages without
+    text are skipped; the same fallbacks as extract_text_from_pdf apply,
+    except that if PyPDF2 cannot open the file pdfplumber is also read page
+    by page under ``max_pages``.
+    
+    With ``parallel``, a PDF with at least PARALLEL_MIN_PAGES text pages is
+    fanned out over a process pool and still yielded in page order. The
+    pool never waits past ``expires_at``, so one slow page cannot hold the
+    caller beyond its deadline; serial extraction leaves the deadline to the
+    caller, which checks it between pages.
+    
+    Args:
+        file_content: PDF bytes, path, binary file-like object or DocumentSource
+        max_pages: Largest accepted page count
+        max_bytes: Largest accepted file size
+        on_page_limit: If given, a longer PDF is cut to its first
+            ``max_pages`` pages instead of rejected, and this is called with
+            its real page count
+        parallel: Allow parallel page extraction for large PDFs
+        expires_at: time.monotonic() value at which parallel extraction
+            stops waiting for pages
+        on_deadline: Called if parallel extraction stopped at ``expires_at``
+            with pages left
         
-        # Try pdfplumber as fallback
+    Yields:
+        Page text, in page order
+        
+    Raises:
+        TextExtractionError: If the PDF is over a limit, has no text layer or
+            no text could be extracted
+    """
+    with _opened(file_content, max_bytes) as source:
+        document, error = _open_pdf(source)
+        if document is None:
+            yield from _iter_pdfplumber_pages(source, error, max_pages, on_page_limit)
+            return
+        produced = False
         try:
-            logger.info("Attempting PDF text extraction with pdfplumber")
-            return extract_text_from_pdf_pdfplumber(file_content)
-        except TextExtractionError as e2:
-            raise TextExtractionError(f"Both PyPDF2 and pdfplumber failed. PyPDF2: {str(e)}, pdfplumber: {str(e2)}")
+            text_pages = _text_layer_pages(document, max_pages, on_page_limit)
+            if parallel and len(text_pages) >= max(PARALLEL_MIN_PAGES, 2):
+                document.close()
+                for page_text in _iter_pages_parallel(
+                    source.worker_input(), "pypdf2", text_pages, None, PARALLEL_PAGE_TIMEOUT,
+                    expires_at, on_deadline,
+                ):
+                    produced = True
+                    yield page_text
+            else:
+                for page_num in text_pages:
+                    page_text = document.extract_page(page_num)
+                    if page_text:
+                        produced = True
+                        yield page_text
+                    else:
+                        logger.warning(f"No text found on page {page_num + 1}")
+        finally:
+            document.close()
+        if not produced:
+            raise TextExtractionError("No text could be extracted from PDF")
 
-def extract_text_from_docx(file_content: bytes) -> str:
+def extract_text_from_pdf(
+    file_content: Union[bytes, DocumentSource],
+    parallel: bool = True,
+    max_pages: int = MAX_PDF_PAGES,
+) -> str:
     """
-    Extract text from DOCX file.
+    Extract text from PDF, opening the document once with PyPDF2 and
+    falling back to pdfplumber only for pages whose text is empty or garbled.
+    
+    Image-only (scanned) documents are detected from page resources up front
+    and rejected without attempting extraction. pdfplumber parses the whole
+    file only when PyPDF2 cannot open it at all.
     
     Args:
-        file_content: DOCX file content as bytes
+        file_content: PDF file content as bytes or a DocumentSource
+        parallel: Fan pages out over a process pool for documents with at
+            least PARALLEL_MIN_PAGES pages
+        max_pages: Largest accepted page count
         
     Returns:
         Extracted text as string
         
     Raises:
-        TextExtractionError: If extraction fails
+        TextExtractionError: If the PDF has no text layer, is over the page
+            limit or extraction fails
+    """
+    with _opened(file_content, max_bytes=float("inf")) as source:
+        document, error = _open_pdf(source)
+        if document is None:
+            return _pdfplumber_fallback(source, error)
+        try:
+            text_pages = _text_layer_pages(document, max_pages)
+            if parallel and document.page_count >= max(PARALLEL_MIN_PAGES, 2):
+                text_parts = list(_iter_pages_parallel(
+                    source.worker_input(), "pypdf2", text_pages, None, PARALLEL_PAGE_TIMEOUT
+                ))
+            else:
+                text_parts = []
+                for page_num in text_pages:
+                    page_text = document.extract_page(page_num)
+                    if page_text:
+                        text_parts.append(page_text)
+                    else:
+                        logger.warning(f"No text found on page {page_num + 1}")
+        finally:
+            document.close()
+
+    if not text_parts:
+        raise TextExtractionError("No text could be extracted from PDF")
+
+    return "\n".join(text_parts)
+
+# Leading bytes of an OLE compound file: legacy Word 97-2003 .doc files and
+# password-protected Office documents
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_ZIP_MAGIC = b"PK"
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Alternative renderings of drawings and text boxes, which repeat the text of
+# the preferred rendering
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_DOCX_MAIN_PART = "word/document.xml"
+# Uncompressed size cap per XML part. zipfile never decompresses past a
+# member's declared size, so checking it up front also stops zip bombs
+MAX_DOCX_PART_BYTES = 64 * 1024 * 1024
+_DOCX_HEADER_RE = re.compile(r"word/header\d*\.xml")
+_DOCX_FOOTER_RE = re.compile(r"word/footer\d*\.xml")
+_DOCX_RUN_CHARS = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+def _iter_docx_blocks(xml_stream: BinaryIO) -> Iterator[str]:
+    """
+    Text of a WordprocessingML part, one paragraph or table row at a time in
+    document order. Table cells are joined with tabs. The XML is parsed
+    incrementally and finished elements are discarded, so memory stays small
+    however long the document is.
     """
+    paragraphs: List[List[str]] = []  # runs of the open paragraphs (text boxes nest)
+    rows: List[List[str]] = []  # cells of the open table rows (tables nest)
+    cells: List[List[str]] = []  # paragraphs of the open table cells
+    fallback_depth = 0
+    container = None
+
+    for event, elem in iterparse(xml_stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1
+            elif fallback_depth:
+                pass
+            elif tag == _W + "p":
+                paragraphs.append([])
+            elif tag == _W + "tr":
+                rows.append([])
+            elif tag == _W + "tc":
+                cells.append([])
+            elif tag in (_W + "body", _W + "hdr", _W + "ftr"):
+                container = elem
+            continue
+
+        if tag == _MC_FALLBACK:
+            fallback_depth -= 1
+            elem.clear()
+            continue
+        if fallback_depth:
+            continue
+
+        block = None
+        if tag == _W + "t":
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag in _DOCX_RUN_CHARS:
+            if paragraphs:
+                paragraphs[-1].append(_DOCX_RUN_CHARS[tag])
+        elif tag == _W + "p":
+            text = "".join(paragraphs.pop()).strip() if paragraphs else ""
+            if text and cells:
+                cells[-1].append(text)
+            elif text:
+                block = text
+        elif tag == _W + "tc":
+            text = " ".join(cells.pop()) if cells else ""
+            if rows:
+                rows[-1].append(text)
+            elif text and cells:
+                # A cell outside any row (malformed); keep its text anyway
+                cells[-1].append(text)
+            elif text:
+                block = text
+        elif tag == _W + "tr":
+            row = rows.pop() if rows else []
+            text = "\t".join(row) if any(row) else ""
+            if text and cells:
+                cells[-1].append(text)
+            elif text:
+                block = text
+        else:
+            continue
+
+        if tag in (_W + "p", _W + "tr"):
+            # Its text is collected; free the subtree. Only empty shells
+            # remain until the enclosing part is cleared below
+            elem.clear()
+        if block is not None:
+            yield block
+        if container is not None and not (paragraphs or rows or cells):
+            container.clear()
+
+def _check_docx_signature(stream: BinaryIO) -> None:
+    header = stream.read(len(_OLE_MAGIC))
+    stream.seek(0)
+    if header.startswith(_OLE_MAGIC):
+        raise TextExtractionError(
+            "Legacy .doc (Word 97-2003) and password-protected Word files are not supported; "
+            "save the resume as .docx or PDF"
+        )
+    if not header.startswith(_ZIP_MAGIC):
+        raise TextExtractionError("File is not a valid DOCX document")
+
+def iter_docx_blocks(file_content: Union[bytes, DocumentSource]) -> Iterator[str]:
+    """
+    Stream the text of a DOCX as paragraphs and table rows in document order:
+    headers first, then the body, then footers.
+    
+    Only the zip directory and the XML parts holding text are read; images
+    and other media inside the archive are never decompressed.
+    
+    Args:
+        file_content: DOCX file content as bytes or a DocumentSource
+        
+    Yields:
+        Non-empty paragraph and table-row strings
+        
+    Raises:
+        TextExtractionError: If the file is a legacy .doc or not a readable
+            DOCX, including encrypted or malformed parts
+    """
+    stream = _stream(file_content)
     try:
-        docx_file = io.BytesIO(file_content)
-        text = docx2txt.process(docx_file)
+        _check_docx_signature(stream)
+        try:
+            archive = zipfile.ZipFile(stream)
+        except zipfile.BadZipFile as e:
+            raise TextExtractionError(f"File is not a valid DOCX document: {str(e)}")
+        with archive:
+            names = archive.namelist()
+            if _DOCX_MAIN_PART not in names:
+                raise TextExtractionError("File is not a valid DOCX document: word/document.xml is missing")
+            parts = (sorted(n for n in names if _DOCX_HEADER_RE.fullmatch(n)) + [_DOCX_MAIN_PART]
+                     + sorted(n for n in names if _DOCX_FOOTER_RE.fullmatch(n)))
+            for part in parts:
+                size = archive.getinfo(part).file_size
+                if size > MAX_DOCX_PART_BYTES:
+                    raise TextExtractionError(
+                        f"DOCX part {part} is {size / (1024 * 1024):.0f} MB uncompressed; "
+                        f"the maximum supported is {MAX_DOCX_PART_BYTES / (1024 * 1024):.0f} MB"
+                    )
+                try:
+                    with archive.open(part) as xml_stream:
+                        yield from _iter_docx_blocks(xml_stream)
+                except (zipfile.BadZipFile, zlib.error, EOFError) as e:
+                    raise TextExtractionError(f"Corrupt DOCX part {part}: {str(e)}")
+                except ParseError as e:
+                    raise TextExtractionError(f"Malformed XML in DOCX part {part}: {str(e)}")
+                except (RuntimeError, NotImplementedError) as e:
+                    # Encrypted entries and unsupported compression methods
+                    raise TextExtractionError(f"Unsupported DOCX part {part}: {str(e)}")
+                except IndexError as e:
+                    raise TextExtractionError(f"Malformed DOCX part {part}: {str(e)}")
+    finally:
+        stream.close()
+
+def extract_text_from_docx(file_content: Union[bytes, DocumentSource]) -> str:
+    """
+    Extract text from DOCX file, one line per paragraph or table row (see
+    iter_docx_blocks).
+    
+    Args:
+        file_content: DOCX file content as bytes or a DocumentSource
+        
+    Returns:
+        Extracted text as string
         
-        if not text or not text.strip():
+    Raises:
+        TextExtractionError: If the file is a legacy .doc, is not a valid
+            DOCX or contains no text
+    """
+    text = "\n".join(iter_docx_blocks(file_content))
+    if not text:
+        raise TextExtractionError("No text could be extracted from DOCX file")
+    return text
+
+SUPPORTED_EXTENSIONS = ('pdf', 'docx', 'doc')
+
+def _file_extension(file_name: str) -> str:
+    file_name = file_name.lower()
+    file_extension = file_name.split('.')[-1] if '.' in file_name else ''
+    if file_extension not in SUPPORTED_EXTENSIONS:
+        raise TextExtractionError(f"Unsupported file type: {file_extension}. Supported types: pdf, docx, doc")
+    return file_extension
+
+def extract_text(
+    source: Union[bytes, str, BinaryIO, DocumentSource],
+    file_name: Optional[str] = None,
+    parallel: bool = True,
+    max_bytes: int = MAX_FILE_BYTES,
+    max_pages: int = MAX_PDF_PAGES,
+) -> str:
+    """
+    Extract text from a PDF or DOCX given as bytes, a path or a file-like
+    object, without loading more than SPOOL_MAX_MEMORY of it into memory
+    unless it already is (see open_document_source).
+    
+    Args:
+        source: Document bytes, path, binary file-like object or DocumentSource
+        file_name: Name used to pick the extractor (defaults to the path or
+            the object's ``name``)
+        parallel: Allow parallel page extraction for large PDFs
+        max_bytes: Largest accepted file size
+        max_pages: Largest accepted PDF page count
+        
+    Returns:
+        Extracted text as string
+        
+    Raises:
+        TextExtractionError: If the file type is unsupported, a limit is
+            exceeded or extraction fails
+    """
+    if file_name is None:
+        file_name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    file_extension = _file_extension(os.path.basename(str(file_name)))
+
+    with stage("extraction", format=file_extension), _opened(source, max_bytes) as document_source:
+        count("document_bytes", document_source.size, format=file_extension)
+        if file_extension == 'pdf':
+            return extract_text_from_pdf(document_source, parallel=parallel, max_pages=max_pages)
+        return extract_text_from_docx(document_source)
+
+def iter_document_pages(
+    source: Union[bytes, str, BinaryIO, DocumentSource],
+    file_name: Optional[str] = None,
+    max_bytes: int = MAX_FILE_BYTES,
+    max_pages: int = MAX_PDF_PAGES,
+    on_page_limit: Optional[Callable[[int], None]] = None,
+    parallel: bool = False,
+    expires_at: Optional[float] = None,
+    on_deadline: Optional[Callable[[], None]] = None,
+) -> Iterator[str]:
+    """
+    Page-by-page text of a PDF (see iter_pdf_pages); a DOCX has no pages and
+    is yielded paragraph by paragraph (see iter_docx_blocks). Joining the
+    chunks with newlines gives the same text as extract_text.
+    """
+    if file_name is None:
+        file_name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    if _file_extension(os.path.basename(str(file_name))) == 'pdf':
+        yield from iter_pdf_pages(
+            source, max_pages=max_pages, max_bytes=max_bytes, on_page_limit=on_page_limit,
+            parallel=parallel, expires_at=expires_at, on_deadline=on_deadline,
+        )
+        return
+    with _opened(source, max_bytes) as document_source:
+        produced = False
+        for block in iter_docx_blocks(document_source):
+            produced = True
+            yield block
+        if not produced:
             raise TextExtractionError("No text could be extracted from DOCX file")
-            
-        return text.strip()
+
+def extract_text_from_bytes(file_content: bytes, file_name: str, parallel: bool = True) -> str:
+    """
+    Extract text from raw file content, dispatching on the file name's extension.
+    
+    Args:
+        file_content: File content as bytes
+        file_name: Original file name, used to pick the extractor
+        parallel: Allow parallel page extraction for large PDFs
         
-    except Exception as e:
-        raise TextExtractionError(f"Error extracting DOCX text: {str(e)}")
+    Returns:
+        Extracted text as string
+        
+    Raises:
+        TextExtractionError: If file type is unsupported or extraction fails
+    """
+    if not file_content:
+        raise TextExtractionError("File is empty or could not be read")
+    return extract_text(file_content, file_name, parallel=parallel)
+
+def extract_text_from_path(path: str, parallel: bool = True) -> str:
+    """
+    Extract text from a PDF or DOCX file on disk. The file is memory-mapped
+    rather than read into memory.
+    
+    Args:
+        path: Path to the file
+        parallel: Allow parallel page extraction for large PDFs
+        
+    Returns:
+        Extracted text as string
+        
+    Raises:
+        TextExtractionError: If file type is unsupported or extraction fails
+    """
+    return extract_text(path, os.path.basename(path), parallel=parallel)
 
-def extract_text_from_file(uploaded_file: UploadedFile) -> str:
+def extract_text_from_file(uploaded_file: "UploadedFile") -> str:
     """
     Extract text from uploaded file (PDF or DOCX).
     
@@ -173,25 +1062,11 @@ def extract_text_from_file(uploaded_file: UploadedFile) -> str:
     if not hasattr(uploaded_file, 'name') or not hasattr(uploaded_file, 'read'):
         raise ValueError("Invalid file object provided")
     
-    # Get file extension
-    file_name = uploaded_file.name.lower()
-    file_extension = file_name.split('.')[-1] if '.' in file_name else ''
-    
-    logger.info(f"Processing file: {uploaded_file.name} (type: {file_extension})")
+    logger.info(f"Processing file: {uploaded_file.name}")
     
     try:
-        # Read file content
-        file_content = uploaded_file.read()
-        if not file_content:
-            raise TextExtractionError("File is empty or could not be read")
-        
-        # Extract text based on file type
-        if file_extension == 'pdf':
-            return extract_text_from_pdf(file_content)
-        elif file_extension in ['docx', 'doc']:
-            return extract_text_from_docx(file_content)
-        else:
-            raise TextExtractionError(f"Unsupported file type: {file_extension}. Supported types: pdf, docx, doc")
+        # In-memory uploads are used without copying; other streams are spooled
+        return extract_text(uploaded_file, uploaded_file.name)
             
     except TextExtractionError:
         # Re-raise our custom exceptions
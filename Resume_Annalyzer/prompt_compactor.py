@@ -0,0 +1,236 @@
+"""
+Token-budgeted compaction of resume text for LLM prompts.
+
+Text extracted from long PDFs repeats page headers and footers, carries page
+numbers and blank runs, and can exceed what the model needs to summarize a
+candidate. ``compact_resume_text`` normalizes whitespace and splits the text
+into resume sections. A resume within the token budget keeps every line.
+Over budget, page-number lines, running headers and footers and exact
+duplicate lines are dropped first; if it is still too long, the most
+informative lines (favouring skills, experience and quantified achievements)
+are kept in their original order.
+
+The output depends only on the input text and the budget, so the compacted
+prompt doubles as a stable cache key. Tokens are estimated as characters / 4,
+which is close enough for budgeting English text without a tokenizer.
+"""
+import math
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from resume_document import HEADER_SECTION, section_of
+
+# Estimated tokens for the resume part of the recommendation prompt;
+# override with RESUME_PROMPT_TOKEN_BUDGET
+DEFAULT_TOKEN_BUDGET = 1500
+CHARS_PER_TOKEN = 4
+
+# Section headings and the weight of their lines when trimming to budget
+SECTION_WEIGHTS: Dict[str, float] = {
+    "skills": 3.0,
+    "experience": 2.5,
+    "summary": 2.0,
+    "projects": 2.0,
+    "certifications": 1.5,
+    "education": 1.5,
+    "awards": 1.0,
+    "publications": 1.0,
+    "languages": 1.0,
+    "interests": 0.2,
+    "references": 0.0,
+}
+# Lines before the first heading: name and contact details
+_HEADER_WEIGHT = 2.0
+_OTHER_WEIGHT = 1.0
+
+_PAGE_NUMBER_RE = re.compile(r"(?i)^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$")
+_DIGITS_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"[ \t\f\v\u00a0]+")
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+# Running headers and footers are short lines repeated, digits aside ("Jane
+# Doe - Page 2"), at the top or bottom of several pages. Pages are split on
+# form feeds; text without them counts repeats this many lines apart instead
+_SHORT_LINE_WORDS = 8
+_PAGE_EDGE_LINES = 3
+_MIN_PAGE_GAP = 20
+
+
+class CompactedText(NamedTuple):
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def token_budget() -> int:
+    try:
+        return int(os.environ.get("RESUME_PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+    except ValueError:
+        return DEFAULT_TOKEN_BUDGET
+
+
+def _lines(text: str) -> List[Tuple[str, int, bool]]:
+    # Whitespace-normalized non-blank lines as (line, page, at a page edge)
+    out: List[Tuple[str, int, bool]] = []
+    paged = "\f" in text
+    for page, page_text in enumerate(text.split("\f")):
+        lines = [_SPACE_RE.sub(" ", raw).strip() for raw in page_text.split("\n")]
+        lines = [line for line in lines if line]
+        for i, line in enumerate(lines):
+            edge = not paged or i < _PAGE_EDGE_LINES or i >= len(lines) - _PAGE_EDGE_LINES
+            out.append((line, page, edge))
+    return out
+
+
+def _running_keys(lines: List[Tuple[str, int, bool]]) -> Set[str]:
+    # Digit-masked keys of short lines that recur at the edges of several
+    # pages, or far enough apart to be on different pages when the text has
+    # no page breaks
+    positions: Dict[str, List[Tuple[int, int, bool]]] = {}
+    for index, (line, page, edge) in enumerate(lines):
+        if section_of(line) is None and line.count(" ") < _SHORT_LINE_WORDS:
+            positions.setdefault(_DIGITS_RE.sub("#", line.lower()), []).append((index, page, edge))
+    paged = len({page for _, page, _ in lines}) > 1
+    running = set()
+    for key, found in positions.items():
+        if len(found) < 2:
+            continue
+        if paged:
+            if all(edge for _, _, edge in found) and len({page for _, page, _ in found}) > 1:
+                running.add(key)
+        elif all(b[0] - a[0] >= _MIN_PAGE_GAP for a, b in zip(found, found[1:])):
+            running.add(key)
+    return running
+
+
+def _strip_repeats(lines: List[Tuple[str, int, bool]]) -> List[str]:
+    # Lines without page numbers, repeats of running headers and footers,
+    # and exact repeats of other lines; first occurrences are kept
+    running = _running_keys(lines)
+    seen = set()
+    out: List[str] = []
+    for line, _, _ in lines:
+        if _PAGE_NUMBER_RE.match(line):
+            continue
+        if section_of(line) is None:
+            key = line.lower()
+            masked = _DIGITS_RE.sub("#", key)
+            if masked in running:
+                key = masked
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append(line)
+    return out
+
+
+def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Group lines into (section, lines) in document order; heading lines start
+    a section and are not included in it.
+    """
+    sections: List[Tuple[str, List[str]]] = [(HEADER_SECTION, [])]
+    for line in lines:
+        section = section_of(line)
+        if section is not None:
+            sections.append((section, []))
+        else:
+            sections[-1][1].append(line)
+    return [(name, body) for name, body in sections if body]
+
+
+def _line_score(line: str, weight: float) -> float:
+    # Section weight, plus a bonus for numbers (achievements, dates) and
+    # for varied wording over repetitive filler
+    words = _WORD_RE.findall(line.lower())
+    diversity = len(set(words)) / max(len(words), 8)
+    return weight + diversity + (0.5 if _DIGITS_RE.search(line) else 0.0)
+
+
+def _heading_cost(name: str, kept: Dict[int, str]) -> int:
+    # A section's heading line is paid for by its first kept line
+    return len(name) + 2 if not kept and name != HEADER_SECTION else 0
+
+
+def _cut_line(line: str, max_chars: int) -> str:
+    # At the last space within max_chars, or mid-word if there is none
+    if max_chars <= 0:
+        return ""
+    cut = line[:max_chars]
+    boundary = cut.rfind(" ")
+    return cut[:boundary] if boundary > 0 else cut
+
+
+def _render(sections: List[Tuple[str, List[str]]]) -> str:
+    out: List[str] = []
+    for name, body in sections:
+        if name != HEADER_SECTION:
+            out.append(f"{name.upper()}:")
+        out.extend(body)
+    return "\n".join(out)
+
+
+def compact_resume_text(text: str, budget: Optional[int] = None) -> CompactedText:
+    """
+    Section ``text`` and fit it into ``budget`` estimated tokens, dropping
+    repeated lines and then the least informative ones only when over budget.
+
+    Args:
+        text: Extracted resume text
+        budget: Token budget for the result (defaults to token_budget())
+
+    Returns:
+        CompactedText with the compacted text and original and compacted token estimates
+    """
+    budget = token_budget() if budget is None else budget
+    original_tokens = estimate_tokens(text)
+    lines = _lines(text)
+    sections = split_sections([line for line, _, _ in lines])
+    compacted = _render(sections)
+
+    if estimate_tokens(compacted) > budget:
+        sections = split_sections(_strip_repeats(lines))
+        compacted = _render(sections)
+
+    if estimate_tokens(compacted) > budget:
+        # Rank every line, best first with ties to the earlier line, and keep
+        # lines while they fit; each kept section also pays for its heading.
+        # The best line that did not fit is then cut to the space left, so
+        # one long paragraph still leaves text for the prompt
+        ranked = []
+        for s, (name, body) in enumerate(sections):
+            weight = _HEADER_WEIGHT if name == HEADER_SECTION else SECTION_WEIGHTS.get(name, _OTHER_WEIGHT)
+            for i, line in enumerate(body):
+                ranked.append((-_line_score(line, weight), s, i))
+        ranked.sort()
+        budget_chars = budget * CHARS_PER_TOKEN
+        used = 0
+        kept: List[Dict[int, str]] = [{} for _ in sections]
+        overflow = None
+        for _, s, i in ranked:
+            cost = len(sections[s][1][i]) + 1 + _heading_cost(sections[s][0], kept[s])
+            if used + cost <= budget_chars:
+                kept[s][i] = sections[s][1][i]
+                used += cost
+            elif overflow is None:
+                overflow = (s, i)
+        if overflow is not None:
+            s, i = overflow
+            line = _cut_line(sections[s][1][i], budget_chars - used - 1 - _heading_cost(sections[s][0], kept[s]))
+            if line:
+                kept[s][i] = line
+        sections = [
+            (name, [kept[s][i] for i in range(len(body)) if i in kept[s]])
+            for s, (name, body) in enumerate(sections)
+        ]
+        compacted = _render([(name, body) for name, body in sections if body])
+
+    return CompactedText(compacted, original_tokens, estimate_tokens(compacted))
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "analysis")
+_HASH_CHUNK = 1024 * 1024
+
+
+def content_key(file_content: Union[bytes, BinaryIO], *versions: str) -> str:
+    """
+    Build a content-addressed cache key from the uploaded bytes and any
+    version strings that change the derived results. A seekable binary file
+    is hashed in chunks from the start and rewound afterwards, so an upload
+    is never copied whole just to be hashed.
+    """
+    if isinstance(file_content, (bytes, bytearray, memoryview)):
+        digest = hashlib.sha256(file_content)
+    else:
+        digest = hashlib.sha256()
+        file_content.seek(0)
+        for chunk in iter(lambda: file_content.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+        file_content.seek(0)
+    for version in versions:
+        digest.update(b"\0" + version.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier cache for analysis results.
+
+    Values are stored per (key, kind), so extracted text, the analysis dict
+    and the ATS score can be cached and looked up independently. The memory
+    tier is a bounded LRU; the disk tier stores one JSON file per entry and is
+    evicted by age (``ttl_seconds``) and total size (``max_disk_bytes``),
+    oldest access first. Pass ``cache_dir=None`` to disable the disk tier.
+    """
+
+    def __init__(
+        self,
+        max_memory_items: int = 256,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 7 * 24 * 3600,
+    ):
+        self.max_memory_items = max_memory_items
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    def get(self, key: str, kind: str) -> Optional[Any]:
+        """
+        Return the cached value or None on a miss.
+        """
+        with self._lock:
+            if (key, kind) in self._memory:
+                self._memory.move_to_end((key, kind))
+                self._counters["memory_hits"] += 1
+                return self._memory[(key, kind)]
+
+        value = self._disk_get(key, kind)
+        with self._lock:
+            if value is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["disk_hits"] += 1
+            self._memory_put(key, kind, value)
+        return value
+
+    def set(self, key: str, kind: str, value: Any) -> None:
+        """
+        Store a JSON-serializable value in both tiers.
+        """
+        with self._lock:
+            self._counters["sets"] += 1
+            self._memory_put(key, kind, value)
+        self._disk_put(key, kind, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for path, _, _ in self._disk_entries():
+                self._remove(path)
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return hit/miss counters and the overall hit rate.
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["memory_items"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def _memory_put(self, key: str, kind: str, value: Any) -> None:
+        self._memory[(key, kind)] = value
+        self._memory.move_to_end((key, kind))
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self._counters["memory_evictions"] += 1
+
+    def _path(self, key: str, kind: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.{kind}.json")
+
+    def _disk_get(self, key: str, kind: str) -> Optional[Any]:
+        if not self.cache_dir:
+            return None
+        path = self._path(key, kind)
+        try:
+            mtime = os.path.getmtime(path)
+            if time.time() - mtime > self.ttl_seconds:
+                self._remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            # Touch on read so size eviction drops least recently used entries first
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {str(e)}")
+            self._remove(path)
+            return None
+
+    def _disk_put(self, key: str, kind: str, value: Any) -> None:
+        if not self.cache_dir:
+            return
+        path = self._path(key, kind)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            logger.warning(f"Could not write cache entry {path}: {str(e)}")
+            self._remove(tmp_path)
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(entry[2] for entry in self._disk_entries())
+            else:
+                self._disk_bytes += size
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _disk_entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, st.st_mtime, st.st_size
+
+    def _evict_disk(self) -> None:
+        now = time.time()
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        # Keep some headroom so a full cache doesn't rescan on every write
+        target = int(self.max_disk_bytes * 0.9)
+        evicted = 0
+        for path, mtime, size in entries:
+            if total <= target and now - mtime <= self.ttl_seconds:
+                continue
+            self._remove(path)
+            total -= size
+            evicted += 1
+        with self._lock:
+            self._disk_bytes = total
+            self._counters["disk_evictions"] += evicted
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
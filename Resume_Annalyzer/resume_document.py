@@ -0,0 +1,149 @@
+"""
+A resume's text split once into sections, with character offsets.
+
+Section headings are recognized on their own line ("Work Experience",
+"SKILLS:") or leading a line ("Skills: Python, SQL"). Text before the first
+heading (name, contact details, a headline) is the "header" section. The
+document is a TextDocument (text_core.py) that also caches per-section text, so
+each extractor reads only the sections relevant to it, scanning less text
+and ignoring e.g. "4 years" in an education blurb. A resume without any
+recognizable heading is read whole by every extractor.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from text_core import TextDocument
+
+HEADER_SECTION = "header"
+
+# Canonical section names and the headings that introduce them
+SECTION_HEADINGS: Dict[str, str] = {
+    "summary": "summary", "profile": "summary", "professional summary": "summary",
+    "objective": "summary", "about me": "summary",
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "employment history": "experience", "work history": "experience", "employment": "experience",
+    "skills": "skills", "technical skills": "skills", "core competencies": "skills", "competencies": "skills",
+    "projects": "projects", "personal projects": "projects",
+    "education": "education", "academic background": "education",
+    "certifications": "certifications", "certificates": "certifications", "licenses": "certifications",
+    "awards": "awards", "achievements": "awards", "honors": "awards",
+    "publications": "publications",
+    "languages": "languages",
+    "interests": "interests", "hobbies": "interests",
+    "references": "references",
+}
+SECTION_NAMES: FrozenSet[str] = frozenset(SECTION_HEADINGS.values()) | {HEADER_SECTION}
+
+_MAX_HEADING_CHARS = 30
+# A short phrase alone on its line ("Skills", "SKILLS:") or leading it
+# ("Skills: Python"); a heading if it is in SECTION_HEADINGS. Anchored on a
+# literal newline, which the regex engine finds much faster than ^
+_HEADING_RE = re.compile(r"(?m)\n[ \t]*([A-Za-z][A-Za-z ]{0,29}?)[ \t]*(?::[ \t]*(?=\S)|:?[ \t]*\r?$)")
+
+
+def section_of(line: str) -> Optional[str]:
+    """
+    The canonical section a heading line starts, or None if it is not one.
+    """
+    key = line.strip().rstrip(":").strip().lower()
+    if len(key) > _MAX_HEADING_CHARS:
+        return None
+    return SECTION_HEADINGS.get(key)
+
+
+class Section:
+    """
+    One section: its canonical name and the offsets of its body in the text.
+    """
+
+    __slots__ = ("name", "start", "end")
+
+    def __init__(self, name: str, start: int, end: int):
+        self.name = name
+        self.start = start
+        self.end = end
+
+    def __repr__(self) -> str:
+        return f"Section({self.name!r}, {self.start}, {self.end})"
+
+
+def _segment(text: str) -> List[Section]:
+    # One regex pass finds the headings; each section runs to the next one.
+    # Offsets in the padded text are one past those in ``text``
+    sections: List[Section] = []
+    name, start = HEADER_SECTION, 0
+    for m in _HEADING_RE.finditer("\n" + text):
+        heading = SECTION_HEADINGS.get(m.group(1).lower())
+        if heading is None:
+            continue
+        if m.start() > start:
+            sections.append(Section(name, start, m.start()))
+        name, start = heading, m.end() - 1
+        if text.startswith("\n", start):
+            start += 1
+    if len(text) > start:
+        sections.append(Section(name, start, len(text)))
+    return sections
+
+
+class ResumeDocument(TextDocument):
+    """
+    Resume text with its sections and lazily computed, cached views.
+    """
+
+    __slots__ = ("sections", "_section_views", "_views")
+
+    def __init__(self, text: str):
+        super().__init__(text)
+        self.sections: List[Section] = _segment(self.text)
+        self._section_views: List[Optional[str]] = [None] * len(self.sections)
+        self._views: Dict[Optional[FrozenSet[str]], str] = {}
+
+    @property
+    def has_sections(self) -> bool:
+        return any(section.name != HEADER_SECTION for section in self.sections)
+
+    def section_views(self, names: Optional[FrozenSet[str]] = None) -> List[Tuple[Section, str]]:
+        """
+        Each named section (all for None, or when the resume has no
+        headings) with its lowercase, whitespace-normalized text, in
+        document order.
+        """
+        if not self.has_sections:
+            # At most one section, spanning the whole text
+            return [(section, self.section_text()) for section in self.sections]
+        views = []
+        for i, section in enumerate(self.sections):
+            if names is not None and section.name not in names:
+                continue
+            view = self._section_views[i]
+            if view is None:
+                view = " ".join(self.text[section.start:section.end].split()).lower()
+                self._section_views[i] = view
+            views.append((section, view))
+        return views
+
+    def section_text(self, names: Optional[FrozenSet[str]] = None) -> str:
+        """
+        Lowercase, whitespace-normalized text of the named sections (all of
+        them for None, or when the resume has no headings), one section per
+        line so patterns do not match across section boundaries.
+        """
+        key = names if names is not None and self.has_sections else None
+        view = self._views.get(key)
+        if view is None:
+            if key is None:
+                view = self.lower
+            else:
+                view = "\n".join(view for _, view in self.section_views(key))
+            self._views[key] = view
+        return view
+
+
+@lru_cache(maxsize=64)
+def get_resume_document(text: str) -> ResumeDocument:
+    """
+    The shared ResumeDocument for ``text``. Do not mutate its text.
+    """
+    return ResumeDocument(text)
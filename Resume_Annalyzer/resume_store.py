@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Analyzed candidates for recruiter shortlists (see shortlist.py)
+RESUME_DB_PATH = os.path.join("data", "resumes.sqlite3")
+
+# Fields of an analyze_resume result kept in the store; the ATS score is added alongside
+FEATURE_FIELDS = ("skills_found", "experience_level", "_word_count", "_quant_achievements")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash TEXT NOT NULL UNIQUE,
+    name TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class ResumeStore:
+    """
+    SQLite-backed store of resume features, one row per distinct file.
+
+    Rows are keyed by the SHA-256 of the uploaded bytes, so analyzing the
+    same file again (from another session, a batch run or a re-upload)
+    refreshes its features instead of adding a duplicate candidate. Records
+    returned by the store carry their row id under ``resume_id``.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _decode(row_id: int, content_hash: str, name: Optional[str], data: str) -> Dict[str, Any]:
+        record = json.loads(data)
+        record.update({"resume_id": row_id, "content_hash": content_hash, "name": name})
+        return record
+
+    @staticmethod
+    def _encode(analysis: Dict[str, Any], ats_score: Optional[int]) -> str:
+        features = {field: analysis.get(field) for field in FEATURE_FIELDS}
+        features["ats_score"] = ats_score
+        return json.dumps(features, ensure_ascii=False)
+
+    def put(
+        self,
+        content_hash: str,
+        analysis: Dict[str, Any],
+        ats_score: Optional[int] = None,
+        name: Optional[str] = None,
+    ) -> int:
+        """
+        Store (or refresh) the features of one analyzed resume; returns its id.
+        """
+        return self.put_many([(content_hash, analysis, ats_score, name)])[0]
+
+    def put_many(self, items: List[Tuple[str, Dict[str, Any], Optional[int], Optional[str]]]) -> List[int]:
+        """
+        Store several (content_hash, analysis, ats_score, name) tuples in one
+        transaction; returns their ids in order.
+        """
+        now = time.time()
+        ids: List[int] = []
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for content_hash, analysis, ats_score, name in items:
+                    row = conn.execute(
+                        "INSERT INTO resumes (content_hash, name, data, updated_at) VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT(content_hash) DO UPDATE SET "
+                        "data = excluded.data, name = COALESCE(excluded.name, name), updated_at = excluded.updated_at "
+                        "RETURNING id",
+                        (content_hash, name, self._encode(analysis, ats_score), now),
+                    ).fetchone()
+                    ids.append(row[0])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def get(self, resume_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, content_hash, name, data FROM resumes WHERE id = ?", (resume_id,)
+            ).fetchone()
+        return self._decode(*row) if row else None
+
+    def get_by_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, content_hash, name, data FROM resumes WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        return self._decode(*row) if row else None
+
+    def delete(self, resume_id: int) -> bool:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,)).rowcount > 0
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def id_bounds(self) -> Tuple[int, int]:
+        """
+        Smallest and largest stored id, or (0, -1) if the store is empty.
+        """
+        with self._connect() as conn:
+            low, high = conn.execute("SELECT MIN(id), MAX(id) FROM resumes").fetchone()
+        return (low, high) if low is not None else (0, -1)
+
+    def iter_resumes(
+        self, batch_size: int = 1000, after_id: int = 0, until_id: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream stored resumes with ``after_id < id <= until_id`` in id order,
+        ``batch_size`` rows per query.
+        """
+        last_id = after_id
+        high = until_id if until_id is not None else -1
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT id, content_hash, name, data FROM resumes "
+                    "WHERE id > ? AND (? < 0 OR id <= ?) ORDER BY id LIMIT ?",
+                    (last_id, high, high, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._decode(*row)
+            last_id = rows[-1][0]
+
+
+_stores: Dict[str, ResumeStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_resume_store(db_path: str = RESUME_DB_PATH) -> ResumeStore:
+    """
+    Return the store for ``db_path``, creating it on first use in this process.
+    """
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ResumeStore(db_path)
+            _stores[key] = store
+        return store
@@ -0,0 +1,143 @@
+"""
+Recruiter shortlist: rank the analyzed candidates in the resume store
+against one parsed JD.
+
+The store is split into contiguous id ranges and each shard is scored in a
+worker process, which reads its own rows from SQLite and keeps only its
+best ``k`` matches in a heap. The per-shard lists are then merged lazily, so
+results stream back best first. Every candidate is scored exactly like
+``calculate_jd_match``, with the JD's match features prepared once per shard;
+ties go to the candidate stored first.
+
+Usage:
+    python shortlist.py jd.txt --k 25 --workers 8
+    python shortlist.py --jd-id 42 --resumes data/resumes.sqlite3
+"""
+import argparse
+import heapq
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from instrumentation import stage
+from job_description_manager import JDS_JSON_PATH, get_jd, match_features, parse_job_description
+from resume_store import RESUME_DB_PATH, ResumeStore, get_resume_store
+from text_core import jd_match_features, resume_match_features
+
+# Candidates per shard; small enough that shards balance across workers
+SHARD_SIZE = 5000
+
+
+def _rank_key(entry: Dict[str, Any]) -> Tuple[int, int]:
+    # Ascending sort key: best score first, then lower resume_id
+    return (-entry["score"], entry["resume_id"])
+
+
+def score_shard(db_path: str, jd_requirements: Dict[str, Any], after_id: int, until_id: int, k: int) -> List[Dict[str, Any]]:
+    """
+    Best ``k`` candidates with ``after_id < resume_id <= until_id``, best
+    first. Runs in a worker process.
+    """
+    heap: List[Tuple[int, int, Dict[str, Any]]] = []
+    jd = jd_match_features(jd_requirements)
+    for record in ResumeStore(db_path).iter_resumes(after_id=after_id, until_id=until_id):
+        match = match_features(resume_match_features(record), jd)
+        # Min-heap on (score, -id): the root is the weakest kept candidate
+        item = (match["score"], -record["resume_id"], match)
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+        else:
+            continue
+        match.update({
+            "resume_id": record["resume_id"],
+            "content_hash": record["content_hash"],
+            "name": record["name"],
+            "ats_score": record.get("ats_score"),
+        })
+    return sorted((match for _, _, match in heap), key=_rank_key)
+
+
+def _shards(store: ResumeStore, shard_size: int) -> List[Tuple[int, int]]:
+    low, high = store.id_bounds()
+    return [(start - 1, min(start + shard_size - 1, high)) for start in range(low, high + 1, shard_size)]
+
+
+def iter_shortlist(
+    jd_requirements: Dict[str, Any],
+    k: int = 50,
+    db_path: str = RESUME_DB_PATH,
+    workers: Optional[int] = None,
+    shard_size: int = SHARD_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the ``k`` best stored candidates for a ``parse_job_description``
+    result, best first. Each entry is the ``calculate_jd_match`` result plus
+    ``resume_id``, ``content_hash``, ``name`` and ``ats_score``.
+    """
+    if k <= 0:
+        return
+    store = get_resume_store(db_path)
+    shards = _shards(store, shard_size)
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+
+    with stage("shortlist", shards=len(shards), workers=workers):
+        if workers <= 1:
+            ranked = [score_shard(store.db_path, jd_requirements, low, high, k) for low, high in shards]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(score_shard, store.db_path, jd_requirements, low, high, k) for low, high in shards]
+                ranked = [future.result() for future in futures]
+
+    yield from itertools.islice(heapq.merge(*ranked, key=_rank_key), k)
+
+
+def shortlist(
+    jd_requirements: Dict[str, Any],
+    k: int = 50,
+    db_path: str = RESUME_DB_PATH,
+    workers: Optional[int] = None,
+    shard_size: int = SHARD_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    The ``k`` best stored candidates for a parsed JD as a list; see iter_shortlist.
+    """
+    return list(iter_shortlist(jd_requirements, k, db_path, workers, shard_size))
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rank stored candidates against one job description")
+    parser.add_argument("jd_file", nargs="?", help="Text file with the job description")
+    parser.add_argument("--jd-id", type=int, help="Use a JD from the JD store instead of a file")
+    parser.add_argument("--jds", default=JDS_JSON_PATH, help="JD store location (legacy JSON path)")
+    parser.add_argument("--resumes", default=RESUME_DB_PATH, help="Resume feature store")
+    parser.add_argument("--k", type=int, default=25)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    args = parser.parse_args(argv)
+
+    if bool(args.jd_file) == (args.jd_id is not None):
+        parser.error("provide exactly one of jd_file or --jd-id")
+    if args.jd_file:
+        with open(args.jd_file, "r", encoding="utf-8") as f:
+            jd_requirements = parse_job_description(f.read())
+    else:
+        jd_requirements = get_jd(args.jd_id, args.jds)
+        if jd_requirements is None:
+            parser.error(f"JD {args.jd_id} not found")
+
+    start = time.perf_counter()
+    for entry in iter_shortlist(jd_requirements, args.k, args.resumes, args.workers, args.shard_size):
+        print(json.dumps(entry, ensure_ascii=False))
+    print(f"elapsed={time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Boundary rules as (prefix, suffix) regex fragments.
+# WORD_BOUNDARY matches analyzer's r"\b...\b" rule, TOKEN_BOUNDARY matches
+# job_description_manager's r"(?<![\w#])...(?![\w+])" rule.
+WORD_BOUNDARY: Tuple[str, str] = (r"\b", r"\b")
+TOKEN_BOUNDARY: Tuple[str, str] = (r"(?<![\w#])", r"(?![\w+])")
+
+_TERMINAL = ""  # trie key holding the canonical names that end at a node
+
+
+def _build_trie(entries: Dict[str, Set[str]]) -> Dict[str, dict]:
+    root: Dict[str, dict] = {}
+    for surface, canonicals in entries.items():
+        node = root
+        for ch in surface:
+            node = node.setdefault(ch, {})
+        node.setdefault(_TERMINAL, set()).update(canonicals)
+    return root
+
+
+def _trie_to_pattern(node: Dict[str, dict]) -> str:
+    alternatives = [
+        re.escape(ch) + _trie_to_pattern(child)
+        for ch, child in sorted(node.items())
+        if ch != _TERMINAL
+    ]
+    if not alternatives:
+        return ""
+    if len(alternatives) == 1 and _TERMINAL not in node:
+        return alternatives[0]
+    pattern = "(?:" + "|".join(alternatives) + ")"
+    if _TERMINAL in node:
+        pattern += "?"
+    return pattern
+
+
+class SkillMatcher:
+    """
+    Finds every taxonomy skill in a text with a single scan.
+
+    The taxonomy (plus optional aliases) is compiled once into a trie and an
+    equivalent trie-shaped regex. The regex, wrapped in a lookahead, walks the
+    text once in C and yields only the positions where some skill matches with
+    the configured boundaries; a short trie walk at each of those positions
+    then collects every skill starting there, so overlapping skills such as
+    "Data" and "Data Analysis" are reported exactly like a per-skill search.
+    """
+
+    def __init__(
+        self,
+        skills: Iterable[str],
+        aliases: Optional[Dict[str, str]] = None,
+        boundary: Tuple[str, str] = WORD_BOUNDARY,
+    ):
+        entries: Dict[str, Set[str]] = {}
+        self.skills: List[str] = []
+        for skill in skills:
+            if not skill:
+                continue
+            self.skills.append(skill)
+            entries.setdefault(skill.lower(), set()).add(skill)
+        for alias, canonical in (aliases or {}).items():
+            if alias:
+                entries.setdefault(alias.lower(), set()).add(canonical)
+
+        prefix, suffix = boundary
+        self._trie = _build_trie(entries)
+        body = _trie_to_pattern(self._trie)
+        self._scanner = re.compile("(?=" + prefix + body + suffix + ")") if body else None
+        self._suffix = re.compile(suffix)
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Return the canonical names of all skills present in ``text``.
+        Matching is case-insensitive.
+        """
+        found: Set[str] = set()
+        if self._scanner is None or not text:
+            return found
+        text = text.lower()
+        suffix_match = self._suffix.match
+        for m in self._scanner.finditer(text):
+            node = self._trie
+            for pos in range(m.start(), len(text)):
+                node = node.get(text[pos])
+                if node is None:
+                    break
+                canonicals = node.get(_TERMINAL)
+                if canonicals and suffix_match(text, pos + 1):
+                    found.update(canonicals)
+        return found
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(
+    skills: Tuple[str, ...],
+    aliases: Tuple[Tuple[str, str], ...],
+    boundary: Tuple[str, str],
+) -> SkillMatcher:
+    return SkillMatcher(skills, dict(aliases), boundary)
+
+
+def fuzzy_matching_enabled() -> bool:
+    # Opt in with RESUME_SKILL_MATCHING=fuzzy; exact matching is the default
+    return os.environ.get("RESUME_SKILL_MATCHING", "exact").lower() == "fuzzy"
+
+
+def get_skill_matcher(
+    skills: Iterable[str],
+    aliases: Optional[Dict[str, str]] = None,
+    boundary: Tuple[str, str] = WORD_BOUNDARY,
+    fuzzy: bool = False,
+):
+    """
+    Return a compiled matcher for a taxonomy, building it only on first use.
+    With ``fuzzy`` it is a FuzzySkillMatcher (see fuzzy_matcher.py).
+    """
+    if fuzzy:
+        from fuzzy_matcher import get_fuzzy_skill_matcher
+
+        return get_fuzzy_skill_matcher(skills, aliases, boundary)
+    return _cached_matcher(tuple(skills), tuple(sorted((aliases or {}).items())), boundary)
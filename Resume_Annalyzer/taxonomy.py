@@ -0,0 +1,130 @@
+"""
+Versioned skill taxonomy shared by the resume analyzer and the JD manager.
+
+The taxonomy lives in ``data/skills_taxonomy.json``:
+
+    {
+      "version": 2,
+      "skills": ["Python", ...],
+      "aliases": {"k8s": "Kubernetes", ...},
+      "changelog": [
+        {"version": 1, "added": [...], "removed": []},
+        {"version": 2, "added": ["Rust"], "removed": ["NLP"]}
+      ]
+    }
+
+To change it, edit ``skills``, bump ``version`` and append a changelog entry
+listing what was added and removed; ``jd_reindex.py`` then updates only the
+stored JDs those skills affect. Aliases map alternative spellings to a skill
+and are used by fuzzy skill matching (see fuzzy_matcher.py); bump the version
+for alias changes too, with an entry that adds and removes nothing. The
+``fingerprint`` covers skills and aliases, so stored results are recomputed
+in full if either is edited without a bump.
+``SKILLS_TAXONOMY_PATH`` overrides the file.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills_taxonomy.json")
+
+
+class TaxonomyError(Exception):
+    """Raised when the taxonomy file is missing or inconsistent"""
+    pass
+
+
+class SkillTaxonomy:
+    """
+    An immutable snapshot of the taxonomy file.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        skills: List[str],
+        changelog: List[Dict[str, Any]],
+        aliases: Optional[Dict[str, str]] = None,
+    ):
+        self.version = version
+        self.skills: Tuple[str, ...] = tuple(skills)
+        self.changelog = sorted(changelog, key=lambda entry: entry["version"])
+        self.aliases: Dict[str, str] = dict(sorted((aliases or {}).items()))
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+        fingerprint_source = "\n".join(self.skills)
+        if self.aliases:
+            fingerprint_source += "\n\n" + "\n".join(f"{a}={s}" for a, s in self.aliases.items())
+        self.fingerprint = hashlib.sha256(fingerprint_source.encode("utf-8")).hexdigest()[:16]
+
+    def sort_key(self, skill: str) -> Tuple[int, str]:
+        # Taxonomy order, unknown names last in alphabetical order
+        return (self._order.get(skill, len(self._order)), skill)
+
+    def skills_at(self, version: int) -> FrozenSet[str]:
+        """
+        The skill set as of ``version``, rebuilt by undoing later changelog
+        entries. Version 0 (records stamped before versioning) is empty.
+        """
+        if version <= 0:
+            return frozenset()
+        skills: Set[str] = set(self.skills)
+        for entry in reversed(self.changelog):
+            if entry["version"] <= version:
+                break
+            skills.difference_update(entry.get("added", []))
+            skills.update(entry.get("removed", []))
+        return frozenset(skills)
+
+    def changes_since(self, version: int) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Net (added, removed) skills between ``version`` and this version.
+        """
+        before = self.skills_at(version)
+        current = frozenset(self.skills)
+        return current - before, before - current
+
+
+def _validate(data: Dict[str, Any], path: str) -> SkillTaxonomy:
+    try:
+        version = int(data["version"])
+        skills = [str(s) for s in data["skills"]]
+        changelog = list(data.get("changelog") or [])
+        aliases = {str(alias).lower(): str(skill) for alias, skill in (data.get("aliases") or {}).items()}
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise TaxonomyError(f"Invalid skill taxonomy {path}: {str(e)}")
+    if len(set(skills)) != len(skills):
+        raise TaxonomyError(f"Duplicate skills in {path}")
+    if changelog and max(entry["version"] for entry in changelog) != version:
+        raise TaxonomyError(f"Latest changelog entry in {path} does not match version {version}")
+    if changelog:
+        # Replaying the changelog from nothing must give the current list
+        replayed: Set[str] = set()
+        for entry in sorted(changelog, key=lambda e: e["version"]):
+            replayed.update(entry.get("added", []))
+            replayed.difference_update(entry.get("removed", []))
+        if replayed != set(skills):
+            raise TaxonomyError(f"Changelog in {path} does not rebuild the skill list")
+    unknown = sorted(alias for alias, skill in aliases.items() if skill not in skills)
+    if unknown:
+        raise TaxonomyError(f"Aliases in {path} point to unknown skills: {', '.join(unknown)}")
+    return SkillTaxonomy(version, skills, changelog, aliases)
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(path: Optional[str] = None) -> SkillTaxonomy:
+    """
+    Load and validate a taxonomy file, once per path per process.
+    """
+    path = path or os.environ.get("SKILLS_TAXONOMY_PATH") or TAXONOMY_PATH
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise TaxonomyError(f"Could not load skill taxonomy {path}: {str(e)}")
+    return _validate(data, path)
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    return load_taxonomy()
@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The modules are imported flat, as app.py does; corpus builds test documents
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+@pytest.fixture(autouse=True)
+def memory_only_cache(monkeypatch):
+    # Keep analysis results out of the on-disk cache (.cache/analysis) and from leaking between tests
+    import analyzer
+    from result_cache import ResultCache
+
+    monkeypatch.setattr(analyzer, "_RESULT_CACHE", ResultCache(cache_dir=None))
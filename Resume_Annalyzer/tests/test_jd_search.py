@@ -0,0 +1,19 @@
+from jd_search import BM25Index
+from jd_store import JDStore
+
+
+def test_index_behind_another_processes_prune_is_rebuilt(tmp_path):
+    store = JDStore(str(tmp_path / "jds.sqlite3"))
+    store.append({"raw_text": "python developer"})
+    stale = BM25Index(store, str(tmp_path / "stale.bm25.npz"))
+    assert stale.refresh() == 0 and len(stale) == 1
+
+    rust_id = store.append({"raw_text": "rust engineer"})
+    # Another process saves its own index, pruning the change stale never read
+    other = BM25Index(store, str(tmp_path / "other.bm25.npz"))
+    other.refresh()
+    store.append({"raw_text": "golang engineer"})
+
+    stale.refresh()
+    assert len(stale) == 3
+    assert [hit["jd_id"] for hit in stale.search("rust", k=5)] == [rust_id]
@@ -0,0 +1,51 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from jd_store import ChangesPruned, JDStore
+
+
+def _write_legacy(path, count=3):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{"raw_text": f"python developer {i}", "required_skills": ["Python"]} for i in range(count)], f)
+
+
+def test_legacy_json_is_migrated_once_whatever_its_path(tmp_path, monkeypatch):
+    store = JDStore(str(tmp_path / "jds.sqlite3"))
+    legacy = tmp_path / "data" / "jds.json"
+    legacy.parent.mkdir()
+    _write_legacy(legacy)
+
+    assert store.migrate_from_json(str(legacy)) == 3
+    # The same file through a relative path from another working directory
+    monkeypatch.chdir(tmp_path / "data")
+    assert store.migrate_from_json("jds.json") == 0
+    # And after the checkout was moved
+    moved = tmp_path / "moved"
+    shutil.copytree(tmp_path / "data", moved)
+    assert store.migrate_from_json(str(moved / "jds.json")) == 0
+    assert store.count() == 3
+
+
+def test_stores_with_a_path_marker_are_not_migrated_again(tmp_path):
+    db_path = str(tmp_path / "jds.sqlite3")
+    store = JDStore(db_path)
+    legacy = str(tmp_path / "jds.json")
+    _write_legacy(legacy)
+    with store._connect() as conn:
+        conn.execute("INSERT INTO meta (key, value) VALUES (?, '0')", ("migrated:" + os.path.abspath("/old/jds.json"),))
+    assert store.migrate_from_json(legacy) == 0
+    assert store.count() == 0
+
+
+def test_changes_since_a_pruned_position_raises(tmp_path):
+    store = JDStore(str(tmp_path / "jds.sqlite3"))
+    for i in range(3):
+        store.append({"raw_text": f"python developer {i}"})
+    assert [seq for seq, _, _, _ in store.changes_since(0)] == [1, 2, 3]
+    store.prune_changes(2)
+    assert [seq for seq, _, _, _ in store.changes_since(2)] == [3]
+    with pytest.raises(ChangesPruned):
+        list(store.changes_since(1))
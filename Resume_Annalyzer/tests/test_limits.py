@@ -0,0 +1,218 @@
+"""
+Adversarial uploads through extract_text_within_limits and the analysis
+pipeline: each must end in a result with degradations or a failed
+extraction stage, never an unhandled exception or an unbounded wait.
+"""
+import io
+import random
+import time
+import zipfile
+from concurrent.futures import Future
+
+import pytest
+
+import analyzer
+import limits as limits_module
+import pdf_parser
+from corpus import make_docx, make_pdf, make_resume_text
+from limits import AnalysisLimits, Degradation, extract_text_within_limits
+from pdf_parser import TextExtractionError
+
+OLE_HEADER = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+class Upload(io.BytesIO):
+    """Stands in for a Streamlit UploadedFile"""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+
+
+def _reasons(degradations):
+    return [(d["stage"], d["reason"]) if isinstance(d, dict) else (d.stage, d.reason) for d in degradations]
+
+
+@pytest.fixture(scope="module")
+def resume_pdf() -> bytes:
+    return make_pdf(make_resume_text(600, seed=1), min_pages=3)
+
+
+def _zip_docx(document_xml: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", document_xml)
+    return buffer.getvalue()
+
+
+# -- extract_text_within_limits -------------------------------------------------
+
+def test_truncated_pdf_is_an_extraction_error(resume_pdf):
+    with pytest.raises(TextExtractionError):
+        extract_text_within_limits(resume_pdf[: len(resume_pdf) // 2], "resume.pdf", AnalysisLimits())
+
+
+def test_random_bytes_pdf_is_an_extraction_error():
+    data = b"%PDF-1.4\n" + random.Random(0).randbytes(5000)
+    with pytest.raises(TextExtractionError):
+        extract_text_within_limits(data, "resume.pdf", AnalysisLimits())
+
+
+def test_oversize_file_is_rejected_before_parsing(resume_pdf):
+    with pytest.raises(TextExtractionError, match="maximum supported size"):
+        extract_text_within_limits(resume_pdf, "resume.pdf", AnalysisLimits(max_bytes=len(resume_pdf) - 1))
+
+
+def test_pdf_over_max_pages_keeps_the_first_pages(resume_pdf):
+    text, degradations = extract_text_within_limits(resume_pdf, "resume.pdf", AnalysisLimits(max_pages=1))
+    full_text, full_degradations = extract_text_within_limits(resume_pdf, "resume.pdf", AnalysisLimits())
+    assert text and full_text.startswith(text) and len(text) < len(full_text)
+    assert _reasons(degradations) == [("extraction", "page_limit")]
+    assert degradations[0].message.startswith("first 1 of ")
+    assert full_degradations == []
+
+
+def test_pdf_pypdf2_cannot_open_is_capped_in_the_pdfplumber_fallback(resume_pdf):
+    # Without its %%EOF marker PyPDF2 rejects the file; pdfplumber reads it
+    broken = resume_pdf.replace(b"%%EOF", b"")
+    text, degradations = extract_text_within_limits(broken, "resume.pdf", AnalysisLimits(max_pages=1))
+    full_text, _ = extract_text_within_limits(broken, "resume.pdf", AnalysisLimits())
+    assert text and full_text.startswith(text) and len(text) < len(full_text)
+    assert _reasons(degradations) == [("extraction", "page_limit")]
+
+
+def test_pdfplumber_fallback_stops_at_the_deadline(resume_pdf):
+    broken = resume_pdf.replace(b"%%EOF", b"")
+    text, degradations = extract_text_within_limits(broken, "resume.pdf", AnalysisLimits(extraction_seconds=0))
+    full_text, _ = extract_text_within_limits(broken, "resume.pdf", AnalysisLimits())
+    assert text and len(text) < len(full_text)
+    assert _reasons(degradations) == [("extraction", "deadline")]
+
+
+def test_parallel_pdf_matches_serial(resume_pdf, monkeypatch):
+    monkeypatch.setattr(pdf_parser, "PARALLEL_MIN_PAGES", 2)
+    text, degradations = extract_text_within_limits(resume_pdf, "resume.pdf", AnalysisLimits(), parallel=True)
+    assert (text, degradations) == extract_text_within_limits(resume_pdf, "resume.pdf", AnalysisLimits())
+
+
+_fast_page_worker = pdf_parser._extract_page_worker
+
+
+def _slow_page_worker(page_num):
+    if page_num:
+        time.sleep(60)
+    return _fast_page_worker(page_num)
+
+
+def test_parallel_pdf_stops_waiting_at_the_deadline(resume_pdf, monkeypatch):
+    # Workers are forked after the patch, so they run the slow worker too
+    monkeypatch.setattr(pdf_parser, "PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setattr(pdf_parser, "_extract_page_worker", _slow_page_worker)
+    start = time.monotonic()
+    text, degradations = extract_text_within_limits(
+        resume_pdf, "resume.pdf", AnalysisLimits(extraction_seconds=2), parallel=True
+    )
+    assert time.monotonic() - start < 10
+    full_text, _ = extract_text_within_limits(resume_pdf, "resume.pdf", AnalysisLimits())
+    assert text and full_text.startswith(text) and len(text) < len(full_text)
+    assert _reasons(degradations) == [("extraction", "deadline")]
+
+
+def test_docx_zip_bomb_is_rejected_without_inflating(monkeypatch):
+    monkeypatch.setattr(pdf_parser, "MAX_DOCX_PART_BYTES", 1024 * 1024)
+    document = b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    bomb = _zip_docx(document + b" " * (8 * 1024 * 1024) + b"</w:document>")
+    assert len(bomb) < 64 * 1024
+    with pytest.raises(TextExtractionError, match="uncompressed"):
+        extract_text_within_limits(bomb, "resume.docx", AnalysisLimits())
+
+
+def test_ole_doc_is_reported_as_unsupported():
+    with pytest.raises(TextExtractionError, match=r"Legacy \.doc"):
+        extract_text_within_limits(OLE_HEADER + b"\0" * 1024, "resume.doc", AnalysisLimits())
+
+
+def test_docx_within_char_limit_is_truncated():
+    docx = make_docx(make_resume_text(3000, seed=2))
+    text, degradations = extract_text_within_limits(docx, "resume.docx", AnalysisLimits(max_chars=2000))
+    assert 0 < len(text) <= 2000
+    assert _reasons(degradations) == [("extraction", "char_limit")]
+
+
+def _fake_pages(*chunks):
+    def iter_document_pages(source, file_name, **kwargs):
+        yield from chunks
+    return iter_document_pages
+
+
+def test_char_limit_reached_exactly_by_a_chunk(monkeypatch):
+    # After a chunk that fills max_chars exactly, the next one must not be cut
+    # at a negative length (which kept all but its last character)
+    monkeypatch.setattr(limits_module, "iter_document_pages", _fake_pages("a" * 10, "b" * 26))
+    text, degradations = extract_text_within_limits(b"", "resume.pdf", AnalysisLimits(max_chars=10))
+    assert text == "a" * 10
+    assert _reasons(degradations) == [("extraction", "char_limit")]
+
+
+def test_char_limit_cuts_the_overflowing_chunk(monkeypatch):
+    monkeypatch.setattr(limits_module, "iter_document_pages", _fake_pages("a" * 6, "bbb ccc ddd"))
+    text, degradations = extract_text_within_limits(b"", "resume.pdf", AnalysisLimits(max_chars=12))
+    assert text == "aaaaaa\nbbb"
+    assert len(text) <= 12
+    assert _reasons(degradations) == [("extraction", "char_limit")]
+
+
+# -- analysis pipeline ------------------------------------------------------------
+
+@pytest.mark.parametrize("data, name, message", [
+    (b"%PDF-1.4\n" + random.Random(1).randbytes(4000), "resume.pdf", "PDF"),
+    (b"PK\x03\x04" + random.Random(2).randbytes(300), "resume.docx", "not a valid DOCX"),
+    (OLE_HEADER + b"\0" * 1024, "resume.doc", "Legacy .doc"),
+    (b"%PDF-1.4\n" + b"x" * 4096, "huge.pdf", "maximum supported size"),
+])
+def test_unreadable_uploads_fail_in_extraction(data, name, message):
+    result = analyzer.run_local_analysis(Upload(data, name), limits=AnalysisLimits(max_bytes=4096))
+    assert result["success"] is False
+    assert result["error_stage"] == "extraction"
+    assert message in result["error_message"]
+
+
+def test_truncated_pdf_fails_in_extraction(resume_pdf):
+    result = analyzer.full_analysis_pipeline(Upload(resume_pdf[:400], "resume.pdf"), limits=AnalysisLimits())
+    assert result["success"] is False
+    assert result["error_stage"] == "extraction"
+    assert "ai_available" not in result
+
+
+def test_pipeline_reports_page_limit(resume_pdf, monkeypatch):
+    finished = Future()
+    finished.set_result({"summaryParagraph": "ok"})
+    monkeypatch.setattr(analyzer, "start_gemini_recommendations", lambda text: finished)
+    result = analyzer.full_analysis_pipeline(Upload(resume_pdf, "resume.pdf"), limits=AnalysisLimits(max_pages=2))
+    assert result["success"] is True
+    assert result["error_stage"] is None
+    assert result["ai_available"] is True
+    assert _reasons(result["degradations"]) == [("extraction", "page_limit")]
+
+
+def test_never_returning_gemini_call_degrades_to_local_results(resume_pdf, monkeypatch):
+    monkeypatch.setattr(analyzer, "start_gemini_recommendations", lambda text: Future())
+    start = time.monotonic()
+    result = analyzer.full_analysis_pipeline(Upload(resume_pdf, "resume.pdf"), limits=AnalysisLimits(ai_seconds=0.2))
+    assert time.monotonic() - start < 5
+    assert result["success"] is True
+    assert result["basic_analysis"] and result["ats_score"] is not None
+    assert result["ai_recommendations"] == {} and result["ai_available"] is False
+    assert _reasons(result["degradations"]) == [("ai", "deadline")]
+
+
+def test_collect_gemini_recommendations_times_out():
+    pending = Future()
+    assert analyzer.collect_gemini_recommendations(pending, timeout=0.05) == {}
+    assert pending.cancelled()
+
+
+def test_degradations_are_plain_dicts_in_results(resume_pdf):
+    result = analyzer.run_local_analysis(Upload(resume_pdf, "resume.pdf"), limits=AnalysisLimits(max_pages=1))
+    assert result["success"] is True
+    assert [sorted(d) for d in result["degradations"]] == [sorted(Degradation._fields)]
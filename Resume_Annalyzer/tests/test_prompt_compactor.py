@@ -0,0 +1,33 @@
+from prompt_compactor import CHARS_PER_TOKEN, compact_resume_text
+
+LONG_PARAGRAPH = " ".join(f"word{i}" for i in range(2000))
+
+
+def test_single_line_over_budget_is_cut_not_dropped():
+    result = compact_resume_text(LONG_PARAGRAPH, 500)
+    assert result.text
+    assert LONG_PARAGRAPH.startswith(result.text)
+    assert len(result.text) <= 500 * CHARS_PER_TOKEN
+    assert result.compacted_tokens <= 500
+    # Cut at a word boundary
+    assert LONG_PARAGRAPH[len(result.text)] == " "
+
+
+def test_over_budget_line_is_cut_after_lines_that_fit():
+    result = compact_resume_text("John Doe\nExperience\n" + LONG_PARAGRAPH, 500)
+    lines = result.text.split("\n")
+    assert lines[:2] == ["John Doe", "EXPERIENCE:"]
+    assert lines[2].startswith("word0 word1") and len(lines) == 3
+    assert result.compacted_tokens <= 500
+
+
+def test_resume_within_budget_keeps_repeated_lines():
+    text = "\n".join([
+        "Jane Doe", "Experience",
+        "Software Engineer, Acme", "2020 - 2023", "Cut latency by 25%",
+        "Software Engineer, Acme", "2018 - 2020", "Cut latency by 40%",
+    ])
+    result = compact_resume_text(text, 1500)
+    for line in ("2018 - 2020", "Cut latency by 40%"):
+        assert line in result.text
+    assert result.text.count("Software Engineer, Acme") == 2
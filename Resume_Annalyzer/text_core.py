@@ -0,0 +1,200 @@
+"""
+Shared text processing for resumes and job descriptions.
+
+The analyzer, the JD manager and matching all go through this module: one
+whitespace normalization, one skill taxonomy and matcher configuration, and
+one memoized TextDocument per text, which normalizes, lowercases and splits
+the text once and caches what is derived from it. Matching works on
+MatchFeatures prepared once per resume or JD, so ranking one JD against many
+resumes (or the reverse) does not re-derive them for every pair.
+
+Resume and JD years are still read with their own rules: a resume's
+experience is the largest figure it states (feature_scanner), a JD's the
+first requirement it states, with ranges taken at their upper bound.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from skill_matcher import TOKEN_BOUNDARY, fuzzy_matching_enabled, get_skill_matcher
+from taxonomy import get_taxonomy
+
+# Edit data/skills_taxonomy.json to change the skills
+PREDEFINED_SKILLS: List[str] = list(get_taxonomy().skills)
+
+# Skills are delimited like tokens, so "C++" and "C#" match before a space
+SKILL_BOUNDARY: Tuple[str, str] = TOKEN_BOUNDARY
+
+_DOCUMENT_CACHE_SIZE = 256
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Collapse whitespace runs to single spaces and strip the ends; equivalent
+    to re.sub(r"\\s+", " ", text).strip().
+    """
+    return " ".join((text or "").split())
+
+
+def skill_matcher(skills: Optional[Iterable[str]] = None, fuzzy: Optional[bool] = None):
+    """
+    The shared matcher for the taxonomy, or for a subset of it such as newly
+    added skills. Aliases only apply in fuzzy mode (the default comes from
+    RESUME_SKILL_MATCHING), so exact-mode results do not depend on them.
+    """
+    fuzzy = fuzzy_matching_enabled() if fuzzy is None else fuzzy
+    aliases = get_taxonomy().aliases if fuzzy else None
+    return get_skill_matcher(
+        PREDEFINED_SKILLS if skills is None else sorted(skills), aliases, boundary=SKILL_BOUNDARY, fuzzy=fuzzy
+    )
+
+
+def taxonomy_stamp(fuzzy: Optional[bool] = None) -> str:
+    """
+    "<version>:<fingerprint>:<mode>" for the taxonomy and matching mode that
+    skills are found with; results stamped with another value are outdated.
+    """
+    taxonomy = get_taxonomy()
+    fuzzy = fuzzy_matching_enabled() if fuzzy is None else fuzzy
+    return f"{taxonomy.version}:{taxonomy.fingerprint}:{'fuzzy' if fuzzy else 'exact'}"
+
+
+def find_skills(lowercase_text: str, skills: Optional[Iterable[str]] = None) -> Set[str]:
+    """
+    Taxonomy skills present in ``lowercase_text``; see skill_matcher.
+    """
+    return skill_matcher(skills).find(lowercase_text)
+
+
+# JD experience requirements: "3-5 years" (upper bound), then the first
+# "over 5 years" / "5+ years" / "5 year" style mention
+_REQUIRED_RANGE = re.compile(r"(?i)(\d{1,2})\s*\-\s*(\d{1,2})\s*(years|yrs|year)")
+_REQUIRED_PATTERNS = (
+    re.compile(r"(?i)(over|approximately|around|about)?\s*(\d{1,2})\s*\+?\s*(years|yrs|y/o|yo|year)"),
+    re.compile(r"(?i)(\d{1,2})\s*\+\s*years"),
+    re.compile(r"(?i)(\d{1,2})\s*\-?\s*year\b"),
+)
+_REQUIRED_SIMPLE = re.compile(r"(?i)(\d{1,2})\s*\+?\s*(years|yrs)\b")
+
+
+def parse_required_years(text: str) -> Optional[float]:
+    """
+    Years of experience a job description asks for, or None.
+    """
+    m_range = _REQUIRED_RANGE.search(text)
+    if m_range:
+        return float(max(int(m_range.group(1)), int(m_range.group(2))))
+    for pattern in _REQUIRED_PATTERNS:
+        m = pattern.search(text)
+        if m:
+            nums = [float(g) for g in m.groups() if isinstance(g, str) and g.isdigit()]
+            if nums:
+                return float(nums[-1])
+    m_simple = _REQUIRED_SIMPLE.search(text)
+    return float(m_simple.group(1)) if m_simple else None
+
+
+class TextDocument:
+    """
+    A text with its normalized, lowercase and tokenized forms computed once.
+    Get shared instances from get_document().
+    """
+
+    __slots__ = ("text", "_words", "_normalized", "_lower", "_skills")
+
+    def __init__(self, text: Optional[str]):
+        self.text = text or ""
+        self._words: Optional[List[str]] = None
+        self._normalized: Optional[str] = None
+        self._lower: Optional[str] = None
+        # Keyed by fuzzy mode, which can be switched at runtime
+        self._skills: Dict[bool, FrozenSet[str]] = {}
+
+    @property
+    def words(self) -> List[str]:
+        if self._words is None:
+            self._words = self.text.split()
+        return self._words
+
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @property
+    def normalized(self) -> str:
+        if self._normalized is None:
+            self._normalized = " ".join(self.words)
+        return self._normalized
+
+    @property
+    def lower(self) -> str:
+        """
+        Lowercase normalized text.
+        """
+        if self._lower is None:
+            self._lower = self.normalized.lower()
+        return self._lower
+
+    @property
+    def skills(self) -> FrozenSet[str]:
+        """
+        Taxonomy skills found anywhere in the text.
+        """
+        fuzzy = fuzzy_matching_enabled()
+        skills = self._skills.get(fuzzy)
+        if skills is None:
+            skills = self._skills[fuzzy] = frozenset(find_skills(self.lower))
+        return skills
+
+
+@lru_cache(maxsize=_DOCUMENT_CACHE_SIZE)
+def get_document(text: str) -> TextDocument:
+    """
+    The shared TextDocument for ``text``. Do not mutate its text.
+    """
+    return TextDocument(text)
+
+
+def as_float(value: Any) -> float:
+    """
+    Coerce a stored years value to float; None and garbage count as 0.
+    """
+    try:
+        return float(value) if value is not None else 0.0
+    except Exception:
+        return 0.0
+
+
+class MatchFeatures(NamedTuple):
+    """
+    What calculate_jd_match compares, derived once per resume analysis or
+    parsed JD. Terms are kept sorted so matching only filters them.
+    """
+    skill_count: int  # as listed, duplicates included
+    skill_keys: Tuple[Tuple[str, str], ...]  # sorted distinct (skill, lowercase skill)
+    skills_lc: FrozenSet[str]
+    years: float
+    keywords: Tuple[Tuple[str, str], ...] = ()  # sorted (keyword, lowercase keyword); JDs only
+
+
+def _sorted_keys(terms: Iterable[str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple([(t, t.lower()) for t in sorted(terms)])
+
+
+def resume_match_features(resume_analysis_dict: Optional[Dict[str, Any]]) -> MatchFeatures:
+    analysis = resume_analysis_dict or {}
+    skills = analysis.get("skills_found", []) or []
+    skill_keys = _sorted_keys(set(skills))
+    return MatchFeatures(
+        len(skills), skill_keys, frozenset(lc for _, lc in skill_keys), as_float(analysis.get("experience_level"))
+    )
+
+
+def jd_match_features(jd_requirements_dict: Optional[Dict[str, Any]]) -> MatchFeatures:
+    jd = jd_requirements_dict or {}
+    skills = jd.get("required_skills", []) or []
+    skill_keys = _sorted_keys(set(skills))
+    return MatchFeatures(
+        len(skills), skill_keys, frozenset(lc for _, lc in skill_keys), as_float(jd.get("experience_years")),
+        _sorted_keys(jd.get("keywords", []) or []),
+    )
@@ -1,4 +1,4 @@
-import re
-
 def clean_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    # Same result as text_core.normalize_text, without importing text_core
+    # and loading the skill taxonomy along with it
+    return " ".join(text.split())